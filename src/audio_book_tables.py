@@ -37,7 +37,7 @@ import sqlite3
 import sqlite_tools
 
 # disable=too-many-arguments because the data is unpacked in another class
-# pylint: disable=too-many-arguments
+# pylint: disable=too-many-arguments,too-many-positional-arguments
 
 # set database file creating config directory
 config_dir = Path.home() / '.config' / 'book_ease'
@@ -493,6 +493,66 @@ class TrackFile:
         return cur.fetchone()
 
 
+class TrackStreamInfo:
+    """
+    database accessor for table track_stream_info
+
+    Caches the stream information discovered for a track_file. A row is only valid while
+    the file's size and modification time match the ones it was discovered with.
+    """
+
+    @staticmethod
+    def init_table(con: sqlite3.Connection):
+        """create database table: track_stream_info"""
+        sql = """
+            CREATE TABLE IF NOT EXISTS track_stream_info (
+                track_file_id INTEGER REFERENCES track_file(id) ON DELETE CASCADE UNIQUE NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                duration INTEGER NOT NULL,
+                stream_info TEXT NOT NULL
+            )
+            """
+        con.execute(sql)
+
+    @staticmethod
+    def upsert_row(con: sqlite3.Connection,
+                   track_file_id: int,
+                   size: int,
+                   mtime_ns: int,
+                   duration: int,
+                   stream_info: str):
+        """Update or insert the row for track_file_id into table track_stream_info."""
+        sql = """
+            INSERT INTO track_stream_info (track_file_id, size, mtime_ns, duration, stream_info)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(track_file_id)
+            DO UPDATE
+            SET size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                duration = excluded.duration,
+                stream_info = excluded.stream_info
+            """
+        cur = con.execute(sql, (track_file_id, size, mtime_ns, duration, stream_info))
+        return cur.lastrowid
+
+    @staticmethod
+    def get_row_by_path(con: sqlite3.Connection, path: str, size: int, mtime_ns: int) -> sqlite3.Row | None:
+        """
+        get the row for the track_file with matching path,
+        only if it was stored for a file with the same size and mtime_ns.
+        """
+        sql = """
+            SELECT track_stream_info.* FROM track_stream_info
+            INNER JOIN track_file ON track_file.id = track_stream_info.track_file_id
+            WHERE track_file.path = (?)
+            AND track_stream_info.size = (?)
+            AND track_stream_info.mtime_ns = (?)
+            """
+        cur = con.execute(sql, (path, size, mtime_ns))
+        return cur.fetchone()
+
+
 class PlayerPosition:
     """database accessor for table player_postion"""
 
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_copy_tree.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+Compare FileMgr.copy with FileMgr.copy_tree on a directory tree of many small files.
+
+Run from the src directory:
+    python -m benchmark.bench_copy_tree --files 10000 --size 4096 --dest /media/usb_stick
+
+--dest defaults to a temporary directory on the same device as the source tree.
+Point it at a USB or network mount to measure the devices that the concurrent copy is meant for.
+"""
+
+from __future__ import annotations
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+import signal_
+import file_mgr
+
+
+def make_tree(root: Path, n_files: int, file_size: int, files_per_dir: int = 100) -> None:
+    """Create a tree of n_files files of file_size bytes, files_per_dir files to a directory."""
+    data = os.urandom(file_size)
+    for i in range(n_files):
+        directory = Path(root, f'disc_{i // files_per_dir:04}')
+        if i % files_per_dir == 0:
+            directory.mkdir(parents=True)
+        Path(directory, f'track_{i:05}.mp3').write_bytes(data)
+
+
+def run(label: str, func, src: Path, dest: Path, **kwargs) -> float:
+    """Time a single copy, verify its result, and remove the copy."""
+    start = time.perf_counter()
+    errors = func(src, dest, threading.Event(), **kwargs)
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(f'{label} failed: {errors[:5]}')
+    shutil.rmtree(dest)
+    print(f'{label:<28} {elapsed:8.3f} s')
+    return elapsed
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=10000, help='number of files in the tree')
+    parser.add_argument('--size', type=int, default=4096, help='size of each file in bytes')
+    parser.add_argument('--dest', type=Path, default=None, help='directory to copy the tree into')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16],
+                        help='thread pool sizes to try with copy_tree')
+    args = parser.parse_args()
+
+    # file_mgr sends dir_contents_updated as it works.
+    signal_.GLOBAL_TRANSMITTER = signal_.Signal()
+    signal_.GLOBAL_TRANSMITTER.add_signal('dir_contents_updated')
+    # Bypass FileMgr.__init__, which needs the database. copy and copy_tree don't use any instance state.
+    fm = file_mgr.FileMgr.__new__(file_mgr.FileMgr)
+
+    with tempfile.TemporaryDirectory() as src_root, tempfile.TemporaryDirectory(dir=args.dest) as dest_root:
+        src = Path(src_root, 'book')
+        make_tree(src, args.files, args.size)
+        print(f'{args.files} files of {args.size} bytes -> {dest_root}')
+        baseline = run('copy', fm.copy, src, Path(dest_root, 'book'))
+        for workers in args.workers:
+            elapsed = run(f'copy_tree max_workers={workers}', fm.copy_tree, src, Path(dest_root, 'book'),
+                          max_workers=workers)
+            print(f'{"":<28} {baseline / elapsed:8.2f} x')
+
+
+if __name__ == '__main__':
+    main()
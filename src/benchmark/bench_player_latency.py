@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_player_latency.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=wrong-import-position
+# disabled because gi.repository requires an import order that pylint dislikes.
+
+"""
+Measure the latency of the player layers, headless, for each audio format.
+
+Generates books of short sine wave tracks as wav, flac and opus in a temporary directory.
+flac and opus are encoded with GStreamer, and a format is skipped if its encoder is not installed.
+Every scenario plays into a fakesink under a GLib main loop:
+
+    load          GstPlayer     load_stream() to 'stream_ready'
+    seek          GstPlayer     set_position() to 'stream_ready', which follows the pipeline's async-done
+    track_change  GstPlayerA    unload_stream() and load_stream() to 'stream_loaded'
+    eos_to_next   Player        'eos' from the backend to the pipeline playing the next track, without gapless
+
+The Player scenario uses a temporary database, the user's library is not touched.
+
+Each scenario reports n, mean, p50, p90, p99 and max in milliseconds. --json writes the results,
+and --compare prints the change from an earlier --json file, e.g. one recorded on another commit.
+
+Run from the src directory:
+    python -m benchmark.bench_player_latency --tracks 50 --json after.json --compare before.json
+"""
+
+from __future__ import annotations
+import argparse
+import array
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Callable
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import GLib, Gst
+import audio_book_tables
+import sqlite_tools
+import book
+import playlist
+import player
+
+AUDIO_SINK = 'fakesink sync=true'
+# Give up on a scenario that has not finished in this many seconds.
+TIMEOUT = 600
+
+
+def write_wav(path: Path, seconds: float, rate: int = 22050) -> None:
+    """Write a mono wav file containing a sine wave."""
+    samples = array.array('h', (int(8000 * math.sin(2 * math.pi * 440 * i / rate))
+                                for i in range(int(seconds * rate))))
+    # pylint: disable=no-member
+    # disabled because pylint takes wave.open() to always return a Wave_read.
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    # pylint: enable=no-member
+
+
+def encode(path: Path, seconds: float, encoder: str) -> None:
+    """Encode a sine wave into path with the gst-launch description encoder."""
+    rate = 48000
+    samples_per_buffer = 1024
+    pipeline = Gst.parse_launch(
+        f'audiotestsrc wave=sine num-buffers={int(seconds * rate / samples_per_buffer)}'
+        f' samplesperbuffer={samples_per_buffer} ! audio/x-raw,rate={rate},channels=1'
+        f' ! audioconvert ! {encoder} ! filesink location="{path}"'
+    )
+    pipeline.set_state(Gst.State.PLAYING)
+    msg = pipeline.get_bus().timed_pop_filtered(Gst.CLOCK_TIME_NONE, Gst.MessageType.EOS | Gst.MessageType.ERROR)
+    pipeline.set_state(Gst.State.NULL)
+    if msg.type == Gst.MessageType.ERROR:
+        raise RuntimeError(f'failed to encode {path}: {msg.parse_error()[0].message}')
+
+
+# format: (file suffix, GStreamer encoder elements, or None for wav)
+FORMATS = {
+    'wav': ('wav', None),
+    'flac': ('flac', 'flacenc'),
+    'opus': ('opus', 'opusenc ! oggmux'),
+}
+
+
+def write_book(directory: Path, format_: str, n_tracks: int, seconds: float) -> list[Path] | None:
+    """
+    Write a book of n_tracks in format_ to directory.
+    Returns None if GStreamer has no encoder for format_.
+    """
+    suffix, encoder = FORMATS[format_]
+    if encoder is not None and Gst.ElementFactory.find(encoder.split()[0]) is None:
+        return None
+    paths = []
+    for i in range(n_tracks):
+        path = directory / f'{format_}_{i:04}.{suffix}'
+        if encoder is None:
+            write_wav(path, seconds)
+        else:
+            encode(path, seconds, encoder)
+        paths.append(path)
+    return paths
+
+
+def new_stream_data(path: Path) -> player.StreamData:
+    """Get a StreamData for path, positioned at the beginning."""
+    return player.StreamData(path=path, position_data=player.PositionData(time=player.StreamTime(0)))
+
+
+def run_loop(start: Callable[[Callable[[], None]], None]) -> None:
+    """
+    Run a GLib.MainLoop until the scenario is done.
+    start: called from the loop with a function that the scenario calls when it is done.
+    """
+    loop = GLib.MainLoop()
+    timed_out = []
+
+    def on_timeout() -> bool:
+        timed_out.append(True)
+        loop.quit()
+        return GLib.SOURCE_REMOVE
+
+    timeout_id = GLib.timeout_add_seconds(TIMEOUT, on_timeout)
+    GLib.idle_add(lambda: start(loop.quit))
+    loop.run()
+    if timed_out:
+        raise TimeoutError(f'scenario did not finish in {TIMEOUT} s')
+    GLib.Source.remove(timeout_id)
+
+
+def bench_load(paths: list[Path], _: int) -> list[float]:
+    """Time GstPlayer.load_stream() to 'stream_ready' for each track."""
+    gst_player = player.GstPlayer(audio_sink=AUDIO_SINK)
+    latencies = []
+    remaining = list(paths)
+
+    def load_next(done: Callable[[], None]) -> None:
+        if not remaining:
+            done()
+            return
+        started = time.perf_counter()
+
+        def on_ready() -> None:
+            latencies.append(time.perf_counter() - started)
+            gst_player.transmitter.connect_once('stream_ready', load_next, done)
+            gst_player.unload_stream()
+
+        gst_player.transmitter.connect_once('stream_ready', on_ready)
+        gst_player.load_stream(new_stream_data(remaining.pop(0)))
+
+    run_loop(load_next)
+    return latencies
+
+
+def bench_seek(paths: list[Path], repeat: int) -> list[float]:
+    """Time GstPlayer.set_position() to 'stream_ready' for random positions in the first track."""
+    gst_player = player.GstPlayer(audio_sink=AUDIO_SINK)
+    rng = random.Random(0)
+    latencies = []
+    remaining = [repeat]
+
+    def seek_next(done: Callable[[], None]) -> None:
+        if not remaining[0]:
+            done()
+            return
+        remaining[0] -= 1
+        position = player.StreamTime(rng.random() * gst_player.query_duration().get_time('ns') * 0.9)
+        started = time.perf_counter()
+
+        def on_ready() -> None:
+            latencies.append(time.perf_counter() - started)
+            seek_next(done)
+
+        gst_player.transmitter.connect_once('stream_ready', on_ready)
+        gst_player.set_position(position)
+
+    def start(done: Callable[[], None]) -> None:
+        gst_player.transmitter.connect_once('stream_ready', seek_next, done)
+        gst_player.load_stream(new_stream_data(paths[0]))
+
+    run_loop(start)
+    return latencies
+
+
+def bench_track_change(paths: list[Path], _: int) -> list[float]:
+    """Time GstPlayerA.unload_stream() and load_stream() to 'stream_loaded' for each track."""
+    player_a = player.GstPlayerA(player.GstPlayer(audio_sink=AUDIO_SINK))
+    latencies = []
+    remaining = list(paths)
+    # None while the first track is loading, which is not a track change.
+    started: list[float | None] = [None]
+
+    def change_track(done: Callable[[], None]) -> None:
+        if not remaining:
+            done()
+            return
+        started[0] = time.perf_counter()
+        player_a.unload_stream()
+        player_a.load_stream(new_stream_data(remaining.pop(0)))
+
+    def on_loaded(done: Callable[[], None], *_) -> None:
+        if started[0] is not None:
+            latencies.append(time.perf_counter() - started[0])
+        change_track(done)
+
+    def start(done: Callable[[], None]) -> None:
+        player_a.transmitter.connect('stream_loaded', on_loaded, done)
+        player_a.load_stream(new_stream_data(remaining.pop(0)))
+
+    run_loop(start)
+    return latencies
+
+
+def save_book(paths: list[Path]) -> book.PlaylistData:
+    """Save a playlist of paths to the database."""
+    playlist_data = book.PlaylistData(title='benchmark', path=paths[0].parent)
+    playlist_data.set_id(book.PlaylistDBI().save(playlist_data))
+    track_dbi = book.TrackDBI()
+    for number, path in enumerate(paths):
+        track = playlist.Track(file_path=path, number=number)
+        track_dbi.save_pl_track(playlist_data.get_id(), track_dbi.save_track_file(track), track)
+    return playlist_data
+
+
+def bench_eos_to_next(paths: list[Path], _: int) -> list[float]:
+    """
+    Time Player from the backend's 'eos' to the pipeline playing the next track, for each track.
+    Gapless playback is off, because it continues into the next track without an EOS.
+    """
+    gst_player = player.GstPlayer(audio_sink=AUDIO_SINK)
+    player_ = player.Player(gapless=False, backend=gst_player)
+    player_.activate()
+    latencies = []
+    eos_time = [None]
+
+    def on_eos() -> None:
+        eos_time[0] = time.perf_counter()
+
+    def on_state_changed(_: Gst.Bus, msg: Gst.Message) -> None:
+        if msg.src is gst_player.pipeline and eos_time[0] is not None:
+            if msg.parse_state_changed()[1] == Gst.State.PLAYING:
+                latencies.append(time.perf_counter() - eos_time[0])
+                eos_time[0] = None
+
+    def start(done: Callable[[], None]) -> None:
+        player_.transmitter.connect('playlist_finished', done)
+        gst_player.transmitter.connect('eos', on_eos)
+
+        def on_loaded(*_) -> None:
+            # The pipeline is reused for the rest of the book.
+            gst_player.pipeline.get_bus().connect('message::state-changed', on_state_changed)
+            player_.play()
+
+        player_.transmitter.connect_once('stream_updated', on_loaded)
+        player_.load_playlist(save_book(paths))
+
+    run_loop(start)
+    return latencies
+
+
+SCENARIOS = {
+    'load': bench_load,
+    'seek': bench_seek,
+    'track_change': bench_track_change,
+    'eos_to_next': bench_eos_to_next,
+}
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Get the count, mean and percentiles of latencies, in milliseconds."""
+    latencies = sorted(latencies)
+    if not latencies:
+        return dict.fromkeys(('n', 'mean', 'p50', 'p90', 'p99', 'max'), 0)
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+    return {
+        'n': len(latencies),
+        'mean': statistics.fmean(latencies) * 1000,
+        'p50': percentile(0.5),
+        'p90': percentile(0.9),
+        'p99': percentile(0.99),
+        'max': latencies[-1] * 1000,
+    }
+
+
+def git_commit() -> str | None:
+    """Get the commit that is checked out, if this is a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    """Print a row for each scenario and format, with the change in p50 and p99 from baseline if given."""
+    print(f'{"scenario":<14}{"format":<7}{"n":>6}{"mean":>10}{"p50":>10}{"p90":>10}{"p99":>10}{"max":>10}'
+          + ('   p50 change  p99 change' if baseline else ''))
+    for scenario, formats in results.items():
+        for format_, stats in formats.items():
+            line = (f'{scenario:<14}{format_:<7}{stats["n"]:>6}{stats["mean"]:>10.2f}{stats["p50"]:>10.2f}'
+                    f'{stats["p90"]:>10.2f}{stats["p99"]:>10.2f}{stats["max"]:>10.2f}')
+            if baseline and (old := baseline.get(scenario, {}).get(format_)):
+                line += ''.join(f'{(stats[key] / old[key] - 1) * 100:>+11.1f}%' if old[key] else f'{"":>12}'
+                                for key in ('p50', 'p99'))
+            print(line)
+
+
+def main() -> None:
+    """Parse the command line and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tracks', type=int, default=50, help='number of tracks in each book')
+    parser.add_argument('--seconds', type=float, default=1.0, help='length of each track')
+    parser.add_argument('--seeks', type=int, default=200, help='number of seeks in the seek scenario')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--json', type=Path, help='write the results to this file')
+    parser.add_argument('--compare', type=Path, help='print the change from the results in this file')
+    args = parser.parse_args()
+
+    Gst.init(None)
+    results: dict[str, dict[str, dict[str, float]]] = {scenario: {} for scenario in args.scenarios}
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        # Keep the Player scenario out of the user's database.
+        audio_book_tables.db = directory / 'benchmark.db'
+        audio_book_tables.DB_CONNECTION = sqlite_tools.DBConnectionManager(audio_book_tables.db)
+
+        for format_ in args.formats:
+            if (paths := write_book(directory, format_, args.tracks, args.seconds)) is None:
+                print(f'skipping {format_}: no GStreamer encoder')
+                continue
+            for scenario in args.scenarios:
+                results[scenario][format_] = summarize(SCENARIOS[scenario](paths, args.seeks))
+
+    baseline = json.loads(args.compare.read_text())['results'] if args.compare else None
+    print_results(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps({
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'gstreamer': Gst.version_string(),
+            'parameters': {'tracks': args.tracks, 'seconds': args.seconds, 'seeks': args.seeks},
+            'results': results,
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
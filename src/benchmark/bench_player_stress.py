@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_player_stress.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+"""
+Stress Player with a large number of track transitions on a simulated_player.SimulatedPlayer.
+
+No audio is decoded, and the playback runs on a virtual clock, so the cost measured is that of Player,
+GstPlayerA, the signals and the position saves to the database. Each round issues a random burst of
+track changes, seeks and play/pause toggles, then lets the book play for a random while, including
+through the ends of tracks. The random seed makes a run repeatable.
+
+Reports the transitions per second of wall time, the simulated playing time, the position saves,
+and the command queue counters.
+
+The run uses a temporary database, the user's library is not touched.
+
+Run from the src directory:
+    python -m benchmark.bench_player_stress --transitions 1000000 --seed 1
+"""
+
+from __future__ import annotations
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+import audio_book_tables
+import sqlite_tools
+import player
+from player import StreamTime
+from simulated_player import SimulatedPlayer, VirtualClock, run
+from benchmark.bench_player_latency import save_book
+
+
+def stress(paths: list[Path], transitions: int, seed: int, gapless: bool) -> None:
+    """Play the book at paths on a SimulatedPlayer until transitions track changes have happened."""
+    # pylint: disable=too-many-locals
+    # Disabled because the counters and the wrappers that count them are all local to the one run.
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    # Short tracks, so that playing also makes plenty of transitions.
+    backend = SimulatedPlayer(clock, durations={str(path): StreamTime(rng.randint(5, 60), 's') for path in paths})
+    player_ = player.Player(gapless=gapless, backend=backend)
+    player_.activate()
+    player_.load_playlist(save_book(paths))
+    run(clock)
+
+    loads = [0]
+    saves = [0]
+    load_stream = backend.load_stream
+    save_position = player_.player_dbi.save_position
+
+    def counted_load_stream(stream_data: player.StreamData) -> bool:
+        if started := load_stream(stream_data):
+            loads[0] += 1
+        return started
+
+    def counted_save_position(position_data: player.PositionData) -> None:
+        saves[0] += 1
+        save_position(position_data)
+
+    backend_changes = [0]
+    end_of_stream = backend._on_end  # pylint: disable=protected-access
+
+    def counted_end_of_stream() -> None:
+        if backend.next_stream_data is not None:
+            backend_changes[0] += 1
+        end_of_stream()
+
+    def transitions_made() -> int:
+        return loads[0] + backend_changes[0]
+
+    operations = (
+        player_.play,
+        player_.pause,
+        lambda: player_.set_track_relative(rng.choice((-1, 1))),
+        lambda: player_.set_track(rng.randrange(len(paths))),
+        lambda: player_.seek(rng.choice(list(player.SeekTime))),
+    )
+    with mock.patch.object(backend, 'load_stream', counted_load_stream), \
+         mock.patch.object(backend, '_on_end', counted_end_of_stream), \
+         mock.patch.object(player_.player_dbi, 'save_position', counted_save_position):
+        start = time.perf_counter()
+        while transitions_made() < transitions:
+            for _ in range(rng.randint(1, 5)):
+                rng.choice(operations)()
+            player_.play()
+            run(clock, until=clock.now() + StreamTime(rng.randint(1, 120), 's'))
+        elapsed = time.perf_counter() - start
+
+    stats = player_.player_adapter.get_command_stats()
+    print(f'gapless={gapless} seed={seed}')
+    print(f'  transitions      {transitions_made()} ({loads[0]} loads, {backend_changes[0]} gapless)')
+    print(f'  wall time        {elapsed:.1f} s, {transitions_made() / elapsed:.0f} transitions/s')
+    print(f'  simulated time   {clock.now().get_time("h"):.1f} h')
+    print(f'  position saves   {saves[0]}')
+    print(f'  command queue    queued {stats.queued}, merged {stats.merged}, cancelled {stats.cancelled}, '
+          f'discarded {stats.discarded}, completed {stats.completed}, max depth {stats.max_depth}')
+
+
+def main() -> None:
+    """Parse the command line and run the stress test."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transitions', type=int, default=100000, help='number of track transitions to make')
+    parser.add_argument('--tracks', type=int, default=50, help='number of tracks in the book')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--gapless', action=argparse.BooleanOptionalAction, default=True)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        audio_book_tables.db = directory / 'benchmark.db'
+        audio_book_tables.DB_CONNECTION = sqlite_tools.DBConnectionManager(audio_book_tables.db)
+        # The tracks are never read.
+        paths = [directory / f'{number:04}.ogg' for number in range(args.tracks)]
+        for path in paths:
+            path.touch()
+        stress(paths, args.transitions, args.seed, args.gapless)
+
+
+if __name__ == '__main__':
+    main()
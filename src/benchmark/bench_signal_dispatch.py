@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_signal_dispatch.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+Compare the unbatched and batched dispatch modes of signal_.Signal.
+
+Counts the GLib idle sources created, and measures the time from send() to each callback.
+
+Run from the src directory:
+    python -m benchmark.bench_signal_dispatch --sends 10000 --subscribers 4 --burst 5
+"""
+
+from __future__ import annotations
+import argparse
+import statistics
+import time
+from unittest import mock
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import signal_
+
+
+class Subscriber:  # pylint: disable=too-few-public-methods
+    """Records the latency of every signal it receives."""
+
+    def __init__(self, latencies: list[float]) -> None:
+        self._latencies = latencies
+
+    def on_signal(self, sent_at: float) -> None:
+        """Signal callback"""
+        self._latencies.append(time.perf_counter() - sent_at)
+
+
+def run(batched: bool, n_sends: int, n_subscribers: int, burst: int) -> None:
+    """Send n_sends signals, burst at a time, to n_subscribers, and report the cost."""
+    latencies: list[float] = []
+    subscribers = [Subscriber(latencies) for _ in range(n_subscribers)]
+    tx = signal_.Signal(batched=batched)
+    tx.add_signal('time_updated')
+    for sub in subscribers:
+        tx.connect('time_updated', sub.on_signal)
+
+    loop = GLib.MainLoop()
+    remaining = [n_sends]
+
+    def sender() -> bool:
+        for _ in range(min(burst, remaining[0])):
+            tx.send('time_updated', time.perf_counter())
+            remaining[0] -= 1
+        if remaining[0] > 0:
+            return True
+        # Let the last callbacks drain before quitting.
+        GLib.idle_add(loop.quit, priority=GLib.PRIORITY_LOW)
+        return False
+
+    with mock.patch.object(GLib, 'idle_add', wraps=GLib.idle_add) as idle_add:
+        GLib.idle_add(sender, priority=GLib.PRIORITY_DEFAULT)
+        start = time.perf_counter()
+        loop.run()
+        elapsed = time.perf_counter() - start
+        # Don't count the benchmark's own sources.
+        n_sources = idle_add.call_count - 2
+
+    assert len(latencies) == n_sends * n_subscribers
+    latencies.sort()
+    print(f'{"batched" if batched else "unbatched":<10}'
+          f' sources: {n_sources:8}'
+          f'  total: {elapsed * 1000:9.1f} ms'
+          f'  latency mean: {statistics.fmean(latencies) * 1e6:8.1f} us'
+          f'  p99: {latencies[int(len(latencies) * 0.99)] * 1e6:8.1f} us')
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sends', type=int, default=10000, help='number of signals to send')
+    parser.add_argument('--subscribers', type=int, default=4, help='number of connected callbacks')
+    parser.add_argument('--burst', type=int, default=1, help='number of sends per main loop iteration')
+    args = parser.parse_args()
+    for batched in (False, True):
+        run(batched, args.sends, args.subscribers, args.burst)
+
+
+if __name__ == '__main__':
+    main()
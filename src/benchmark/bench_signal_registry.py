@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_signal_registry.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+Measure the cost of connecting and disconnecting large numbers of subscribers to a signal_.Signal,
+like the row views of a large playlist all listening to the same transmitter.
+
+Each subscriber is disconnected in random order, by signal data, by callback,
+and by being garbage collected. The time per operation should not grow with the number of subscribers.
+
+Run from the src directory:
+    python -m benchmark.bench_signal_registry --subscribers 1000 10000 50000
+"""
+
+from __future__ import annotations
+import argparse
+import gc
+import random
+import time
+import signal_
+
+
+class Subscriber:  # pylint: disable=too-few-public-methods
+    """A row view that listens to the playlist."""
+
+    def on_signal(self, *args) -> None:
+        """Signal callback"""
+
+
+def timed(label: str, n_ops: int, func) -> None:
+    """Call func and print the time per operation."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f'  {label:<24} {elapsed * 1000:9.1f} ms  {elapsed / n_ops * 1e6:7.2f} us/op')
+
+
+def connect_all(tx: signal_.Signal, subscribers: list[Subscriber]) -> list[signal_.SignalData]:
+    """Connect every subscriber to tx."""
+    return [tx.connect('row_updated', sub.on_signal) for sub in subscribers]
+
+
+def run(n_subscribers: int) -> None:
+    """Connect and disconnect n_subscribers in each of the supported ways."""
+    print(f'{n_subscribers} subscribers')
+    tx = signal_.Signal()
+    tx.add_signal('row_updated')
+
+    subscribers = [Subscriber() for _ in range(n_subscribers)]
+    sig_data = []
+    timed('connect', n_subscribers, lambda: sig_data.extend(connect_all(tx, subscribers)))
+    order = list(range(n_subscribers))
+    random.shuffle(order)
+    timed('disconnect_by_signal_data', n_subscribers,
+          lambda: [tx.disconnect_by_signal_data(sig_data[i]) for i in order])
+
+    connect_all(tx, subscribers)
+    timed('disconnect_by_call_back', n_subscribers,
+          lambda: [tx.disconnect_by_call_back('row_updated', subscribers[i].on_signal) for i in order])
+
+    connect_all(tx, subscribers)
+    random.shuffle(subscribers)
+    gc.collect()
+    # The weakref callbacks run as the subscribers are freed.
+    timed('subscriber deleted', n_subscribers, subscribers.clear)
+    assert not tx._sig_handlers['row_updated']  # pylint: disable=protected-access
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='numbers of subscribers to test with')
+    args = parser.parse_args()
+    for n_subscribers in args.subscribers:
+        run(n_subscribers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_stream_time.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+Measure the cost of the StreamTime work done on every position update during playback.
+
+A tick is what GstPlayer and PlayerPositionDisplayVC do with each position:
+create the StreamTime from the queried nanoseconds, compare it with the previous position
+and the duration, and format the clock label.
+
+Run from the src directory:
+    python -m benchmark.bench_stream_time --ticks 100000
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+import tracemalloc
+from player import StreamTime
+
+
+def tick(position_ns: int, previous: StreamTime, duration: StreamTime, mark_interval: StreamTime) -> StreamTime:
+    """Do the StreamTime work of one position update."""
+    position = StreamTime(position_ns)
+    if StreamTime(0) <= position < duration and position - previous > mark_interval:
+        previous = position
+    hour, min_, sec, _ = position.get_clock_values()
+    hour_str = f'{hour:02}:' if hour else ''
+    _ = hour_str + f'{min_:02}:{sec:02}'
+    return previous
+
+
+def run(n_ticks: int) -> None:
+    """Run n_ticks ticks and report the time and allocations per tick."""
+    duration = StreamTime(10, 'h')
+    mark_interval = StreamTime(1, 's')
+    step = StreamTime(100, 'ms').get_time()
+    previous = StreamTime(0)
+
+    start = time.perf_counter()
+    for i in range(n_ticks):
+        previous = tick(i * step, previous, duration, mark_interval)
+    elapsed = time.perf_counter() - start
+
+    # Count allocations separately, tracemalloc slows down the timed loop.
+    previous = StreamTime(0)
+    tracemalloc.start()
+    allocations = 0
+    for i in range(n_ticks):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        previous = tick(i * step, previous, duration, mark_interval)
+        allocations += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    print(f'{n_ticks} ticks: {elapsed / n_ticks * 1e6:.2f} us/tick, '
+          f'{allocations / n_ticks:.0f} bytes peak allocated/tick, '
+          f'{sys.getsizeof(previous)} bytes/StreamTime')
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticks', type=int, default=100000)
+    args = parser.parse_args()
+    run(args.ticks)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+#  bench_track_change.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=wrong-import-position
+# disabled because gi.repository requires an import order that pylint dislikes.
+
+"""
+Compare the latency of manual track changes in GstPlayer with and without pipeline reuse.
+
+Generates a book of short wav tracks, then for every track unloads the previous stream and
+measures the time from load_stream() to 'stream_ready'.
+
+Run from the src directory:
+    python -m benchmark.bench_track_change --tracks 500
+"""
+
+from __future__ import annotations
+import argparse
+import array
+import math
+import statistics
+import tempfile
+import time
+import wave
+from pathlib import Path
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import GLib
+import player
+
+
+def write_book(directory: Path, n_tracks: int, seconds: float, rate: int = 22050) -> list[Path]:
+    """Write n_tracks mono wav files containing a sine wave."""
+    samples = array.array('h', (int(8000 * math.sin(2 * math.pi * 440 * i / rate))
+                                for i in range(int(seconds * rate)))).tobytes()
+    paths = []
+    for i in range(n_tracks):
+        path = directory / f'track_{i:04}.wav'
+        # pylint: disable=no-member
+        # disabled because pylint takes wave.open() to always return a Wave_read.
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes(samples)
+        # pylint: enable=no-member
+        paths.append(path)
+    return paths
+
+
+def run(reuse_pipeline: bool, paths: list[Path]) -> None:
+    """Load every track in paths, one after the other, and report the load latency."""
+    gst_player = player.GstPlayer(audio_sink='fakesink', reuse_pipeline=reuse_pipeline)
+    loop = GLib.MainLoop()
+    latencies: list[float] = []
+    remaining = list(paths)
+    load_started = [0.0]
+
+    def load_next() -> bool:
+        if not remaining:
+            loop.quit()
+            return False
+        stream_data = player.StreamData(path=remaining.pop(0),
+                                        position_data=player.PositionData(time=player.StreamTime(0)))
+        gst_player.transmitter.connect_once('stream_ready', on_loaded)
+        load_started[0] = time.perf_counter()
+        gst_player.load_stream(stream_data)
+        # Also the first load is started by GLib.idle_add, which must not call it again.
+        return False
+
+    def on_loaded() -> None:
+        latencies.append(time.perf_counter() - load_started[0])
+        gst_player.transmitter.connect_once('stream_ready', load_next)
+        gst_player.unload_stream()
+
+    GLib.idle_add(load_next)
+    start = time.perf_counter()
+    loop.run()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f'{"reuse" if reuse_pipeline else "rebuild":<8}'
+          f' tracks: {len(latencies):5}'
+          f'  total: {elapsed:7.2f} s'
+          f'  load mean: {statistics.fmean(latencies) * 1000:7.2f} ms'
+          f'  p50: {latencies[len(latencies) // 2] * 1000:7.2f} ms'
+          f'  p99: {latencies[int(len(latencies) * 0.99)] * 1000:7.2f} ms')
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tracks', type=int, default=500, help='number of tracks in the book')
+    parser.add_argument('--seconds', type=float, default=2.0, help='length of each track')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_book(Path(directory), args.tracks, args.seconds)
+        for reuse_pipeline in (False, True):
+            run(reuse_pipeline, paths)
+
+
+if __name__ == '__main__':
+    main()
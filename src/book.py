@@ -534,13 +534,13 @@ class BookC:
 
         # set up the callback system in the observer interface of the component view controllers
         # This makes it so that the component views only have to call the signal name and not do any other setup.
-        self.component_transmitter = signal_.Signal()
+        self.component_transmitter = signal_.Signal(name='BookC.component_transmitter')
         for handle in self.component_tx_api:
             self.component_transmitter.add_signal(handle)
             self.component_transmitter.connect(handle, self.receive, handle)
 
         # instantiate the component_views observable.
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='BookC')
         # register the outgoing signals that go to the component views.
         # Each of the component views now just need to connect to the signals they want to subscribe to.
         for handle in self.book_tx_api:
@@ -22,6 +22,7 @@
 #  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
 #  MA 02110-1301, USA.
 """Entry point for book_ease program"""
+import os
 import re
 import logging
 import gi
@@ -29,6 +30,8 @@ gi.require_version("Gtk", "3.0")  # pylint: disable=wrong-import-position
 from gi.repository import Gtk, GdkPixbuf, Gdk
 from gi.repository.GdkPixbuf import Pixbuf
 import signal_
+import signal_trace
+import main_loop_watchdog
 import book_reader
 import book_ease_tables
 import player
@@ -250,7 +253,12 @@ def main(unused_args):
     # pylint: disable=unused-variable
     # unused-variables must be kept to prevent garbage collection.
 
-    signal_.GLOBAL_TRANSMITTER = signal_.Signal()
+    # Setting BOOK_EASE_SIGNAL_TRACE to a file name traces signal dispatch, and writes a Chrome trace to that file.
+    signal_trace_path = os.environ.get('BOOK_EASE_SIGNAL_TRACE')
+    if signal_trace_path:
+        signal_trace.TRACER.enable()
+
+    signal_.GLOBAL_TRANSMITTER = signal_.Signal(name='GLOBAL_TRANSMITTER')
     # book
     signal_.GLOBAL_TRANSMITTER.add_signal('open_book')
     signal_.GLOBAL_TRANSMITTER.add_signal('open_new_book')
@@ -258,7 +266,10 @@ def main(unused_args):
     signal_.GLOBAL_TRANSMITTER.add_signal('bookmark_list_changed')
     # file_mgr
     # Senders of 'dir_contents_updated' are expected to send the cwd as the extra_arg
-    signal_.GLOBAL_TRANSMITTER.add_signal('dir_contents_updated')
+    # File operations can update the same directory many times a second, so limit how often
+    # each directory's update is delivered.
+    signal_.GLOBAL_TRANSMITTER.add_signal('dir_contents_updated',
+                                          coalesce=signal_.Coalesce(max_rate_hz=5, key=lambda path: path))
 
     builder = Gtk.Builder()
     builder.add_from_file("book_ease.glade")
@@ -281,7 +292,18 @@ def main(unused_args):
         builder.get_object("window1"), builder.get_object("window_1_pane"), file_manager_pane, builder
     )
 
+    # Setting BOOK_EASE_WATCHDOG_MS logs the callbacks that block the main loop for longer than that many ms.
+    if watchdog_ms := os.environ.get('BOOK_EASE_WATCHDOG_MS'):
+        watchdog = main_loop_watchdog.MainLoopWatchdog(threshold=int(watchdog_ms) / 1000)
+        watchdog.start()
+
     Gtk.main()
+    # The window has been destroyed. Set the playbin to NULL so that GStreamer stops its threads.
+    player_c_ref.shutdown()
+
+    if signal_trace_path:
+        logging.getLogger().warning('signal dispatch statistics:\n%s', signal_trace.TRACER.format_table())
+        signal_trace.TRACER.dump_chrome_trace(signal_trace_path)
     return 0
 
 
@@ -47,7 +47,7 @@ class BookReader:
         signal_.GLOBAL_TRANSMITTER.connect('open_book', self.open_existing_book)
         signal_.GLOBAL_TRANSMITTER.connect('open_new_book', self.open_new_book)
 
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='BookReader')
         self.transmitter.add_signal('book_opened', 'book_closed')
         # playlists database helper
         self.playlist_dbi = book.PlaylistDBI()
@@ -160,7 +160,7 @@ class StartPage:
     """A welcome page to be displayed in the BookReader Notebook View"""
 
     def __init__(self, gui_builder: Gtk.Builder):
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='StartPage')
         self.transmitter.add_signal('open_book')
         self.view = book_reader_view.StartPageV(gui_builder)
         self.view.set_tab_label('Start')
@@ -287,7 +287,7 @@ class OpenBook:
     NoteBookPage and BookReaderNoteBookTabVC
     """
     def __init__(self, book_: book.BookC, notebook_page: NoteBookPage, br_notebook_tab_vc: BookReaderNoteBookTabVC):
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='OpenBook')
 
         self._book = book_
         self._notebook_page = notebook_page
@@ -21,6 +21,9 @@
 #  along with this program; if not, write to the Free Software
 #  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
 #  MA 02110-1301, USA.
+#
+# pylint: disable=too-many-lines
+# disabled because the file operations, and the journal that makes a move across devices resumable, belong together.
 
 """
 This module is the backend of a Lightweight filemanager for Book Ease's use.
@@ -31,17 +34,23 @@ Copy, Move, Delete, Rename
 from __future__ import annotations
 import os
 import shutil
+import stat
 import errno
+import json
+import concurrent.futures
 from pathlib import Path
 from dataclasses import dataclass
 import threading
 from typing import List
 from typing import TYPE_CHECKING
+from typing import Iterable
 from typing_extensions import Self
 import gi
 from gi.repository import Gio, GLib
 import book_ease_tables
 import signal_
+from file_op_progress import FileOpProgress
+from tree_walker import TreeWalker, EntryKind, WalkEntry
 from gui.gtk import file_mgr_view
 # pylint: disable=no-name-in-module
 # pylint seems to think that gui.gtk.file_mgr_view_templates is a module. I don't know why.
@@ -96,10 +105,11 @@ class FileError:
 class FileMgr():
     """class to manage the file management features of book_ease"""
     _default_library_path = Path.home()
-    _default_max_depth = 8
+    _copy_chunk_size = 1024 * 1024
+    _default_copy_workers = 8
 
     def __init__(self) -> None:
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='FileMgr')
         self._file_mgr_dbi = FileMgrDBI()
         tmp_lib_path = self._file_mgr_dbi.get_library_path()
         if tmp_lib_path is None or not tmp_lib_path.is_dir():
@@ -227,154 +237,540 @@ class FileMgr():
     def move(self,
              src_file: Path,
              dest_file: Path,
-             cancel_event: threading.Event | None = None) -> list[FileError]:
+             cancel_event: threading.Event | None = None,
+             progress: FileOpProgress | None = None) -> list[FileError]:
         """
         File move operation. Move source file to destination file.
+
+        progress: Optional FileOpProgress that gets updated as the files are moved.
         """
+        self._set_progress_totals(progress, src_file)
         error_list = []
-        if not src_file.exists():
+        if not os.path.lexists(src_file):
             error_list.append(FileError(src_file, "Source file does not exist!"))
+            return error_list
 
-        if dest_file.exists():
+        if _MoveJournal.exists_for(dest_file):
+            # A previous cross-device move of src_file was interrupted, pick up where it left off.
+            return self._move_across_devices(src_file, dest_file, cancel_event, progress)
+
+        if os.path.lexists(dest_file):
             error_list.append(FileError(src_file, f"Destination file already exists, {dest_file}"))
+            return error_list
 
-        if not error_list:
+        try:
+            src_file.rename(dest_file)
+            if progress is not None:
+                # A rename completes the entire operation in one step.
+                snapshot = progress.snapshot()
+                progress.advance(n_bytes=snapshot.bytes_total - snapshot.bytes_done,
+                                 n_files=snapshot.files_total - snapshot.files_done)
+            signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', src_file.parent)
+            signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', dest_file.parent)
+        except IOError as e:
+            if e.errno == errno.EXDEV:
+                # errno.EXDEV == Cross-device link
+                # perform the copy instead.
+                error_list.extend(self._move_across_devices(src_file, dest_file, cancel_event, progress))
+            else:
+                error_list.append(FileError(src_file, e))
+        return error_list
+
+    def _move_across_devices(self,
+                             src_file: Path,
+                             dest_file: Path,
+                             cancel_event: threading.Event | None = None,
+                             progress: FileOpProgress | None = None) -> list[FileError]:
+        """
+        Move src_file to dest_file on another device, one file at a time.
+
+        Each file is copied, synced to disk, and verified against its source before the source is deleted,
+        so the move never needs more than one file's worth of extra space on the destination.
+        Source directories are removed once they have been emptied.
+
+        Progress is recorded in a _MoveJournal next to dest_file. If the move is cancelled or
+        the application dies, calling move() again with the same arguments resumes it.
+        A destination file that the journal records as moved, or whose contents match its source,
+        is then taken to have been copied by the interrupted move, and only the source is deleted.
+        A journal left by a move of other files is refused, and nothing is moved.
+        The journal is removed when the move completes without errors.
+        """
+        # pylint: disable=broad-exception-caught
+        # Disabled because it doesn't matter why it failed, only that
+        # the failure can be reported to the user in the gui.
+        error_list = []
+        journal = _MoveJournal(src_file, dest_file)
+        try:
+            journal.open()
+        except (OSError, ValueError) as e:
+            error_list.append(FileError(dest_file, e))
+            return error_list
+
+        walker = TreeWalker(src_file,
+                            post_order=True,
+                            on_error=lambda path, e: error_list.append(FileError(path, e)))
+        # The destination directory, and the number of failures inside it, at each depth of the walk.
+        dest_dirs: list[Path] = []
+        dir_errors: list[int] = []
+        errors_seen = 0
+        for entry in walker:
+            if len(error_list) > errors_seen:
+                # Directories containing a failure can't be removed from the source.
+                errors_seen = len(error_list)
+                dir_errors = [count + 1 for count in dir_errors]
+            if cancel_event is not None and cancel_event.is_set():
+                error_list.append(FileError(entry.path, f"Failed to Move to {dest_file}. Cancelled."))
+                break
             try:
-                src_file.rename(dest_file)
-                signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', src_file.parent)
-                signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', dest_file.parent)
-            except IOError as e:
-                if e.errno == errno.EXDEV:
-                    # errno.EXDEV == Cross-device link
-                    # perform the copy instead.
-                    copy_errs = self.copy(src_file, dest_file, cancel_event)
-                    error_list.extend(copy_errs)
-                    if not error_list:
-                        delete_errors = self.delete(src_file, cancel_event=cancel_event)
-                        error_list.extend(delete_errors)
-                else:
-                    error_list.append(FileError(src_file, e))
+                if entry.kind is EntryKind.DIR and entry.post_order:
+                    if dir_errors[entry.depth] == 0:
+                        self._remove_moved_dir(entry, dest_dirs[entry.depth], progress)
+                    continue
+
+                dest = Path(dest_dirs[entry.depth - 1], entry.name) if entry.depth else dest_file
+                if entry.kind is EntryKind.DIR:
+                    if not os.path.lexists(dest):
+                        dest.mkdir()
+                        self._fsync_dir(dest.parent)
+                    elif not (journal.resumed and dest.is_dir()):
+                        raise FileExistsError(f"Destination file already exists, {dest}")
+                    del dest_dirs[entry.depth:]
+                    del dir_errors[entry.depth:]
+                    dest_dirs.append(dest)
+                    dir_errors.append(0)
+                elif error := self._move_file(entry, dest, journal, cancel_event, progress):
+                    error_list.append(error)
+            except Exception as e:
+                # Don't descend into a directory that couldn't be created.
+                walker.prune()
+                error_list.append(FileError(entry.path, e))
+
+        if not error_list:
+            journal.remove()
+        signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', src_file.parent)
+        signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', dest_file.parent)
         return error_list
 
+    @staticmethod
+    def _remove_moved_dir(entry: WalkEntry, dest_dir: Path, progress: FileOpProgress | None) -> None:
+        """Remove a source directory whose contents have all been moved, after copying its metadata to dest_dir."""
+        shutil.copystat(entry.path, dest_dir)
+        os.rmdir(entry.name, dir_fd=entry.dir_fd)
+        if progress is not None and entry.depth > 0:
+            progress.advance(n_files=1)
+
+    # disable=too-many-arguments because the journal is needed alongside the usual copy arguments.
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def _move_file(self,
+                   entry: WalkEntry,
+                   dest_file: Path,
+                   journal: _MoveJournal,
+                   cancel_event: threading.Event | None,
+                   progress: FileOpProgress | None) -> FileError | None:
+        """
+        Move a file, that is not a directory, found by the walk in _move_across_devices().
+
+        The copy is made durable and recorded in the journal before the source is unlinked.
+        Returns a FileError if the copy failed. Other failures are raised.
+        """
+        src_stat = entry.lstat()
+        if os.path.lexists(dest_file):
+            # Only an interrupted move of this very file may have left it there.
+            if not (journal.resumed and (journal.was_moved(entry.path, src_stat)
+                                         or self._is_copy_of(entry.path, dest_file))):
+                raise FileExistsError(f"Destination file already exists, {dest_file}")
+            if entry.kind is EntryKind.FILE:
+                # The interruption may have come before the metadata was copied.
+                shutil.copystat(entry.path, dest_file)
+            if progress is not None:
+                progress.advance(n_bytes=src_stat.st_size, n_files=1)
+        elif entry.kind is EntryKind.FILE:
+            if error := self._copy_regular_file(entry.path, dest_file, cancel_event, progress, sync=True):
+                return error
+            if not self._is_copy_of(entry.path, dest_file):
+                raise OSError(f"Verification of the copy at {dest_file} failed.")
+        elif entry.kind is EntryKind.SYMLINK:
+            dest_file.symlink_to(os.readlink(entry.name, dir_fd=entry.dir_fd))
+            if progress is not None:
+                progress.advance(n_bytes=src_stat.st_size, n_files=1)
+        elif entry.kind is EntryKind.FIFO:
+            os.mkfifo(dest_file)
+            if progress is not None:
+                progress.advance(n_files=1)
+        else:
+            raise OSError("Cannot move files of this type.")
+
+        # The new directory entry must be on disk before the source is gone.
+        self._fsync_dir(dest_file.parent)
+        journal.record(entry.path, src_stat)
+        os.unlink(entry.name, dir_fd=entry.dir_fd)
+        return None
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def _is_copy_of(self, src_file: Path, dest_file: Path) -> bool:
+        """
+        Determine if dest_file is a complete copy of src_file, by comparing their contents.
+        Symlinks are compared by their targets, and fifos only by their type.
+        """
+        try:
+            src_mode = os.lstat(src_file).st_mode
+            dest_stat = os.lstat(dest_file)
+            if stat.S_IFMT(src_mode) != stat.S_IFMT(dest_stat.st_mode):
+                return False
+            if stat.S_ISLNK(src_mode):
+                return os.readlink(src_file) == os.readlink(dest_file)
+            if not stat.S_ISREG(src_mode):
+                return stat.S_ISFIFO(src_mode)
+            with open(src_file, 'rb') as src, open(dest_file, 'rb') as dest:
+                while chunk := src.read(self._copy_chunk_size):
+                    if dest.read(len(chunk)) != chunk:
+                        return False
+                return not dest.read(1)
+        except OSError:
+            return False
+
+    @staticmethod
+    def _fsync_dir(directory: Path) -> None:
+        """Flush the entries of directory to its device."""
+        fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
     def delete(self,
                *files: Path | list[Path],
                move_to_trash=False,
                recursive=False,
-               cancel_event: threading.Event|None=None) -> list[Path]:
+               cancel_event: threading.Event|None=None,
+               progress: FileOpProgress|None=None) -> list[Path]:
         """
         Delete files or send them to the trash.
         Returns a list of failed deletions.
 
+        progress: Optional FileOpProgress that gets updated as the files are deleted.
+
         threadsafe
         """
         if move_to_trash:
-            return self._trash(*files, recursive=recursive, cancel_event=cancel_event)
+            # Trashing is done one top level file at a time, regardless of what it contains.
+            if progress is not None:
+                progress.set_totals(len(files), 0)
+            return self._trash(*files, recursive=recursive, cancel_event=cancel_event, progress=progress)
         else:
-            return self._delete(*files, recursive=recursive, cancel_event=cancel_event)
+            self._set_progress_totals(progress, *files)
+            return self._delete(*files, recursive=recursive, cancel_event=cancel_event, progress=progress)
+
+    def _set_progress_totals(self, progress: FileOpProgress | None, *files: Path) -> None:
+        """
+        Count the files and bytes contained in files, and set them as the totals for progress.
+        Does nothing if progress is None or already has its totals set.
+
+        The top level directories themselves are not counted.
+        Symlinks are counted, but not followed.
+        """
+        if progress is None or progress.has_totals():
+            return
+        n_files = 0
+        n_bytes = 0
+        for file in files:
+            # Failures are reported by the file operation itself, so errors are ignored here.
+            for entry in TreeWalker(file):
+                if entry.kind is EntryKind.DIR:
+                    if entry.depth > 0:
+                        n_files += 1
+                    continue
+                n_files += 1
+                try:
+                    n_bytes += entry.lstat().st_size
+                except OSError:
+                    pass
+        progress.set_totals(n_files, n_bytes)
+
+    @staticmethod
+    def is_remote(path: Path) -> bool:
+        """
+        Determine if path is on a remote filesystem, e.g. NFS or SMB.
+
+        Returns False if the filesystem can't be queried.
+        Blocks on the filesystem, so don't call it from the main thread.
+        """
+        try:
+            info = Gio.File.new_for_path(str(path)).query_filesystem_info(Gio.FILE_ATTRIBUTE_FILESYSTEM_REMOTE, None)
+        except GLib.Error:
+            return False
+        return info.get_attribute_boolean(Gio.FILE_ATTRIBUTE_FILESYSTEM_REMOTE)
+
+    @classmethod
+    def prefers_copy_tree(cls, src_dir: Path, dest_dir: Path) -> bool:
+        """
+        Determine if copying src_dir into dest_dir is faster with copy_tree() than with copy().
+
+        The concurrent copy hides the per-file latency of a slow device, so it is preferred when src_dir and
+        dest_dir are on different devices, e.g. a USB drive or a network mount, or on a remote filesystem.
+        Within a single local filesystem, copy() is quicker.
+
+        Blocks on both filesystems, so don't call it from the main thread.
+        """
+        try:
+            if src_dir.stat().st_dev != dest_dir.stat().st_dev:
+                return True
+        except OSError:
+            return False
+        return cls.is_remote(src_dir) or cls.is_remote(dest_dir)
+
+    def paste_copy(self,
+                   src_file: Path,
+                   dest_file: Path,
+                   cancel_event: threading.Event | None = None,
+                   progress: FileOpProgress | None = None) -> list[FileError]:
+        """
+        * Copy src_file to dest_file with copy_tree() if src_file is a directory that prefers_copy_tree(),
+          otherwise with copy().
+
+        * Intended to run as a scheduled file operation, so that choosing the copy doesn't block
+          the main thread on a slow or hung filesystem.
+
+        * Threadsafe
+
+        * Note: All exceptions are caught and returned
+        """
+        if src_file.is_dir() and not src_file.is_symlink() and self.prefers_copy_tree(src_file, dest_file.parent):
+            return self.copy_tree(src_file, dest_file, cancel_event, progress)
+        return self.copy(src_file, dest_file, cancel_event, progress)
 
     def copy(self,
              src_file: Path,
              dest_file: Path,
              cancel_event: threading.Event|None=None,
-             depth: int=0) -> list[FileError]:
+             progress: FileOpProgress|None=None) -> list[FileError]:
         """
         * Write the contents of src_file to dest_file.
 
+        * If src_file is a directory, its contents are copied one file at a time.
+          See copy_tree() for a concurrent copy.
+
+        * progress: Optional FileOpProgress that gets updated as the files are copied.
+
         * Threadsafe
 
         * Note: All exceptions are caught and returned
         """
+        self._set_progress_totals(progress, src_file)
+        return self._copy(src_file, dest_file, cancel_event, progress)
+
+    def copy_tree(self,
+                  src_dir: Path,
+                  dest_dir: Path,
+                  cancel_event: threading.Event | None = None,
+                  progress: FileOpProgress | None = None,
+                  max_workers: int = _default_copy_workers) -> list[FileError]:
+        """
+        * Copy the directory, src_dir, and all of its contents to dest_dir.
+
+        * Unlike copy(), the regular files are copied concurrently by a bounded pool of max_workers threads,
+          while the walk creates the directory structure ahead of them. This hides the per-file latency
+          of slow devices when copying directories full of small files.
+          On a fast local disk there is no latency to hide, and the serial copy() is quicker.
+          See prefers_copy_tree().
+
+        * progress: Optional FileOpProgress that gets updated as the files are copied.
+
+        * Threadsafe
+
+        * Note: All exceptions are caught and returned
+        """
+        self._set_progress_totals(progress, src_dir)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return self._copy(src_dir, dest_dir, cancel_event, progress, executor)
+
+    def _copy(self,
+              src_file: Path,
+              dest_file: Path,
+              cancel_event: threading.Event | None,
+              progress: FileOpProgress | None,
+              executor: concurrent.futures.Executor | None = None) -> list[FileError]:
+        """
+        Copy src_file to dest_file, walking src_file if it is a directory.
+
+        Directories, symlinks and fifos are created as the walk finds them. Regular files are copied
+        inline, or submitted to executor if one is given. Directory metadata is applied last,
+        deepest directory first, so that the modification times aren't disturbed by the files
+        being copied into them.
+
+        If src_file is a directory and dest_file is an existing directory with the same name,
+        the contents are merged. If the names differ, src_file is copied into dest_file.
+        """
+        # pylint: disable=too-many-locals
+        # Disabled because the walk keeps track of the destination of each depth, the directories
+        # it created and the copies it submitted, all at once.
         # pylint: disable=broad-exception-caught
         # Disabled because it doesn't matter why it failed, only that
         # the failure can be reported to the user in the gui.
         error_list = []
-        if cancel_event.is_set():
+        if cancel_event is not None and cancel_event.is_set():
             error_list.append(FileError(src_file, f"Failed to Copy to {dest_file}. Cancelled."))
             return error_list
-
-        if depth >= self._default_max_depth:
-            error_list.append(FileError(src_file, f"Failed to copy to {dest_file} excedded max depth."))
-            return error_list
-
-        elif not src_file.exists():
+        if not os.path.lexists(src_file):
             error_list.append(FileError(src_file, "Source file does not exist!"))
             return error_list
-
-        elif src_file.is_symlink():
-            # This needs to be before the test for is_dir because symlinks to
-            # directories also pass the test for is_dir.
+        if src_file.is_dir() and not src_file.is_symlink() and dest_file.is_dir() and src_file.name != dest_file.name:
+            dest_file = Path(dest_file, src_file.name)
+        merged = dest_file.is_dir()
+
+        walker = TreeWalker(src_file, on_error=lambda path, e: error_list.append(FileError(path, e)))
+        # The destination directory at each depth of the walk.
+        dest_dirs: list[Path] = []
+        created_dirs: list[tuple[Path, Path]] = []
+        futures: list[concurrent.futures.Future] = []
+        # Directories on other devices are mount points, which are not copied.
+        src_dev = os.lstat(src_file).st_dev
+        for entry in walker:
+            if cancel_event is not None and cancel_event.is_set():
+                error_list.append(FileError(entry.path, f"Failed to Copy to {dest_file}. Cancelled."))
+                break
+            dest = Path(dest_dirs[entry.depth - 1], entry.name) if entry.depth else dest_file
             try:
-                dest_file.symlink_to(src_file.readlink())
+                if entry.kind is EntryKind.DIR:
+                    if error := self._copy_dir_entry(entry, dest, src_dev, created_dirs, progress):
+                        walker.prune()
+                        error_list.append(error)
+                        continue
+                    del dest_dirs[entry.depth:]
+                    dest_dirs.append(dest)
+
+                elif entry.kind is EntryKind.FILE and executor is not None and not os.path.lexists(dest):
+                    futures.append(executor.submit(self._copy_regular_file, entry.path, dest, cancel_event, progress))
+
+                elif error := self._copy_entry(entry, dest, cancel_event, progress):
+                    error_list.append(error)
             except Exception as e:
-                error_list.append(FileError(src_file, e))
-
-        elif src_file.is_dir():
-            if not dest_file.exists():
-                try:
-                    dest_file.mkdir()
-                    shutil.copystat(src_file, dest_file)
-                except Exception as e:
-                    error_list.append(FileError(src_file, e))
-
-            if dest_file.is_dir():
-                # Recursively copy the contents of src_file (directory) into dest_file (directory).
-                # testing for same names only matters if the calls from the view get more complex.
-                # Currently, the names are always the same.
-                if src_file.name == dest_file.name:
-                    for fil in os.listdir(src_file):
-                        new_src_file = Path(src_file, fil)
-                        new_dest_file = Path(dest_file, fil)
-                        error_list.extend(self.copy(new_src_file, new_dest_file, cancel_event, depth=depth+1))
-                else:
-                    # Call self.copy inside the dest_file directory.
-                    new_dest_file = Path(dest_file, src_file.name)
-                    error_list.extend(self.copy(src_file, new_dest_file, cancel_event, depth=depth+1))
-            else:
-                # dest_file exists and is not a directory.
-                error_list.append(FileError(src_file, f"Failed to copy to {dest_file}: Exists."))
-                return error_list
+                # Don't descend into a directory that couldn't be created.
+                walker.prune()
+                error_list.append(FileError(entry.path, e))
 
-        elif dest_file.exists():
-            # dest_file is not a directory and should not be overwritten.
-            error_list.append(FileError(src_file, f"Destination file already exists, {dest_file}"))
-            return error_list
+        error_list.extend(error for future in futures if (error := future.result()))
 
-        elif src_file.is_fifo():
-            try:
-                os.mkfifo(dest_file)
-            except Exception as e:
-                error_list.append(FileError(src_file, e))
+        # Apply the directory metadata after the files have been written, deepest directories first.
+        error_list.extend(self._copy_dir_stats(reversed(created_dirs)))
 
-        elif src_file.is_mount():
-            error_list.append(FileError(src_file, "File is a mount point."))
-            return error_list
+        signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', dest_file.parent)
+        if merged:
+            signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', dest_file)
+        return error_list
 
-        elif src_file.is_file():
-            # Copy a regular file, while periodically checking for a cancellation event
-            # and preserving metadata.
+    @staticmethod
+    def _copy_dir_entry(entry: WalkEntry,
+                        dest_file: Path,
+                        src_dev: int,
+                        created_dirs: list[tuple[Path, Path]],
+                        progress: FileOpProgress | None) -> FileError | None:
+        """
+        Create the destination of a directory found by the walk in _copy(), unless it already exists.
+        Created directories are appended to created_dirs as (src, dest) so their metadata can be copied later.
+        Returns a FileError if the directory must not be entered. Exceptions are left to the caller.
+        """
+        if entry.lstat().st_dev != src_dev:
+            return FileError(entry.path, "File is a mount point.")
+        if not os.path.lexists(dest_file):
+            dest_file.mkdir()
+            created_dirs.append((entry.path, dest_file))
+            if progress is not None and entry.depth > 0:
+                progress.advance(n_files=1)
+        elif not dest_file.is_dir():
+            return FileError(entry.path, f"Failed to copy to {dest_file}: Exists.")
+        return None
+
+    @staticmethod
+    def _copy_dir_stats(dirs: Iterable[tuple[Path, Path]]) -> list[FileError]:
+        """Copy the metadata of each (src, dest) pair of directories. Returns any failures."""
+        # pylint: disable=broad-exception-caught
+        # Disabled because it doesn't matter why it failed, only that
+        # the failure can be reported to the user in the gui.
+        error_list = []
+        for src, dest in dirs:
             try:
-                dest_file_temp = Path(dest_file.parent.absolute(), dest_file.name + '.part')
-                with open(src_file, 'rb') as i_put:
-                    with open(dest_file_temp, 'wb') as o_put:
-                        for byt in i_put:
-                            if cancel_event is None or not cancel_event.is_set():
-                                o_put.write(byt)
-                            else:
-                                raise glib_utils.AsyncWorkerCancelledError(f'Failed to Copy to {dest_file}. Cancelled.')
-                dest_file_temp.rename(dest_file)
-                shutil.copystat(src_file, dest_file)
+                shutil.copystat(src, dest)
             except Exception as e:
-                error_list.append(FileError(src_file, e))
+                error_list.append(FileError(src, e))
+        return error_list
+
+    def _copy_entry(self,
+                    entry: WalkEntry,
+                    dest_file: Path,
+                    cancel_event: threading.Event | None,
+                    progress: FileOpProgress | None) -> FileError | None:
+        """
+        Copy a file found by the walk in _copy() that is not a directory.
+        Returns a FileError if it could not be copied. Exceptions are left to the caller.
+        """
+        if os.path.lexists(dest_file):
+            # dest_file is not a directory and should not be overwritten.
+            return FileError(entry.path, f"Destination file already exists, {dest_file}")
+        if entry.kind is EntryKind.FILE:
+            return self._copy_regular_file(entry.path, dest_file, cancel_event, progress)
+        if entry.kind is EntryKind.SYMLINK:
+            dest_file.symlink_to(os.readlink(entry.name, dir_fd=entry.dir_fd))
+            if progress is not None:
+                progress.advance(n_bytes=entry.lstat().st_size, n_files=1)
+        elif entry.kind is EntryKind.FIFO:
+            os.mkfifo(dest_file)
+            if progress is not None:
+                progress.advance(n_files=1)
         else:
-            error_list.append(FileError(dest_file, "Cannot copy files of this type."))
+            return FileError(entry.path, "Cannot copy files of this type.")
+        return None
+
+    def _copy_regular_file(self,
+                           src_file: Path,
+                           dest_file: Path,
+                           cancel_event: threading.Event | None = None,
+                           progress: FileOpProgress | None = None,
+                           sync: bool = False) -> FileError | None:
+        """
+        Copy a regular file, while periodically checking for a cancellation event
+        and preserving metadata.
 
-        signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', dest_file.parent)
-        return error_list
+        The data is written to a temporary '.part' file that is renamed to dest_file once complete.
+        If sync is True, the data is flushed to the device before the rename.
+
+        Returns: a FileError on failure, otherwise None
+
+        threadsafe
+        """
+        # pylint: disable=broad-exception-caught
+        # Disabled because it doesn't matter why it failed, only that
+        # the failure can be reported to the user in the gui.
+        dest_file_temp = Path(dest_file.parent.absolute(), dest_file.name + '.part')
+        try:
+            if cancel_event is not None and cancel_event.is_set():
+                raise glib_utils.AsyncWorkerCancelledError(f'Failed to Copy to {dest_file}. Cancelled.')
+            with open(src_file, 'rb') as i_put:
+                with open(dest_file_temp, 'wb') as o_put:
+                    while chunk := i_put.read(self._copy_chunk_size):
+                        if cancel_event is None or not cancel_event.is_set():
+                            o_put.write(chunk)
+                            if progress is not None:
+                                progress.advance(n_bytes=len(chunk))
+                        else:
+                            raise glib_utils.AsyncWorkerCancelledError(f'Failed to Copy to {dest_file}. Cancelled.')
+                    if sync:
+                        o_put.flush()
+                        os.fsync(o_put.fileno())
+            dest_file_temp.rename(dest_file)
+            shutil.copystat(src_file, dest_file)
+            if progress is not None:
+                progress.advance(n_files=1)
+        except Exception as e:
+            dest_file_temp.unlink(missing_ok=True)
+            return FileError(src_file, e)
+        return None
 
     def _trash(self,
                *files: Path | list[Path],
                recursive=False,
-               cancel_event: threading.Event|None=None) -> list[FileError]:
+               cancel_event: threading.Event|None=None,
+               progress: FileOpProgress|None=None) -> list[FileError]:
         """
         Send files to the trash.
         Send dir_contents_updated signal if any files were seccessfully trashed.
@@ -387,15 +783,17 @@ class FileMgr():
         failed_deletions = []
         dir_changed = False
         for file in files:
-            if cancel_event.is_set():
+            if cancel_event is not None and cancel_event.is_set():
                 failed_deletions.append(FileError(file, 'Delete File to Trash Cancelled.'))
                 continue
             try:
-                if file.is_dir() and not recursive and os.listdir(file):
+                if not recursive and self._is_populated_dir(file):
                     raise OSError(f"[Errno 39] Directory not empty: {file}")
                 fil: Gio.File  = Gio.File.new_for_path(str(file.absolute()))
                 fil.trash(None)
                 dir_changed = True
+                if progress is not None:
+                    progress.advance(n_files=1)
             except GLib.Error as e:
                 failed_deletions.append(FileError(file, e))
             except OSError as e:
@@ -404,61 +802,161 @@ class FileMgr():
             signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', self._current_path)
         return failed_deletions
 
+    @staticmethod
+    def _is_populated_dir(file: Path) -> bool:
+        """Determine if file is a directory, not a symlink to one, that has anything in it."""
+        for entry in TreeWalker(file):
+            if entry.depth > 0:
+                return True
+            if entry.kind is not EntryKind.DIR:
+                return False
+        return False
+
     def _delete(self,
                 *files: Path | list[Path],
                 recursive=False,
                 cancel_event: threading.Event|None=None,
-                depth: int = 0) -> list[Path]:
+                progress: FileOpProgress|None=None) -> list[Path]:
         """
         Delete files
         Delete file recursively if one of the files is a directory and recursive is set to True.
             default: False
+        A directory is only deleted without recursive if it is empty.
+
+        Files are unlinked relative to their parent directory's descriptor as the tree is walked,
+        and directories are removed after their contents. Symlinks are deleted, not followed.
 
         Send dir_contents_updated signal if any files were seccessfully deleted.
         Return a list of any files that failed to be deleted.
 
         threadsafe
         """
+        # pylint: disable=broad-exception-caught
+        # Disabled because it doesn't matter why it failed, only that
+        # the failure can be reported to the user in the gui.
         failed_deletions = []
-        if depth >= self._default_max_depth:
-            for file in files:
-                failed_deletions.append(FileError(file, 'Max Depth Reached.'))
-            return failed_deletions
-
         for file in files:
             if cancel_event is not None and cancel_event.is_set():
                 failed_deletions.append(FileError(file, 'Delete File Cancelled.'))
                 continue
-            try:
-                if not file.exists():
-                    failed_deletions.append(FileError(file, 'file: does not exist'))
-                    continue
+            if not os.path.lexists(file):
+                failed_deletions.append(FileError(file, 'file: does not exist'))
+                continue
 
-                if file.is_file():
-                    file.unlink()
-
-                elif file.is_dir():
-                    if recursive:
-                        file_list_next = []
-                        for file_next in os.listdir(file):
-                            file_list_next.append(Path(file, file_next))
-
-                        if file_list_next:
-                            delete_errs = self._delete(*file_list_next,
-                                                       recursive=True,
-                                                       cancel_event=cancel_event,
-                                                       depth=depth+1)
-                            failed_deletions.extend(delete_errs)
-                        file.rmdir()
-            # pylint: disable=broad-exception-caught
-            # Disabled because it doesn't matter why it failed, only that
-            # the failure can be reported to the user in the gui.
-            except Exception as e:
-                failed_deletions.append(FileError(file, e))
+            walker = TreeWalker(file,
+                                post_order=True,
+                                on_error=lambda path, e: failed_deletions.append(FileError(path, e)))
+            for entry in walker:
+                if cancel_event is not None and cancel_event.is_set():
+                    failed_deletions.append(FileError(entry.path, 'Delete File Cancelled.'))
+                    break
+                if entry.kind is EntryKind.DIR and not recursive:
+                    walker.prune()
+                try:
+                    self._delete_entry(entry, recursive, progress)
+                except Exception as e:
+                    failed_deletions.append(FileError(entry.path, e))
 
         signal_.GLOBAL_TRANSMITTER.send('dir_contents_updated', self._current_path)
         return failed_deletions
 
+    @staticmethod
+    def _delete_entry(entry: WalkEntry, recursive: bool, progress: FileOpProgress | None) -> None:
+        """
+        Delete a file found by the walk in _delete().
+        A directory is removed on its first visit if not recursive, otherwise on its post order visit.
+        """
+        if entry.kind is EntryKind.DIR:
+            if recursive and not entry.post_order:
+                return
+            os.rmdir(entry.name, dir_fd=entry.dir_fd)
+            if progress is not None and recursive and entry.depth > 0:
+                progress.advance(n_files=1)
+        else:
+            size = entry.lstat().st_size
+            os.unlink(entry.name, dir_fd=entry.dir_fd)
+            if progress is not None:
+                progress.advance(n_bytes=size, n_files=1)
+
+
+class _MoveJournal:
+    """
+    On-disk record of a cross-device move, kept as a hidden file next to the destination.
+
+    The first line identifies the move by its source and destination, and a line is appended for every
+    source file whose copy is complete, just before the source is deleted. Its presence tells FileMgr.move()
+    that an existing destination is the partial result of an interrupted move rather than an unrelated file
+    that must not be touched, but only if the first line names the same move.
+    """
+
+    def __init__(self, src_file: Path, dest_file: Path) -> None:
+        self.src_file = src_file
+        self.dest_file = dest_file
+        self.path = self.path_for(dest_file)
+        self.resumed = False
+        """True when the journal was left by an interrupted move."""
+        # The size and mtime of each source file recorded as moved, by absolute path.
+        self._moved: dict[str, tuple[int, int]] = {}
+
+    @staticmethod
+    def path_for(dest_file: Path) -> Path:
+        """Get the location of the journal for a move to dest_file."""
+        return Path(dest_file.parent, f'.{dest_file.name}.book_ease_move')
+
+    @classmethod
+    def exists_for(cls, dest_file: Path) -> bool:
+        """Determine if there is an unfinished move to dest_file."""
+        return cls.path_for(dest_file).is_file()
+
+    def open(self) -> None:
+        """
+        Read the journal of an interrupted move, or write the header of a new one.
+        Raises ValueError if the journal on disk belongs to some other move.
+        """
+        if self.path.is_file():
+            self._read()
+            self.resumed = True
+        else:
+            self._write(self._header(), sync=True)
+
+    def was_moved(self, src_file: Path, src_stat: os.stat_result) -> bool:
+        """Determine if the interrupted move recorded src_file, and it hasn't changed since."""
+        return self._moved.get(str(src_file.absolute())) == (src_stat.st_size, src_stat.st_mtime_ns)
+
+    def record(self, src_file: Path, src_stat: os.stat_result) -> None:
+        """Record that src_file has been copied, and is about to be deleted."""
+        self._write({'moved': str(src_file.absolute()), 'size': src_stat.st_size, 'mtime_ns': src_stat.st_mtime_ns})
+
+    def remove(self) -> None:
+        """Delete the journal once the move is complete."""
+        self.path.unlink(missing_ok=True)
+
+    def _header(self) -> dict:
+        return {'src': str(self.src_file.absolute()), 'dest': str(self.dest_file.absolute())}
+
+    def _read(self) -> None:
+        """Check the header and load the records."""
+        with open(self.path, encoding='utf-8') as file:
+            lines = file.readlines()
+        try:
+            header = json.loads(lines[0])
+            # The last line is incomplete if the application died while writing it.
+            records = [json.loads(line) for line in lines[1:] if line.endswith('\n')]
+        except (IndexError, json.JSONDecodeError) as e:
+            raise ValueError(f"{self.path} is not a journal of a move, it can't be resumed.") from e
+        if header != self._header():
+            raise ValueError(f"{self.path} belongs to an unfinished move from {header.get('src')} "
+                             f"to {header.get('dest')}, not from {self.src_file}.")
+        self._moved = {record['moved']: (record['size'], record['mtime_ns']) for record in records}
+
+    def _write(self, record: dict, sync: bool = False) -> None:
+        """Append a json record to the journal."""
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + '\n')
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+
 
 class FileMgrDBI:
     """Adapter to help Files interface with book_ease.db"""
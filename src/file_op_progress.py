@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+#
+#  file_op_progress.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+This module provides progress tracking for long running file operations.
+
+FileOpProgress is updated by the file_mgr backend from inside an AsyncWorker thread
+and publishes throttled snapshots of its state to the GLib main loop, where the
+file_mgr_view task views display them.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+import signal_
+import glib_utils
+
+
+@dataclass(frozen=True)
+class FileOpProgressData:
+    """
+    Immutable snapshot of the state of a file operation.
+    This is what gets sent to the main loop with the 'progress_updated' signal.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because these are the fields of a plain data record.
+    description: str
+    files_total: int
+    files_done: int
+    bytes_total: int
+    bytes_done: int
+    bytes_per_sec: float
+    eta: float | None
+    """Estimated number of seconds remaining, or None if it can't be estimated yet."""
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the operation that has been completed, 0 <= fraction <= 1"""
+        if self.bytes_total > 0:
+            return min(self.bytes_done / self.bytes_total, 1.0)
+        if self.files_total > 0:
+            return min(self.files_done / self.files_total, 1.0)
+        return 0.0
+
+
+class FileOpProgress:
+    """
+    Track the progress of a single copy, move, or delete operation.
+
+    * The totals are set once, before the operation begins, by FileMgr.
+      Subsequent calls to set_totals() are ignored so that nested operations,
+      e.g. FileMgr.move() falling back to FileMgr.copy(), don't count the files twice.
+
+    * advance() is threadsafe. It is called from the worker thread doing the file operation.
+
+    * Snapshots are published to the GLib main loop via the 'progress_updated' signal,
+      at most once every min_interval seconds. The final snapshot is always published by finish().
+
+    * Transfer rate is smoothed with an exponential moving average so that a stalled
+      device shows up as a falling rate rather than being hidden by the long term average.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because the counters, and the state of the throttle and rate average, all belong together.
+    _rate_smoothing = 0.3
+
+    def __init__(self, description: str, min_interval: float = 0.25) -> None:
+        self.transmitter = signal_.Signal(name='FileOpProgress')
+        self.transmitter.add_signal('progress_updated', 'finished')
+
+        self.description = description
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._has_totals = False
+        self._finished = False
+
+        self._files_total = 0
+        self._bytes_total = 0
+        self._files_done = 0
+        self._bytes_done = 0
+
+        self._start_time: float | None = None
+        self._last_publish_time = 0.0
+        self._last_publish_bytes = 0
+        self._bytes_per_sec = 0.0
+
+    def has_totals(self) -> bool:
+        """Determine if the totals for this operation have already been set."""
+        return self._has_totals
+
+    def set_totals(self, files_total: int, bytes_total: int) -> None:
+        """
+        Set the number of files and bytes that this operation is expected to process.
+        Only the first call has any effect.
+        """
+        with self._lock:
+            if self._has_totals:
+                return
+            self._has_totals = True
+            self._files_total = files_total
+            self._bytes_total = bytes_total
+            self._start_time = time.monotonic()
+            self._last_publish_time = self._start_time
+        self._publish(force=True)
+
+    def advance(self, n_bytes: int = 0, n_files: int = 0) -> None:
+        """
+        Add n_bytes and n_files to the amount of completed work.
+
+        threadsafe
+        """
+        with self._lock:
+            self._bytes_done += n_bytes
+            self._files_done += n_files
+        self._publish()
+
+    def finish(self) -> None:
+        """
+        Publish the final state of the operation and send the 'finished' signal.
+        Any further updates are ignored.
+        """
+        self._publish(force=True)
+        with self._lock:
+            self._finished = True
+        # Route through the idle queue so that 'finished' is dispatched after the final 'progress_updated'.
+        glib_utils.g_idle_add_once(self.transmitter.send, 'finished')
+
+    def snapshot(self) -> FileOpProgressData:
+        """Get the current state of the operation."""
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> FileOpProgressData:
+        """Build a FileOpProgressData. self._lock must be held by the caller."""
+        now = time.monotonic()
+        elapsed = now - self._start_time if self._start_time is not None else 0.0
+        eta = None
+        if self._bytes_per_sec > 0:
+            eta = max(self._bytes_total - self._bytes_done, 0) / self._bytes_per_sec
+        return FileOpProgressData(description=self.description,
+                                  files_total=self._files_total,
+                                  files_done=self._files_done,
+                                  bytes_total=self._bytes_total,
+                                  bytes_done=self._bytes_done,
+                                  bytes_per_sec=self._bytes_per_sec,
+                                  eta=eta,
+                                  elapsed=elapsed)
+
+    def _publish(self, force: bool = False) -> None:
+        """
+        Send a snapshot to the main loop if min_interval has elapsed since the last one.
+        """
+        with self._lock:
+            if self._finished:
+                return
+            now = time.monotonic()
+            interval = now - self._last_publish_time
+            if not force and interval < self._min_interval:
+                return
+
+            if interval > 0:
+                instant_rate = (self._bytes_done - self._last_publish_bytes) / interval
+                if self._bytes_per_sec:
+                    self._bytes_per_sec += self._rate_smoothing * (instant_rate - self._bytes_per_sec)
+                else:
+                    self._bytes_per_sec = instant_rate
+            self._last_publish_time = now
+            self._last_publish_bytes = self._bytes_done
+            data = self._snapshot()
+        glib_utils.g_idle_add_once(self.transmitter.send, 'progress_updated', data)
+
+
+def format_bytes(n_bytes: float) -> str:
+    """Format a number of bytes for display, ie '3.2 MB'"""
+    for units in ('B', 'KB', 'MB', 'GB'):
+        if abs(n_bytes) < 1000:
+            return f'{n_bytes:.1f} {units}' if units != 'B' else f'{int(n_bytes)} {units}'
+        n_bytes /= 1000
+    return f'{n_bytes:.1f} TB'
+
+
+def format_seconds(seconds: float | None) -> str:
+    """Format a number of seconds as a clock value for display, ie '01:02:03' or '02:03'"""
+    if seconds is None:
+        return '--:--'
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f'{hours:02}:{minutes:02}:{seconds:02}'
+    return f'{minutes:02}:{seconds:02}'
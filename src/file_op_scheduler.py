@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+#
+#  file_op_scheduler.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+This module queues long running file operations and runs them with bounded concurrency per device.
+
+Several large copies to the same disk run slower together than one after the other, because the
+disk spends its time seeking between them. FileOpScheduler only lets max_per_device jobs touch a
+device at once. Jobs on other devices still run in parallel.
+"""
+
+from __future__ import annotations
+import itertools
+import logging
+import os
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable
+import glib_utils
+
+
+class JobState(Enum):
+    """The life cycle of a FileOpJob"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    CANCELLED = 'cancelled'
+
+
+@dataclass(eq=False)
+class FileOpJob:
+    """
+    A file operation waiting for, or running in, a FileOpScheduler.
+    Jobs are created by FileOpScheduler.submit()
+
+    Jobs compare by identity, so that a job can be found in the scheduler's queue.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because a job holds the whole PoolWorker call until it can be started.
+    target: Callable
+    args: tuple
+    kwargs: dict
+    on_finished_cb: Callable | None
+    cb_args: tuple
+    devices: frozenset[int]
+    """The st_dev of every device that this job reads or writes."""
+    priority: int
+    seq: int
+    """Submission order, used to keep jobs of equal priority first in first out."""
+    state: JobState = JobState.QUEUED
+    worker: glib_utils.PoolWorker | None = None
+
+    def sort_key(self) -> tuple[int, int]:
+        """Jobs with the smallest key are started first."""
+        return -self.priority, self.seq
+
+
+class FileOpScheduler:
+    """
+    Queue file operations and run them on the scheduler's WorkerPool,
+    with at most max_per_device jobs using any one device at a time.
+
+    * A job that uses a busy device waits, but doesn't block jobs behind it that use other devices.
+
+    * Queued jobs are started in order of priority, highest first, then in order of submission.
+
+    * The target function is called the same way that a cancellable AsyncWorker calls it,
+      with a cancel_event keyword argument.
+
+    * The jobs get their own WorkerPool rather than the default one, so that long copies
+      can't hold up the short tasks that the rest of the application runs on the default pool.
+
+    * Not threadsafe. The scheduler must only be used from the GLib main loop.
+    """
+    _default_max_per_device = 1
+    _max_workers = 8
+    logger = logging.getLogger('FileOpScheduler')
+
+    def __init__(self, max_per_device: int = _default_max_per_device) -> None:
+        self.max_per_device = max_per_device
+        self._queue: list[FileOpJob] = []
+        self._running: list[FileOpJob] = []
+        self._device_load: dict[int, int] = {}
+        self._seq = itertools.count()
+        self._pool = glib_utils.WorkerPool(max_workers=self._max_workers, name='FileOpScheduler')
+
+    def submit(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+               # The arguments are those of the PoolWorker, and what the scheduler needs to know about it.
+               target: Callable,
+               args: tuple = (),
+               kwargs: dict | None = None,
+               on_finished_cb: Callable | None = None,
+               cb_args: tuple = (),
+               paths: tuple[Path, ...] = (),
+               priority: int = 0) -> FileOpJob:
+        """
+        Queue target(*args, **kwargs, cancel_event=threading.Event) to be run in a worker thread.
+
+        Args:
+            on_finished_cb: Called in the main loop as on_finished_cb(*cb_args, return_value) when the job ends.
+                return_value is None if the job was cancelled before it started.
+
+            paths: Every file or directory that the operation reads from or writes to.
+                Their devices determine which other jobs this one has to wait for.
+
+            priority: Jobs with a higher priority are started first.
+
+        Returns: the queued FileOpJob, for passing to reprioritize() or cancel().
+        """
+        job = FileOpJob(target=target,
+                        args=args,
+                        kwargs={} if kwargs is None else dict(kwargs),
+                        on_finished_cb=on_finished_cb,
+                        cb_args=cb_args,
+                        devices=self._devices_of(paths),
+                        priority=priority,
+                        seq=next(self._seq))
+        self._queue.append(job)
+        self._start_ready_jobs()
+        return job
+
+    def reprioritize(self, job: FileOpJob, priority: int) -> None:
+        """Change the priority of a queued job. Jobs that have already started are unaffected."""
+        job.priority = priority
+        self._start_ready_jobs()
+
+    def cancel(self, job: FileOpJob) -> None:
+        """
+        Cancel a job.
+        A queued job is removed from the queue, and a running job has its cancel_event set.
+        """
+        match job.state:
+            case JobState.QUEUED:
+                self._queue.remove(job)
+                job.state = JobState.CANCELLED
+                if job.on_finished_cb is not None:
+                    glib_utils.g_idle_add_once(job.on_finished_cb, *job.cb_args, None)
+            case JobState.RUNNING:
+                job.worker.cancel()
+
+    def queued_jobs(self) -> list[FileOpJob]:
+        """Get the jobs waiting to be run, in the order they would be started."""
+        return sorted(self._queue, key=FileOpJob.sort_key)
+
+    def running_jobs(self) -> list[FileOpJob]:
+        """Get the jobs that are currently running."""
+        return list(self._running)
+
+    def _start_ready_jobs(self) -> None:
+        """Start every queued job whose devices all have spare capacity, highest priority first."""
+        for job in self.queued_jobs():
+            if all(self._device_load.get(dev, 0) < self.max_per_device for dev in job.devices):
+                self._start(job)
+
+    def _start(self, job: FileOpJob) -> None:
+        """Run a job on the pool."""
+        self._queue.remove(job)
+        self._running.append(job)
+        for dev in job.devices:
+            self._device_load[dev] = self._device_load.get(dev, 0) + 1
+        job.state = JobState.RUNNING
+        job.worker = glib_utils.PoolWorker(target=job.target,
+                                           args=job.args,
+                                           kwargs=job.kwargs,
+                                           on_finished_cb=self._on_job_finished,
+                                           cb_args=(job,),
+                                           pass_ret_val_to_cb=True,
+                                           cancellable=True,
+                                           pool=self._pool)
+        job.worker.start()
+
+    def _on_job_finished(self, job: FileOpJob, ret_val: any) -> None:
+        """A worker thread has finished. Release its devices, and start whatever was waiting for them."""
+        self._running.remove(job)
+        for dev in job.devices:
+            self._device_load[dev] -= 1
+            if not self._device_load[dev]:
+                del self._device_load[dev]
+        job.state = JobState.FINISHED
+        if job.on_finished_cb is not None:
+            job.on_finished_cb(*job.cb_args, ret_val)
+        self._start_ready_jobs()
+
+    def _devices_of(self, paths: tuple[Path, ...]) -> frozenset[int]:
+        """
+        Get the devices of paths. Paths that don't exist yet, like a copy's destination,
+        use the device of their nearest existing parent directory.
+        """
+        devices = set()
+        for path in paths:
+            path = Path(path)
+            while True:
+                try:
+                    devices.add(os.lstat(path).st_dev)
+                    break
+                except OSError:
+                    if path.parent == path:
+                        self.logger.warning('unable to find the device of %s', path)
+                        break
+                    path = path.parent
+        return frozenset(devices)
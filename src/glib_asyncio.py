@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+#
+#  glib_asyncio.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=wrong-import-position
+# disabled because gi.repository requires an import order that pylint dislikes.
+
+"""
+This module runs an asyncio event loop inside the GLib main context, so that multi-step flows
+can be written as coroutines that run on the main thread alongside Gtk.
+
+The asyncio loop never blocks. GLib does all of the waiting: the loop is run for one iteration
+whenever it has callbacks ready, when its next timer is due, or when one of its file descriptors
+becomes ready. Coroutines can therefore touch Gtk widgets and GstPlayer directly.
+
+Awaitable wrappers are provided for the things that currently need callbacks:
+    run_in_pool(), run_cancellable(): blocking functions, e.g. FileMgr.copy, on a glib_utils.WorkerPool
+    db_query(): DBConnectionManager queries, run on a connection owned by a worker thread
+    wait_for_signal(), expect_signal(): signal_.Signal signals
+    load_stream(), set_position(), play(), pause(): GstPlayer stream tasks, which complete with 'stream_ready'
+
+usage:
+    async def resume_book(gst_player, stream_data, db):
+        position = await glib_asyncio.db_query(db, lambda con: read_saved_position(con, stream_data))
+        await glib_asyncio.load_stream(gst_player, stream_data)
+        await glib_asyncio.set_position(gst_player, position)
+        await glib_asyncio.play(gst_player)
+
+    glib_asyncio.start(resume_book(gst_player, stream_data, book_ease_tables.DB_CONNECTION_MANAGER))
+
+The loop is installed by the first start(), so nothing is set up until a coroutine is needed.
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import math
+import selectors
+import sqlite3
+import threading
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import TYPE_CHECKING
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import glib_utils
+import sqlite_tools
+if TYPE_CHECKING:
+    import signal_
+    import player
+
+logger = logging.getLogger('glib_asyncio')
+
+
+class _GLibSelector(selectors.BaseSelector):
+    """
+    A selector whose select() never blocks. Instead, every registered file descriptor is watched
+    by a GLib source that wakes the event loop when it becomes ready.
+    """
+
+    def __init__(self, on_ready: Callable[[], None]) -> None:
+        self._selector = selectors.DefaultSelector()
+        self._on_ready = on_ready
+        self._sources: dict[int, int] = {}
+
+    def register(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = self._selector.register(fileobj, events, data)
+        self._watch(key)
+        return key
+
+    def unregister(self, fileobj) -> selectors.SelectorKey:
+        key = self._selector.unregister(fileobj)
+        self._unwatch(key.fd)
+        return key
+
+    def modify(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = self._selector.modify(fileobj, events, data)
+        self._unwatch(key.fd)
+        self._watch(key)
+        return key
+
+    def select(self, timeout=None) -> list[tuple[selectors.SelectorKey, int]]:
+        # GLib does the waiting.
+        return self._selector.select(0)
+
+    def close(self) -> None:
+        for fd in list(self._sources):
+            self._unwatch(fd)
+        self._selector.close()
+
+    def get_key(self, fileobj) -> selectors.SelectorKey:
+        return self._selector.get_key(fileobj)
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def _watch(self, key: selectors.SelectorKey) -> None:
+        """Add a GLib source that wakes the event loop when key's file descriptor is ready."""
+        condition = GLib.IOCondition(0)
+        if key.events & selectors.EVENT_READ:
+            condition |= GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR
+        if key.events & selectors.EVENT_WRITE:
+            condition |= GLib.IOCondition.OUT
+        self._sources[key.fd] = GLib.unix_fd_add_full(GLib.PRIORITY_DEFAULT, key.fd, condition, self._on_fd_ready)
+
+    def _unwatch(self, fd: int) -> None:
+        """Remove the GLib source watching fd."""
+        if (source_id := self._sources.pop(fd, None)) is not None:
+            GLib.source_remove(source_id)
+
+    def _on_fd_ready(self, _fd: int, _condition: GLib.IOCondition) -> bool:
+        """GLib callback for a ready file descriptor."""
+        self._on_ready()
+        return GLib.SOURCE_CONTINUE
+
+
+class GLibEventLoop(asyncio.SelectorEventLoop):
+    """
+    An asyncio event loop that is run by the GLib main context instead of by run_forever().
+
+    * The loop counts as running from the moment it is created, so run_forever() and
+      run_until_complete() can't be used. Start coroutines with create_task(), or start().
+
+    * Each iteration runs the callbacks that were ready at the start of the iteration, so a coroutine
+      that never awaits anything slow can't starve Gtk.
+
+    * Iterations are never nested. If a callback runs a nested GLib main loop, e.g. Gtk.Dialog.run(),
+      asyncio is suspended until it returns.
+    """
+
+    def __init__(self) -> None:
+        self._pumping = False
+        self._pump_idle_id: int | None = None
+        self._pump_timer_id: int | None = None
+        self._pump_timer_when = 0.0
+        super().__init__(selector=_GLibSelector(self._schedule_pump))
+        # pylint: disable=attribute-defined-outside-init
+        # _thread_id is asyncio's own record of the thread running the loop. Setting it makes the loop
+        # report itself as running, which it is, whenever the GLib main context is.
+        self._thread_id = threading.get_ident()
+
+    def call_soon(self, callback, *args, context=None) -> asyncio.Handle:
+        """
+        overrides: asyncio.BaseEventLoop.call_soon()
+        Make sure that GLib runs the loop soon.
+        """
+        handle = super().call_soon(callback, *args, context=context)
+        self._schedule_pump()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None) -> asyncio.TimerHandle:
+        """
+        overrides: asyncio.BaseEventLoop.call_at()
+        Make sure that GLib runs the loop when the timer is due.
+        """
+        handle = super().call_at(when, callback, *args, context=context)
+        self._schedule_pump()
+        return handle
+
+    def close(self) -> None:
+        """
+        overrides: asyncio.BaseEventLoop.close()
+        Remove the loop's GLib sources and close it.
+        """
+        for source_id in (self._pump_idle_id, self._pump_timer_id):
+            if source_id is not None:
+                GLib.source_remove(source_id)
+        self._pump_idle_id = self._pump_timer_id = None
+        self._thread_id = None  # pylint: disable=attribute-defined-outside-init
+        super().close()
+
+    def _schedule_pump(self) -> None:
+        """Add a GLib source for the next iteration of the loop, if one is needed and isn't already there."""
+        # pylint: disable=protected-access
+        # _ready and _scheduled are the queues that asyncio.BaseEventLoop._run_once() works from.
+        if self._pumping or self._pump_idle_id is not None or self.is_closed():
+            return
+        if self._ready:
+            if self._pump_timer_id is not None:
+                GLib.source_remove(self._pump_timer_id)
+                self._pump_timer_id = None
+            self._pump_idle_id = GLib.idle_add(self._on_pump_idle, priority=GLib.PRIORITY_DEFAULT)
+        elif self._scheduled:
+            when = self._scheduled[0].when()
+            if self._pump_timer_id is not None:
+                if self._pump_timer_when <= when:
+                    return
+                GLib.source_remove(self._pump_timer_id)
+            self._pump_timer_when = when
+            delay_ms = max(0, math.ceil((when - self.time()) * 1000))
+            self._pump_timer_id = GLib.timeout_add(delay_ms, self._on_pump_timer)
+
+    def _on_pump_idle(self) -> bool:
+        """GLib callback for ready asyncio callbacks."""
+        self._pump_idle_id = None
+        self._pump()
+        return GLib.SOURCE_REMOVE
+
+    def _on_pump_timer(self) -> bool:
+        """GLib callback for a due asyncio timer."""
+        self._pump_timer_id = None
+        self._pump()
+        return GLib.SOURCE_REMOVE
+
+    def _pump(self) -> None:
+        """Run one iteration of the asyncio loop."""
+        if self._pumping or self.is_closed():
+            return
+        self._pumping = True
+        asyncio.events._set_running_loop(self)  # pylint: disable=protected-access
+        try:
+            self._run_once()  # pylint: disable=protected-access
+        finally:
+            asyncio.events._set_running_loop(None)  # pylint: disable=protected-access
+            self._pumping = False
+        self._schedule_pump()
+
+
+_LOOP: GLibEventLoop | None = None
+
+
+def install() -> GLibEventLoop:
+    """
+    Create the GLibEventLoop for the default GLib main context, and make it the current asyncio event loop.
+    Calling install() again returns the same loop.
+    """
+    global _LOOP  # pylint: disable=global-statement
+    # There is only one default main context, so there is only one loop.
+    if _LOOP is None or _LOOP.is_closed():
+        _LOOP = GLibEventLoop()
+        asyncio.set_event_loop(_LOOP)
+    return _LOOP
+
+
+def start(coro: Coroutine) -> asyncio.Task:
+    """
+    Run a coroutine on the GLibEventLoop, installing it first if need be, e.g. from a Gtk callback.
+    Exceptions raised by the coroutine are logged, because nothing else may be waiting for it.
+    """
+    task = install().create_task(coro)
+    task.add_done_callback(_log_task_exception)
+    return task
+
+
+def _log_task_exception(task: asyncio.Task) -> None:
+    """Done callback for tasks created by start()"""
+    if not task.cancelled() and (error := task.exception()) is not None:
+        logger.error('task %s raised an exception', task.get_name(), exc_info=error)
+
+
+async def run_in_pool(func: Callable, *args, priority: int = 0, pool: glib_utils.WorkerPool | None = None,
+                      **kwargs) -> Any:
+    """
+    Run func(*args, **kwargs) on a WorkerPool, by default glib_utils.default_worker_pool(), and return its result.
+    """
+    pool = pool if pool is not None else glib_utils.default_worker_pool()
+    return await asyncio.wrap_future(pool.submit(func, args=args, kwargs=kwargs, priority=priority))
+
+
+async def run_cancellable(func: Callable, *args, priority: int = 0, pool: glib_utils.WorkerPool | None = None,
+                          **kwargs) -> Any:
+    """
+    Run func(*args, **kwargs, cancel_event=threading.Event) on a WorkerPool, and return its result.
+    This suits the FileMgr operations, e.g. await run_cancellable(file_mgr.copy, src, dest, progress=progress)
+
+    Cancelling the awaiting task sets cancel_event. The task is cancelled straight away,
+    but func carries on in its thread until it notices the cancel_event.
+    """
+    pool = pool if pool is not None else glib_utils.default_worker_pool()
+    return await asyncio.wrap_future(pool.submit(func, args=args, kwargs=kwargs, priority=priority,
+                                                 cancellable=True))
+
+
+class _DBExecutor:  # pylint: disable=too-few-public-methods
+    """
+    A single worker thread with its own connection to a DBConnectionManager's database.
+
+    sqlite3 connections can only be used by the thread that created them, and sqlite only allows
+    one writer at a time anyway, so each database gets one thread that runs its queries in order.
+    """
+
+    def __init__(self, database) -> None:
+        self.database = database
+        self.pool = glib_utils.WorkerPool(max_workers=1, name='db_query')
+        self._local = threading.local()
+
+    def run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run func(connection) in a transaction. This runs in the worker thread."""
+        if (db := getattr(self._local, 'db', None)) is None:
+            db = self._local.db = sqlite_tools.DBConnectionManager(self.database)
+        with db.query() as con:
+            return func(con)
+
+
+_db_executors: dict[int, _DBExecutor] = {}
+
+
+async def db_query(db: sqlite_tools.DBConnectionManager,
+                   func: Callable[[sqlite3.Connection], Any],
+                   priority: int = 0) -> Any:
+    """
+    Run func(connection) in a transaction on db's database without blocking the main loop, and return its result.
+
+    The queries for each database are run in order on a worker thread that has its own connection.
+    An in memory database can't be shared between connections, so those queries are run in the main thread.
+    """
+    if str(db.database) == ':memory:':
+        with db.query() as con:
+            return func(con)
+    if (executor := _db_executors.get(id(db))) is None or executor.database != db.database:
+        executor = _db_executors[id(db)] = _DBExecutor(db.database)
+    return await run_in_pool(executor.run, func, priority=priority, pool=executor.pool)
+
+
+class _SignalWaiter:
+    """Subscriber that resolves a future with the args of the next send of a signal."""
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.sig_data: signal_.SignalData | None = None
+
+    def on_signal(self, *args, **_kwargs) -> None:
+        """Signal callback"""
+        if not self.future.done():
+            self.future.set_result(args)
+
+    def on_future_done(self, transmitter: signal_.Signal, future: asyncio.Future) -> None:
+        """Disconnect if the future was cancelled before the signal arrived."""
+        if future.cancelled():
+            try:
+                transmitter.disconnect_by_signal_data(self.sig_data)
+            except (ValueError, ReferenceError):
+                # The signal has already been sent.
+                pass
+
+
+def expect_signal(transmitter: signal_.Signal, handle: str) -> asyncio.Future:
+    """
+    Connect to the next send of a signal straight away, and return a future for the args it is sent with.
+
+    Use this instead of wait_for_signal() when the signal is triggered by a call made after connecting, e.g.
+        ready = expect_signal(gst_player.transmitter, 'stream_ready')
+        gst_player.load_stream(stream_data)
+        await ready
+
+    Cancelling the future disconnects from the signal.
+    """
+    future = install().create_future()
+    waiter = _SignalWaiter(future)
+    waiter.sig_data = transmitter.connect_once(handle, waiter.on_signal)
+    # The future's callback keeps the waiter alive, since Signal only holds a weak reference to it.
+    future.add_done_callback(lambda future_: waiter.on_future_done(transmitter, future_))
+    return future
+
+
+async def wait_for_signal(transmitter: signal_.Signal, handle: str, timeout: float | None = None) -> tuple:
+    """
+    Wait for the next send of a signal and return the args it was sent with.
+
+    Raises: TimeoutError if timeout seconds pass first.
+    """
+    return await asyncio.wait_for(expect_signal(transmitter, handle), timeout)
+
+
+async def _run_stream_task(gst_player: player.GstPlayer, task: Callable, *args) -> None:
+    """Call one of GstPlayer's stream task methods, and wait for the 'stream_ready' signal that ends it."""
+    ready = expect_signal(gst_player.transmitter, 'stream_ready')
+    try:
+        started = task(*args)
+    except BaseException:
+        ready.cancel()
+        raise
+    if not started:
+        ready.cancel()
+        # Imported here because player needs Gst, which the rest of this module doesn't.
+        import player  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        raise player.GstPlayerError(f'GstPlayer is busy. Unable to {task.__name__}.')
+    await ready
+
+
+async def load_stream(gst_player: player.GstPlayer, stream_data: player.StreamData) -> None:
+    """Load a stream, and wait until it is ready for playback at its start position."""
+    await _run_stream_task(gst_player, gst_player.load_stream, stream_data)
+
+
+async def set_position(gst_player: player.GstPlayer, time_: player.StreamTime) -> None:
+    """Seek, and wait until the seek is complete."""
+    await _run_stream_task(gst_player, gst_player.set_position, time_)
+
+
+async def play(gst_player: player.GstPlayer) -> None:
+    """Start playback, and wait until the pipeline is playing."""
+    await _run_stream_task(gst_player, gst_player.play)
+
+
+async def pause(gst_player: player.GstPlayer) -> None:
+    """Pause playback, and wait until the pipeline is paused."""
+    await _run_stream_task(gst_player, gst_player.pause)
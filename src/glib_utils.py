@@ -33,14 +33,42 @@ such as Glib.idle_add_once().
 Other Glib functionalities are broken out to the language bindings, but the
 documentation is incomplete enough that it is more sensible to just re-implement
 something similar in Python, e.g. GTask is reimplemented as AsyncWorker.
+
+AsyncWorker starts a new thread for every task. WorkerPool runs tasks on a bounded set of
+reusable threads instead, and PoolWorker is a drop in replacement for AsyncWorker that uses it.
 """
 
+import concurrent.futures
+import heapq
+import itertools
+import logging
 import threading
 from typing import Callable
 import gi  # pylint: disable=unused-import; It's clearly used on the next line.
 from gi.repository import GLib
 
 
+RUNNING_CALLBACKS: list = []
+"""
+The callbacks that the main context is currently running, innermost last.
+g_idle_add callbacks are pushed by g_idle_add, and signal_.Signal pushes (signal name, handle, callback) tuples.
+Only the main thread modifies the list. Other threads may read it with describe_running_callbacks().
+"""
+
+
+def describe_running_callbacks() -> list[str]:
+    """Describe the entries in RUNNING_CALLBACKS, e.g. for logging where the main loop is spending its time."""
+    descriptions = []
+    # Copy the list first; the main thread may be changing it.
+    for item in list(RUNNING_CALLBACKS):
+        if isinstance(item, tuple):
+            signal_name, handle, callback = item
+            descriptions.append(f'{signal_name}.{handle} -> {getattr(callback, "__qualname__", repr(callback))}')
+        else:
+            descriptions.append(getattr(item, '__qualname__', repr(item)))
+    return descriptions
+
+
 def _g_idle_add(once: bool, callback: Callable, *cb_args, priority=GLib.PRIORITY_DEFAULT_IDLE, **cb_kwargs):
     """
     * This method wraps calls to GLib.idle_add with keyword arguments that can be passed
@@ -71,11 +99,15 @@ def _g_idle_add(once: bool, callback: Callable, *cb_args, priority=GLib.PRIORITY
         cb_args: tuple = packed_args[1]
         cb_kwargs: dict = packed_args[2]
 
-        if once:
-            callback(*cb_args, **cb_kwargs)
-            return False
-        else:
-            return callback(*cb_args, **cb_kwargs)
+        RUNNING_CALLBACKS.append(callback)
+        try:
+            if once:
+                callback(*cb_args, **cb_kwargs)
+                return False
+            else:
+                return callback(*cb_args, **cb_kwargs)
+        finally:
+            RUNNING_CALLBACKS.pop()
 
     # Pack everything into a single tuple that can be handled by GLib.idle_add.
     packed_args = (once, cb_args, cb_kwargs)
@@ -259,3 +291,266 @@ class AsyncWorker(threading.Thread):
             self._cancel_event.set()
         else:
             raise RuntimeError('Attempted to cancel an uncancellable event.')
+
+
+class MainLoopFuture(concurrent.futures.Future):
+    """
+    * A concurrent.futures.Future for a task submitted to a WorkerPool.
+
+    * Callbacks added with add_done_callback() are called in the GLib main context, not in the worker thread.
+
+    * If the task is cancellable, cancel_event is the threading.Event that was passed to it, and cancel()
+      sets it. cancel() only returns True if the task was cancelled before it started running,
+      as with any other Future.
+    """
+
+    def __init__(self, cancel_event: threading.Event | None = None) -> None:
+        super().__init__()
+        self.cancel_event = cancel_event
+
+    def add_done_callback(self, fn: Callable) -> None:
+        """
+        Call fn(future) in the GLib main context when the future is done.
+        overrides: concurrent.futures.Future.add_done_callback()
+        """
+        super().add_done_callback(lambda future: g_idle_add_once(fn, future))
+
+    def cancel(self) -> bool:
+        """
+        Cancel the task if it hasn't started, and set the cancel_event if it is cancellable.
+        overrides: concurrent.futures.Future.cancel()
+        """
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        return super().cancel()
+
+
+class _WorkItem:  # pylint: disable=too-few-public-methods
+    """A task waiting in a WorkerPool's queue."""
+    __slots__ = ['future', 'target', 'args', 'kwargs']
+
+    def __init__(self, future: MainLoopFuture, target: Callable, args: tuple, kwargs: dict) -> None:
+        self.future = future
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self) -> None:
+        """Run the task in the current thread, unless it has been cancelled, and resolve the future."""
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.target(*self.args, **self.kwargs)
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            # The exception belongs to whoever is waiting on the future.
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class WorkerPool:
+    """
+    * Run tasks on at most max_workers reusable threads.
+
+    * Threads are started as they are needed, up to max_workers, and are kept for the life of the pool.
+
+    * Queued tasks are started in order of priority, highest first, then in order of submission.
+
+    * Cancellable tasks follow the AsyncWorker convention: a cancel_event (threading.Event) is passed to
+      the task as a keyword argument, and the task is expected to check it.
+
+    * submit() is threadsafe.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because the threads, the queue and the condition that guards them all belong to the pool.
+    _default_max_workers = 4
+
+    def __init__(self, max_workers: int = _default_max_workers, name: str = 'WorkerPool') -> None:
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self.max_workers = max_workers
+        self.name = name
+        self._queue: list[tuple[int, int, _WorkItem]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        # The number of threads waiting for work that haven't already been woken up to take some.
+        self._idle = 0
+        self._shutdown = False
+
+    def submit(self,
+               target: Callable,
+               args: tuple = (),
+               kwargs: dict | None = None,
+               priority: int = 0,
+               cancellable: bool = False) -> MainLoopFuture:
+        """
+        Queue target(*args, **kwargs) to be run by a worker thread.
+
+        Args:
+            priority: Tasks with a higher priority are started first.
+
+            cancellable: Pass a cancel_event keyword argument to target. See MainLoopFuture.
+
+        Returns: A MainLoopFuture for the result of target.
+
+        Raises: RuntimeError if the pool has been shut down.
+        """
+        kwargs = {} if kwargs is None else dict(kwargs)
+        future = MainLoopFuture(threading.Event() if cancellable else None)
+        if cancellable:
+            kwargs['cancel_event'] = future.cancel_event
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError('cannot submit to a WorkerPool after it has been shut down')
+            heapq.heappush(self._queue, (-priority, next(self._seq), _WorkItem(future, target, args, kwargs)))
+            if self._idle:
+                self._idle -= 1
+                self._cond.notify()
+            elif len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work,
+                                          name=f'{self.name}-{len(self._threads)}',
+                                          daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """
+        Stop accepting tasks, and stop the threads once the queue is empty.
+
+        Args:
+            wait: Block until every thread has finished.
+
+            cancel_futures: Cancel the tasks that haven't started yet instead of running them.
+        """
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for _, _, item in self._queue:
+                    item.future.cancel()
+                self._queue.clear()
+            self._idle = 0
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _work(self) -> None:
+        """Worker thread: run tasks from the queue until the pool is shut down."""
+        while True:
+            with self._cond:
+                while not self._queue:
+                    if self._shutdown:
+                        return
+                    self._idle += 1
+                    self._cond.wait()
+                _, _, item = heapq.heappop(self._queue)
+            item.run()
+
+
+_DEFAULT_WORKER_POOL: WorkerPool | None = None
+_DEFAULT_WORKER_POOL_LOCK = threading.Lock()
+
+
+def default_worker_pool() -> WorkerPool:
+    """
+    Get the WorkerPool shared by the whole application, creating it on first use.
+    Its size can be changed by setting default_worker_pool().max_workers.
+    """
+    global _DEFAULT_WORKER_POOL  # pylint: disable=global-statement
+    # The pool is created lazily so that importing this module doesn't start any threads.
+    with _DEFAULT_WORKER_POOL_LOCK:
+        if _DEFAULT_WORKER_POOL is None:
+            _DEFAULT_WORKER_POOL = WorkerPool(name='default_worker_pool')
+        return _DEFAULT_WORKER_POOL
+
+
+class PoolWorker:
+    """
+    * Drop in replacement for AsyncWorker that runs its function on a WorkerPool instead of
+      starting a new thread.
+
+    * Takes the same arguments as AsyncWorker, except for the threading.Thread ones, plus:
+
+    Args:
+
+        priority: Queued PoolWorkers with a higher priority are started first.
+
+        pool: The WorkerPool to run on. Defaults to default_worker_pool().
+
+    * on_finished_cb is called in the main context when the function returns, as with AsyncWorker.
+      It is also called if the function raises an exception, which is logged, or if the worker was
+      cancelled before it started. In both cases the return value passed to it is None.
+    """
+    # pylint: disable=dangerous-default-value
+    # disabled because this is mirroring AsyncWorker, which mirrors threading.Thread.
+    #
+    # pylint: disable=too-many-instance-attributes,too-many-arguments,too-many-positional-arguments
+    # disabled because PoolWorker takes, and keeps, the same arguments as AsyncWorker.
+    logger = logging.getLogger('PoolWorker')
+
+    def __init__(self, target: Callable = None, args=(), kwargs={},
+                 on_finished_cb: Callable = None, cb_args=(), cb_kwargs={},
+                 cancellable: bool = False, pass_cancel_event_to_cb: bool = False,
+                 pass_ret_val_to_cb: bool = False, priority: int = 0, pool: WorkerPool | None = None):
+        self._target = target
+        self._args = args
+        self._kwargs = kwargs
+        self._on_finished_cb = on_finished_cb
+        self._cb_args = [*cb_args]
+        self._cb_kwargs = cb_kwargs
+        self._cancellable = cancellable
+        self._pass_cancel_event_to_cb = pass_cancel_event_to_cb
+        self.pass_ret_val_to_cb = pass_ret_val_to_cb
+        self.priority = priority
+        self._pool = pool
+        self._cancel_requested = False
+        self.future: MainLoopFuture | None = None
+
+    def start(self) -> None:
+        """Queue the function to be run on the pool."""
+        if self.future is not None:
+            raise RuntimeError('PoolWorker can only be started once')
+        pool = self._pool if self._pool is not None else default_worker_pool()
+        self.future = pool.submit(self._target if self._target else lambda *_, **__: None,
+                                  args=self._args,
+                                  kwargs=self._kwargs,
+                                  priority=self.priority,
+                                  cancellable=self._cancellable)
+        if self._pass_cancel_event_to_cb:
+            self._cb_args.append(self.future.cancel_event)
+        self.future.add_done_callback(self._on_done)
+        if self._cancel_requested:
+            self.future.cancel()
+
+    def _on_done(self, future: MainLoopFuture) -> None:
+        """Call on_finished_cb. This runs in the main context."""
+        ret_val = None
+        if not future.cancelled():
+            if (error := future.exception()) is not None:
+                self.logger.error('%s raised an exception', self._target, exc_info=error)
+            else:
+                ret_val = future.result()
+        if self._on_finished_cb:
+            if self.pass_ret_val_to_cb:
+                self._cb_args.append(ret_val)
+            self._on_finished_cb(*self._cb_args, **self._cb_kwargs)
+
+    def cancel(self) -> None:
+        """
+        Inform the function that it has been cancelled, or remove it from the queue if it hasn't started.
+
+        Raises: RuntimeError if the function is not cancellable.
+        """
+        if not self._cancellable:
+            raise RuntimeError('Attempted to cancel an uncancellable event.')
+        if self.future is not None:
+            self.future.cancel()
+        else:
+            self._cancel_requested = True
+
+    def done(self) -> bool:
+        """Determine if the function has finished or was cancelled."""
+        return self.future is not None and self.future.done()
@@ -243,7 +243,7 @@ class  PlaylistV:
 
     def __init__(self, display_columns, book_view_builder: Gtk.Builder):
         # Relay Gtk signals back to a controller
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='PlaylistV')
         self.transmitter.add_signal('col_header_clicked')
         self.transmitter.add_signal('button-release-event')
         self.transmitter.add_signal('editing-started')
@@ -512,7 +512,7 @@ class PlaylistVM:
 
     def __init__(self):
         # send notifications to the controller
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='PlaylistVM')
         self.transmitter.add_signal('row_deleted')
         # unique id generator for the rows in the playlist model
         self.row_id_iter = itertools.count()
@@ -35,6 +35,7 @@ from typing import Callable
 from pathlib import Path
 import os
 import logging
+import functools
 from dataclasses import dataclass
 import gi
 gi.require_version("Gtk", "3.0")  # pylint: disable=wrong-import-position
@@ -44,6 +45,8 @@ import signal_
 import book_ease_tables
 import book
 import glib_utils
+import file_op_progress
+from file_op_scheduler import FileOpScheduler
 from book_ease_path import BEPath
 # pylint: disable=no-name-in-module
 # pylint seems to think that gui.gtk.file_mgr_view_templates is a module. I don't know why.
@@ -803,23 +806,53 @@ class FileView:
         fpd.run()
         fpd.destroy()
 
-    def _delete_finished(self, delete_errors: list[file_mgr.FileError]):
+    def _delete_finished(self,
+                         progress: file_op_progress.FileOpProgress,
+                         delete_errors: list[file_mgr.FileError]):
         """
         Report errors to the user upon completion of a delete operation.
         """
+        progress.finish()
         if delete_errors:
             fmvt.ErrorDialog("failed to delete files", delete_errors)
 
+    def _schedule_file_op(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                          # The arguments are passed on to FileOpScheduler.submit().
+                          progress: file_op_progress.FileOpProgress,
+                          target: Callable,
+                          args: tuple,
+                          kwargs: dict,
+                          on_finished_cb: Callable,
+                          paths: tuple[Path, ...]) -> None:
+        """
+        Queue a file operation with the task manager's scheduler, and display its progress
+        in the task box until the operation finishes.
+
+        on_finished_cb is called as on_finished_cb(progress, errors)
+        """
+        scheduler = file_mgr_task.file_op_scheduler
+        job = scheduler.submit(target,
+                               args=args,
+                               kwargs={**kwargs, 'progress': progress},
+                               on_finished_cb=on_finished_cb,
+                               cb_args=(progress,),
+                               paths=paths)
+        progress_view = FileOpProgressView(progress, functools.partial(scheduler.cancel, job))
+        self.task_box.pack_end(progress_view.view, False, False, 0)
+
     def _paste(self) -> None:
         """
         Post the cwd to the clipboard as a paste target.
         """
         file_mgr_clipboard.paste(self.file_mgr.get_cwd())
 
-    def _copy_finished(self, paste_errors: list[file_mgr.FileError]):
+    def _copy_finished(self,
+                       progress: file_op_progress.FileOpProgress,
+                       paste_errors: list[file_mgr.FileError]):
         """
         Report errors to the user upon completion of a copy operation.
         """
+        progress.finish()
         if paste_errors:
             fmvt.ErrorDialog("failed to paste files", paste_errors)
 
@@ -831,12 +864,15 @@ class FileView:
         for src_file in clipboard_data.copy_paths:
             dest_file = Path(clipboard_data.paste_target, src_file.name)
 
-            paster = glib_utils.AsyncWorker(target=self.file_mgr.copy,
-                                            args=(src_file, dest_file),
-                                            on_finished_cb=self._copy_finished,
-                                            pass_ret_val_to_cb=True,
-                                            cancellable=True)
-            paster.start()
+            progress = file_op_progress.FileOpProgress(f'Copying {src_file.name}')
+            # paste_copy() decides between the serial and the concurrent copy in the worker thread,
+            # because it has to look at the devices, which can block on a network filesystem.
+            self._schedule_file_op(progress,
+                                   target=self.file_mgr.paste_copy,
+                                   args=(src_file, dest_file),
+                                   kwargs={},
+                                   on_finished_cb=self._copy_finished,
+                                   paths=(src_file, dest_file))
 
     def _copy_start(self) -> None:
         """
@@ -881,7 +917,13 @@ class FileView:
                 copied_files.append(selected_file)
         file_mgr_clipboard.set_data(self._cut_paste, *copied_files)
 
-    def _cut_finished(self, paste_errors: list[file_mgr.FileError]):
+    def _cut_finished(self,
+                      progress: file_op_progress.FileOpProgress,
+                      paste_errors: list[file_mgr.FileError]):
+        """
+        Report errors to the user upon completion of a move operation.
+        """
+        progress.finish()
         if paste_errors:
             fmvt.ErrorDialog("failed to move files", paste_errors)
 
@@ -892,12 +934,13 @@ class FileView:
         for src_file in clipboard_data.copy_paths:
             dest_file = Path(clipboard_data.paste_target, src_file.name)
 
-            mover_thread = glib_utils.AsyncWorker(target=self.file_mgr.move,
-                                            args=(src_file, dest_file),
-                                            on_finished_cb=self._cut_finished,
-                                            pass_ret_val_to_cb=True,
-                                            cancellable=True)
-            mover_thread.start()
+            progress = file_op_progress.FileOpProgress(f'Moving {src_file.name}')
+            self._schedule_file_op(progress,
+                                   target=self.file_mgr.move,
+                                   args=(src_file, dest_file),
+                                   kwargs={},
+                                   on_finished_cb=self._cut_finished,
+                                   paths=(src_file, dest_file))
 
     def on_menu_item_toggled(self, menu_item: Gtk.CheckMenuItem, _: any=None):
         """Callback for the CheckMenuItems from the file manager control popup."""
@@ -1074,14 +1117,13 @@ class FileView:
         verify_dialog.hide_on_delete()
         if response == Gtk.ResponseType.OK:
             sel.unselect_all()
-            deleter = glib_utils.AsyncWorker(target=self.file_mgr.delete,
-                                             args=(*file_list,),
-                                             kwargs={'recursive':verify_dialog.recursive},
-                                             on_finished_cb=self._delete_finished,
-                                             pass_cancel_event_to_cb=False,
-                                             pass_ret_val_to_cb=True,
-                                             cancellable=True)
-            deleter.start()
+            progress = file_op_progress.FileOpProgress(f'Deleting {len(file_list)} item(s)')
+            self._schedule_file_op(progress,
+                                   target=self.file_mgr.delete,
+                                   args=(*file_list,),
+                                   kwargs={'recursive':verify_dialog.recursive},
+                                   on_finished_cb=self._delete_finished,
+                                   paths=tuple(file_list))
         verify_dialog.destroy()
 
     def _create_new_folder(self):
@@ -1152,7 +1194,7 @@ class FileSelector:
                  inc_dirs: bool=False,
                  inc_files: bool=False):
 
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='FileSelector')
         self.transmitter.add_signal('task_complete')
 
         self._inc_dirs = inc_dirs
@@ -1266,9 +1308,59 @@ class FileSelector:
                 self.transmitter.send('task_complete', [])
 
 
+class FileOpProgressView:  # pylint: disable=too-few-public-methods
+    """
+    Display the progress of a single copy, move, or delete operation,
+    and offer the user the chance to cancel it.
+
+    The view removes itself from its parent when the operation finishes.
+    """
+    # Disabled because pylint doesn't really handle gi.repository very well.
+    # pylint: disable=no-member
+    def __init__(self, progress: file_op_progress.FileOpProgress, cancel_cb: Callable[[], None]) -> None:
+        self._progress = progress
+        self._cancel_cb = cancel_cb
+        self.view = fmvt.FileOpProgressBox()
+        self.view.description_label.set_text(progress.description)
+        self.view.status_label.set_text('Waiting...')
+        self.view.cancel_button.connect('clicked', self._on_cancel_clicked)
+        # The progress object holds its signal handlers weakly, so the view must keep a reference to itself
+        # until the operation has finished.
+        self._keep_alive = self
+        progress.transmitter.connect('progress_updated', self._on_progress_updated)
+        progress.transmitter.connect_once('finished', self._on_finished)
+        self.view.show_all()
+
+    def _on_progress_updated(self, data: file_op_progress.FileOpProgressData) -> None:
+        """Update the progress bar and status text with the latest snapshot of the operation."""
+        self.view.progress_bar.set_fraction(data.fraction)
+        status = f'{data.files_done} of {data.files_total} files'
+        if data.bytes_total:
+            status += (f', {file_op_progress.format_bytes(data.bytes_done)}'
+                       f' of {file_op_progress.format_bytes(data.bytes_total)}'
+                       f' ({file_op_progress.format_bytes(data.bytes_per_sec)}/s)'
+                       f', {file_op_progress.format_seconds(data.eta)} remaining')
+        self.view.status_label.set_text(status)
+
+    def _on_cancel_clicked(self, _: Gtk.Button) -> None:
+        """Cancel the file operation. The view stays up until the worker acknowledges the cancellation."""
+        self.view.cancel_button.set_sensitive(False)
+        self.view.status_label.set_text('Cancelling...')
+        self._cancel_cb()
+
+    def _on_finished(self) -> None:
+        """The file operation has finished, remove the view."""
+        if (parent := self.view.get_parent()) is not None:
+            parent.remove(self.view)
+        self.view.destroy()
+        self._keep_alive = None
+
+
 class TaskManager:
     """
     Manage the loading and running of file manager tasks in the file view.
+
+    Also owns the FileOpScheduler that queues the file views' copy, move, and delete operations.
     """
 
     task_classes = {
@@ -1278,6 +1370,8 @@ class TaskManager:
     logger = logging.getLogger('TaskManager')
 
     def __init__(self, file_mgr_views: list[FileView]) -> None:
+        self.file_op_scheduler = FileOpScheduler()
+        """Runs the copy, move, and delete operations started in any of the file views."""
         self._task_non_modal: Gtk.Widget|None = None
         self._task_modal: Gtk.Widget|None = None
         self._fmv_task_wrappers = [
@@ -217,3 +217,15 @@ class FileSelectionBox(Gtk.Box):
         renderer = Gtk.CellRendererText()
         self.selected_files_combo.pack_start(renderer, True)
         self.selected_files_combo.add_attribute(renderer, "text", 0)
+
+
+@Gtk.Template(filename='gui/gtk/file_mgr_view_templates/file_op_progress.ui')
+class FileOpProgressBox(Gtk.Box):  # pylint: disable=too-few-public-methods
+    """View displaying the progress of a copy, move, or delete operation."""
+    # pylint:disable=no-member
+    # pylint erroneously thinks that template members are of type Child.
+    __gtype_name__ = 'FileOpProgressBox'
+    description_label: Gtk.Label = Gtk.Template.Child('description_label')
+    cancel_button: Gtk.Button = Gtk.Template.Child('cancel_button')
+    progress_bar: Gtk.ProgressBar = Gtk.Template.Child('progress_bar')
+    status_label: Gtk.Label = Gtk.Template.Child('status_label')
@@ -211,7 +211,7 @@ class PinnedButtonVC:
         book_transmitter.connect('update', self.update)
         self.view = PinnedButtonV(book_view_builder)
         self.view.pinned_button.connect('toggled', self.on_button_toggled)
-        self.button_transmitter = signal_.Signal()
+        self.button_transmitter = signal_.Signal(name='PinnedButtonVC')
         self.button_transmitter.add_signal('book_updated')
         # flag to prevent loop when setting the state of the checked button
         self.mute_toggle = False
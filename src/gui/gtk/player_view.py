@@ -427,12 +427,18 @@ class PlayerPositionDisplayVC:
     """
     Controls the view of a display for showing the current track position
     on a scrollbar. It also displays current time and duration numerically.
+
+    A second scrollbar shows, and sets, the position within the whole book,
+    once the durations of all of the book's tracks are known.
     """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because the view keeps a widget for each part of the display, as well as the book position state.
     logger = logging.getLogger('PlayerPositionDisplayVC')
 
     def __init__(self, player_: player.Player, builder: Gtk.Builder):
 
         self.scale: Gtk.Scale = builder.get_object('player_playback_position_scale')
+        self.book_scale: Gtk.Scale = builder.get_object('player_book_position_scale')
         self.duration_label: Gtk.Label = builder.get_object('player_label_duration')
         self.cur_position_label: Gtk.Label = builder.get_object('player_label_cur_pos')
         self.playlist_title_label: Gtk.Label = builder.get_object('player_label_playlist_title')
@@ -443,6 +449,7 @@ class PlayerPositionDisplayVC:
         self._player.transmitter.connect('position_updated', self.on_position_updated)
         self._player.transmitter.connect('playlist_loaded', self.on_playlist_loaded)
         self._player.transmitter.connect('playlist_unloaded', self.on_playlist_unloaded)
+        self._player.transmitter.connect('book_durations_ready', self.on_book_durations_ready)
 
         self.scale.connect('button-release-event', self.on_g_button_released)
         self.scale.connect('button-press-event', self.on_g_button_pressed)
@@ -452,10 +459,24 @@ class PlayerPositionDisplayVC:
         # Capture escape key to abort position change.
         self.scale.connect('key-press-event', self.on_g_key_press)
 
+        self.book_scale.connect('button-press-event', self.on_g_book_button_pressed)
+        self.book_scale.connect('button-release-event', self.on_g_book_button_released)
+        self.book_scale.connect('format-value', self._format_scale_val_func)
+
+        # Ask the player for position updates only as often as they can be seen.
+        self.scale.connect('map', self._on_g_visibility_changed)
+        self.scale.connect('unmap', self._on_g_visibility_changed)
+        if isinstance(window := self.scale.get_toplevel(), Gtk.Window):
+            window.connect('window-state-event', self._on_g_window_state_event)
+        self._window_minimized = False
+        # The update period that makes the scale move smoothly for the current stream.
+        self._visible_update_period = player.StreamTime(500, 'ms')
+
         # This holds the most recently updated playback position sent from PlayerC.
         # Used to update the self.cur_position_label without updating the scrollbar itself.
         self.buffered_position: StreamTime = player.StreamTime(0)
         self.scale_drag_in_progress: bool = False
+        self.book_scale_drag_in_progress: bool = False
         self.previous_mark_time: player.StreamTime | None = None
 
         self._deactivate()
@@ -469,14 +490,10 @@ class PlayerPositionDisplayVC:
         """
         time_ = player.StreamTime(val, 's')
 
-        hours = time_.get_clock_value('h')
+        hours, min_, sec, ms_ = time_.get_clock_values()
         hr_str = f'{hours:02}:' if hours else ''
-
-        min_ = time_.get_clock_value('m')
         min_str = f'{min_:02}:' if (hours or min_) else ''
-
-        sec = time_.get_clock_value('s')
-        ms_ = int(time_.get_clock_value('ms') / 100)
+        ms_ = int(ms_ / 100)
         return hr_str + min_str + f'{sec:02}.{ms_}'
 
     def on_g_key_press(self, _: Gtk.Scrollbar, event: Gdk.EventKey) -> None:
@@ -487,6 +504,7 @@ class PlayerPositionDisplayVC:
         """
         if event.keyval == Gdk.KEY_Escape:
             self.scale_drag_in_progress = False
+            self._request_update_time_period()
             self.scale.set_value(self.buffered_position.get_time('ms') / 1000)
             self.scale.clear_marks()
             self.scale.set_draw_value(False)
@@ -498,6 +516,7 @@ class PlayerPositionDisplayVC:
         self.logger.debug('on_g_button_released')
         if self.scale_drag_in_progress:
             self.scale_drag_in_progress = False
+            self._request_update_time_period()
             self.scale.set_draw_value(False)
             self.scale.clear_marks()
 
@@ -511,16 +530,12 @@ class PlayerPositionDisplayVC:
         self.logger.debug('on_stream_updated')
         self.buffered_position = stream_data.position_data.time
 
-        hour = stream_data.duration.get_clock_value('h')
+        hour, min_, sec, _ = stream_data.duration.get_clock_values()
         hour_str = f'{hour:02}:' if hour else ''
-        min_ = stream_data.duration.get_clock_value('m')
-        sec = stream_data.duration.get_clock_value('s')
         self.duration_label.set_text(hour_str + f'{min_:02}:{sec:02}')
 
-        hour = self.buffered_position.get_clock_value('h')
+        hour, min_, sec, _ = self.buffered_position.get_clock_values()
         hour_str = f'{hour:02}:' if hour else ''
-        min_ = self.buffered_position.get_clock_value('m')
-        sec = self.buffered_position.get_clock_value('s')
         self.cur_position_label.set_text(hour_str + f'{min_:02}:{sec:02}')
 
         self.scale.set_range(0, stream_data.duration.get_time('s'))
@@ -536,13 +551,45 @@ class PlayerPositionDisplayVC:
 
         # Make short streams scroll a little more smoothly.
         if stream_data.duration.get_time('m') > 2:
-            self._player.set_update_time_period(player.StreamTime(500, 'ms'))
+            self._visible_update_period = player.StreamTime(500, 'ms')
         elif stream_data.duration.get_time('s') > 90:
-            self._player.set_update_time_period(player.StreamTime(200, 'ms'))
+            self._visible_update_period = player.StreamTime(200, 'ms')
         elif stream_data.duration.get_time('s') > 30:
-            self._player.set_update_time_period(player.StreamTime(100, 'ms'))
+            self._visible_update_period = player.StreamTime(100, 'ms')
+        else:
+            self._visible_update_period = player.StreamTime(50, 'ms')
+        self._request_update_time_period()
+
+    def _request_update_time_period(self) -> None:
+        """
+        Ask the player for position updates at the rate this display needs them:
+
+        * fast while either scale is visible or being drug.
+
+        * slow while the scales are hidden, so the labels and tooltip are current when they are shown again.
+
+        * not at all while the window is minimized. The player then only polls often enough to save the position.
+        """
+        if (self.scale_drag_in_progress or self.book_scale_drag_in_progress
+                or (self.scale.get_mapped() and not self._window_minimized)):
+            self._player.request_update_time_period(self, self._visible_update_period)
+        elif not self._window_minimized:
+            self._player.request_update_time_period(self, player.StreamTime(1, 's'))
         else:
-            self._player.set_update_time_period(player.StreamTime(50, 'ms'))
+            self._player.release_update_time_period(self)
+
+    def _on_g_visibility_changed(self, *_) -> None:
+        """
+        Callback for when the scale is mapped or unmapped.
+        """
+        self._request_update_time_period()
+
+    def _on_g_window_state_event(self, _: Gtk.Window, event: Gdk.EventWindowState) -> None:
+        """
+        Callback for when the toplevel window is minimized or restored.
+        """
+        self._window_minimized = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+        self._request_update_time_period()
 
     def on_playlist_unloaded(self) -> None:
         """
@@ -563,6 +610,8 @@ class PlayerPositionDisplayVC:
         self.track_file_name_label.set_has_tooltip(False)
 
         self.scale.set_sensitive(False)
+        self.book_scale.set_sensitive(False)
+        self.book_scale.set_has_tooltip(False)
         self.cur_position_label.set_sensitive(False)
         self.duration_label.set_sensitive(False)
 
@@ -586,19 +635,55 @@ class PlayerPositionDisplayVC:
         # but use ms to set the scale's value. This prevents the slider from
         # jumping back a couple pixels after dragging the slider.
         self.buffered_position = position
-        hour = self.buffered_position.get_clock_value('h')
+        hour, min_, sec, _ = self.buffered_position.get_clock_values()
         hour_str = f'{hour:02}:' if hour else ''
-        min_ = self.buffered_position.get_clock_value('m')
-        sec = self.buffered_position.get_clock_value('s')
         self.cur_position_label.set_text(hour_str + f'{min_:02}:{sec:02}')
 
         if self.scale_drag_in_progress:
             if  self.buffered_position - self.previous_mark_time > player.StreamTime(1, 's'):
                 self.scale.add_mark(self.buffered_position.get_time('ms') / 1000, Gtk.PositionType.TOP)
-                self.previous_mark_time.set_time(self.buffered_position.get_time())
+                self.previous_mark_time = self.buffered_position
         else:
             self.scale.set_value(self.buffered_position.get_time('ms') / 1000)
 
+        self._update_book_scale()
+
+    def on_book_durations_ready(self, book_durations: player.BookDurationIndex) -> None:
+        """
+        Activate the book scale now that the length of the book is known.
+        """
+        self.book_scale.set_range(0, book_durations.total.get_time('s'))
+        self.book_scale.set_sensitive(True)
+        self._update_book_scale()
+
+    def _update_book_scale(self) -> None:
+        """
+        Move the book scale to the current position in the book, and show the time remaining in its tooltip.
+        """
+        if self.book_scale_drag_in_progress or (elapsed := self._player.get_book_elapsed()) is None:
+            return
+        self.book_scale.set_value(elapsed.get_time('s'))
+        hour, min_, sec, _ = self._player.get_book_remaining().get_clock_values()
+        self.book_scale.set_tooltip_text(f'{hour:02}:{min_:02}:{sec:02} remaining in book')
+
+    def on_g_book_button_pressed(self, *_) -> None:
+        """
+        Show the potential new position in the book as the book scale slider is being drug by the user.
+        """
+        self.book_scale_drag_in_progress = True
+        self._request_update_time_period()
+        self.book_scale.set_draw_value(True)
+
+    def on_g_book_button_released(self, *_) -> None:
+        """
+        Callback for when the book scale slider is released.
+        """
+        if self.book_scale_drag_in_progress:
+            self.book_scale_drag_in_progress = False
+            self._request_update_time_period()
+            self.book_scale.set_draw_value(False)
+            self._player.go_to_book_position(player.StreamTime(self.book_scale.get_value(), 's'))
+
     def on_playlist_loaded(self, book_data: BookData) -> None:
         """Update the playlist title label."""
         self.playlist_title_label.set_text(book_data.playlist_data.get_title())
@@ -614,6 +699,7 @@ class PlayerPositionDisplayVC:
         as the scale slider is being drug by the user.
         """
         self.scale_drag_in_progress = True
+        self._request_update_time_period()
         self.scale.set_draw_value(True)
         value = self.scale.get_value()
         self.scale.add_mark(value, Gtk.PositionType.TOP)
@@ -661,12 +747,15 @@ class PlayerButtonInfoVC:
         Prepare and display the stream info dialog.
         """
         self._logger.debug('on_button_released')
-        try:
-            buffer_text = self._player.player_adapter.query_stream_info()
-        except player.GstPlayerError:
-            buffer_text = 'Failed to query stream info'
-            self._logger.error(buffer_text)
-            buffer_text += '\nTry again or perhaps try pressing play first'
+        # The stream info is cached in the StreamData once it has been discovered.
+        buffer_text = self._player.stream_data.stream_info
+        if buffer_text is None:
+            try:
+                buffer_text = self._player.player_adapter.query_stream_info()
+            except player.GstPlayerError:
+                buffer_text = 'Failed to query stream info'
+                self._logger.error(buffer_text)
+                buffer_text += '\nTry again or perhaps try pressing play first'
 
         self._info_dialog_text_buffer.set_text(buffer_text)
         self._info_dialog.show_all()
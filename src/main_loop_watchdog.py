@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+#  main_loop_watchdog.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=wrong-import-position
+# disabled because gi.repository requires an import order that pylint dislikes.
+
+"""
+This module detects stalls of the GLib main loop and reports what the main thread was doing.
+
+A periodic GLib source timestamps every iteration it gets. A watchdog thread checks the timestamp,
+and when it is older than the threshold, the main loop is stuck in a callback. The watchdog then logs
+the main thread's Python stack along with the callbacks recorded in glib_utils.RUNNING_CALLBACKS,
+e.g. the Signal handle being dispatched. When the main loop recovers, the length of the stall is logged.
+
+book_ease starts the watchdog when the BOOK_EASE_WATCHDOG_MS environment variable is set to the
+threshold in milliseconds.
+"""
+
+from __future__ import annotations
+import logging
+import sys
+import threading
+import time
+import traceback
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import glib_utils
+
+
+class StallReport:  # pylint: disable=too-few-public-methods
+    """What the main thread was doing when a stall was detected."""
+    __slots__ = ['duration', 'stack', 'callbacks']
+
+    def __init__(self, duration: float, stack: list[str], callbacks: list[str]) -> None:
+        self.duration = duration
+        """Seconds since the main loop last responded, at the time of the report."""
+        self.stack = stack
+        """The main thread's Python stack, formatted by traceback.format_stack()."""
+        self.callbacks = callbacks
+        """glib_utils.describe_running_callbacks() at the time of the report."""
+
+    def format(self) -> str:
+        """Format the report for logging."""
+        callbacks = '\n'.join(f'  {callback}' for callback in self.callbacks) or '  (none recorded)'
+        return (f'main loop stalled for {self.duration * 1000:.0f} ms\n'
+                f'running callbacks, innermost last:\n{callbacks}\n'
+                f'main thread stack:\n{"".join(self.stack)}')
+
+
+class MainLoopWatchdog:
+    """
+    Watch the responsiveness of the default GLib main context from a separate thread.
+
+    * threshold: seconds without a heartbeat before a stall is reported.
+
+    * interval: seconds between heartbeats, and between checks by the watchdog thread.
+
+    * Each stall is reported once, to on_stall if it is given, otherwise to the log.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because the settings, the heartbeat and the watching thread are all kept together.
+    logger = logging.getLogger('MainLoopWatchdog')
+
+    def __init__(self, threshold: float = 0.2, interval: float = 0.05, on_stall=None) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self._on_stall = on_stall if on_stall is not None else self._log_stall
+        self._last_beat = time.monotonic()
+        self._stall_reported = False
+        self._source_id: int | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._main_thread_id = threading.main_thread().ident
+
+    def start(self) -> None:
+        """Start the heartbeat and the watchdog thread. Must be called from the main thread."""
+        if self._thread is not None:
+            return
+        self._last_beat = time.monotonic()
+        self._source_id = GLib.timeout_add(max(1, int(self.interval * 1000)), self._heartbeat)
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name='MainLoopWatchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the main loop."""
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _heartbeat(self) -> bool:
+        """GLib callback that records that the main loop is responsive."""
+        now = time.monotonic()
+        if self._stall_reported:
+            self.logger.warning('main loop recovered after %.0f ms', (now - self._last_beat) * 1000)
+            self._stall_reported = False
+        self._last_beat = now
+        return GLib.SOURCE_CONTINUE
+
+    def _watch(self) -> None:
+        """Watchdog thread: report the main thread's state once for each stall."""
+        while not self._stop_event.wait(self.interval):
+            lag = time.monotonic() - self._last_beat
+            if lag > self.threshold and not self._stall_reported:
+                self._stall_reported = True
+                self._on_stall(self._capture(lag))
+
+    def _capture(self, lag: float) -> StallReport:
+        """Capture what the main thread is doing right now."""
+        callbacks = glib_utils.describe_running_callbacks()
+        # sys._current_frames() is the only way to see another thread's stack.
+        frame = sys._current_frames().get(self._main_thread_id)  # pylint: disable=protected-access
+        stack = traceback.format_stack(frame) if frame is not None else []
+        return StallReport(lag, stack, callbacks)
+
+    def _log_stall(self, report: StallReport) -> None:
+        """Default stall handler."""
+        self.logger.warning('%s', report.format())
@@ -38,14 +38,21 @@ This module controls the playback of playlists.
 from __future__ import annotations
 from pathlib import Path
 import io
+import os
 import numbers
 import logging
 from enum import Enum
+import dataclasses
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
+from typing import Callable
 from typing import ClassVar
 from typing import Literal
+import bisect
 import collections
+import itertools
+import threading
+import time
 import gi
 gi.require_version('Gst', '1.0')
 gi.require_version('GstAudio', '1.0')
@@ -57,6 +64,7 @@ gi.require_version('Gdk', '3.0')
 from gi.repository import Gst, GLib, GstPbutils, GstAudio, Gdk
 from lock_wrapper import Lock
 import audio_book_tables
+import glib_utils
 import signal_
 import book
 from book_reader import BookReader
@@ -71,8 +79,11 @@ class PlayerDBI:
 
     def __init__(self):
         self.player_position = audio_book_tables.PlayerPosition
+        self.track_stream_info = audio_book_tables.TrackStreamInfo
         with audio_book_tables.DB_CONNECTION.query() as con:
             self.player_position.init_table(con)
+            audio_book_tables.TrackFile.init_table(con)
+            self.track_stream_info.init_table(con)
 
     def get_position(self, playlist_id: int) -> PositionData | None:
         """Get the playlist's saved position."""
@@ -89,7 +100,6 @@ class PlayerDBI:
 
     def save_position(self, position_data: PositionData) -> None:
         """Save player position to the database."""
-        print('#################3 saving')
         with audio_book_tables.DB_CONNECTION.query() as con:
             self.player_position.upsert_row(
                 con=con,
@@ -98,16 +108,63 @@ class PlayerDBI:
                 time=position_data.time.get_time()
             )
 
+    def get_stream_info(self, path: Path, stat: os.stat_result | None = None) -> tuple[StreamTime, str] | None:
+        """
+        Get the cached duration and stream info of the file at path.
+        stat: the file's stat, if it was already taken. Otherwise the file is stat'ed here.
+
+        Returns None if nothing is cached, or the file changed since it was cached.
+        """
+        if stat is None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return None
+        with audio_book_tables.DB_CONNECTION.query() as con:
+            row = self.track_stream_info.get_row_by_path(con, str(path.absolute()), stat.st_size, stat.st_mtime_ns)
+        if row is None:
+            return None
+        return StreamTime(row['duration']), row['stream_info']
+
+    def save_stream_info(self,
+                         path: Path,
+                         duration: StreamTime,
+                         stream_info: str,
+                         stat: os.stat_result | None = None) -> None:
+        """
+        Cache the duration and stream info of the file at path.
+        stat: the file's stat, if it was already taken. Otherwise the file is stat'ed here.
+        """
+        if stat is None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return
+        with audio_book_tables.DB_CONNECTION.query() as con:
+            if (row := audio_book_tables.TrackFile.get_id_by_path(con, str(path.absolute()))) is None:
+                return
+            self.track_stream_info.upsert_row(
+                con=con,
+                track_file_id=row['id'],
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                duration=duration.get_time(),
+                stream_info=stream_info
+            )
+
 
 class StreamTime:
     """
-    Wrapper for storing time values in StreamData.
+    Immutable time value for StreamData, stored as a whole number of nanoseconds.
     Provides unit conversion functionality.
+
+    A StreamTime is created for every position update during playback, so the class is slotted,
+    arithmetic and comparisons work directly on the stored int, and get_clock_values() decomposes
+    the time into clock units in a single pass.
     """
+    __slots__ = ['_time']
 
     # Base unit for time storage is nanoseconds.
-    # The units must be in ascending order of significance for the
-    # get_clock_value() method to operate correctly.
     _time_conversions: ClassVar[dict] = {
         'ns': 1,
         'ms': pow(10, 6),
@@ -116,74 +173,97 @@ class StreamTime:
         'h': pow(10, 9) * 60 * 60
     }
 
+    # The size of the next larger unit, in nanoseconds, for each unit used by get_clock_value().
+    # 'h' is the largest unit, so its clock value is not wrapped.
+    _clock_moduli: ClassVar[dict] = {
+        'ns': pow(10, 6),
+        'ms': pow(10, 9),
+        's': pow(10, 9) * 60,
+        'm': pow(10, 9) * 60 * 60,
+        'h': None
+    }
+
     def __init__(self, time_: int | float = None, unit: str = 'ns'):
-        if time_ is None:
-            self._time = time_
+        if time_ is None or (unit == 'ns' and type(time_) is int):  # pylint: disable=unidiomatic-typecheck
+            # disabled because bool, a subclass of int, must take the conversion path.
+            time_ns = time_
         else:
-            self.set_time(time_=time_, unit=unit)
+            time_ns = int(time_ * self._time_conversions[unit])
+        object.__setattr__(self, '_time', time_ns)
+
+    @classmethod
+    def _from_ns(cls, time_ns: int) -> StreamTime:
+        """Create a StreamTime from a whole number of nanoseconds, skipping the unit conversion."""
+        stream_time = object.__new__(cls)
+        object.__setattr__(stream_time, '_time', time_ns)
+        return stream_time
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{StreamTime} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{StreamTime} is immutable')
+
+    # An immutable value is its own copy.
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # The default pickling sets the slots with setattr, which is refused.
+        return StreamTime, (self._time,)
+
+    def __repr__(self):
+        return f'StreamTime({self._time})'
+
+    def __hash__(self):
+        return hash(self._time)
 
     def __eq__(self, other):
         if isinstance(other, StreamTime):
-            if other._time == self._time:
-                return True
-            return False
+            return self._time == other._time
+        raise TypeError(f'Cannot compare {StreamTime} and {type(other)}')
+
+    def __lt__(self, other):
+        if isinstance(other, StreamTime):
+            return self._time < other._time
         raise TypeError(f'Cannot compare {StreamTime} and {type(other)}')
 
     def __gt__(self, other):
         if isinstance(other, StreamTime):
-            if self._time > other._time:
-                return True
-            return False
+            return self._time > other._time
         raise TypeError(f'Cannot compare {StreamTime} and {type(other)}')
 
     def __ge__(self, other):
         if isinstance(other, StreamTime):
-            if self._time >= other._time:
-                return True
-            return False
+            return self._time >= other._time
         raise TypeError(f'Cannot compare {StreamTime} and {type(other)}')
 
     def __le__(self, other):
         if isinstance(other, StreamTime):
-            if self._time <= other._time:
-                return True
-            return False
+            return self._time <= other._time
         raise TypeError(f'Cannot compare {StreamTime} and {type(other)}')
 
     def __add__(self, other):
         if isinstance(other, StreamTime):
-            sum_ = self.get_time() + other.get_time()
-            return StreamTime(sum_)
+            return StreamTime._from_ns(self._time + other._time)
         raise TypeError(f'expected {StreamTime} but got {type(other)}')
 
     def __sub__(self, other):
         if isinstance(other, StreamTime):
-            diff = self.get_time() - other.get_time()
-            return StreamTime(diff)
+            return StreamTime._from_ns(self._time - other._time)
         raise TypeError(f'expected {StreamTime} but got {type(other)}')
 
     def __neg__(self):
-        return StreamTime(self._time * -1)
+        return StreamTime._from_ns(-self._time)
 
     def __abs__(self):
         if self._time < 0:
             return -self
         return self
 
-    def _get_next_larger_time_unit(self, unit) -> str:
-        """
-        Get the next larger unit in the time_conversions dict.
-        """
-        found_current_unit = False
-        next_unit = None
-        for unit_key in self._time_conversions:
-            if found_current_unit:
-                next_unit = unit_key
-                break
-            if unit_key == unit:
-                found_current_unit = True
-        return next_unit
-
     def get_clock_value(self, unit: str = 'ns') -> int:
         """
         Get the stored time in the desired units, truncated to a whole number
@@ -198,26 +278,46 @@ class StreamTime:
         * StreamTime(200, 's').get_clock_value('m') == 3 is True
         * StreamTime(200, 's').get_clock_value('h') == 0 is True
         """
-        next_unit = self._get_next_larger_time_unit(unit)
-        if next_unit is None:
+        modulus = self._clock_moduli[unit]
+        if modulus is None:
             return self.get_time(unit)
+        time_ns = self._time
+        value = abs(time_ns) % modulus // self._time_conversions[unit]
+        return value if time_ns >= 0 else -value
 
-        next_larger_time = StreamTime(self.get_time(next_unit), next_unit)
-        return (self - next_larger_time).get_time(unit)
-
-    def get_time(self, unit: str = 'ns'):
+    def get_clock_values(self) -> tuple[int, int, int, int]:
         """
-        Get the stored time in the desired units, truncated to a whole number.
+        Get the stored time as the clock values of every unit from hours to milliseconds, in a single pass.
 
-        param: unit time unit of the return value
+        Returns: (hours, minutes, seconds, milliseconds)
+        Each value is the same as get_clock_value() returns for that unit.
+
+        Ex:
+        * StreamTime(3723004, 'ms').get_clock_values() == (1, 2, 3, 4) is True
         """
-        return int(self._time / self._time_conversions[unit])
+        time_ns = self._time
+        hours, rem = divmod(abs(time_ns), 3600000000000)
+        minutes, rem = divmod(rem, 60000000000)
+        seconds, rem = divmod(rem, 1000000000)
+        milliseconds = rem // 1000000
+        if time_ns < 0:
+            return -hours, -minutes, -seconds, -milliseconds
+        return hours, minutes, seconds, milliseconds
 
-    def set_time(self, time_: int | float, unit: str = 'ns'):
+    def get_time(self, unit: str = 'ns') -> int:
         """
-        Set the stored time in units, truncated to a whole number.
+        Get the stored time in the desired units, truncated to a whole number.
+
+        param: unit time unit of the return value
         """
-        self._time = int(time_ * self._time_conversions[unit])
+        time_ns = self._time
+        if unit == 'ns':
+            return time_ns
+        conversion = self._time_conversions[unit]
+        # Integer division truncated toward zero, the same as int() on a float, without the float.
+        if time_ns >= 0:
+            return time_ns // conversion
+        return -(-time_ns // conversion)
 
 
 @dataclass
@@ -245,7 +345,7 @@ class StreamData:
         """
         Record what the time was when the position was last saved to the database.
         """
-        self.last_saved_position.set_time(self.position_data.time.get_time())
+        self.last_saved_position = self.position_data.time
 
 
 class SeekTime(Enum):
@@ -260,29 +360,50 @@ class Player:  # pylint: disable=unused-argument
     """The base class for the media player model."""
 
     logger = logging.getLogger('PlayerState')
+    # The update period when no view wants positions. _on_time_updated() saves the position every 30 seconds,
+    # so this keeps the saved position at most one period late.
+    persistence_update_period = StreamTime(10, 's')
 
-    def __init__(self):
-        self.transmitter = signal_.Signal()
+    def __init__(self, gapless: bool = True, backend: PlayerBackend | None = None):
+        self.transmitter = signal_.Signal(batched=True, name='Player')
         self.transmitter.add_signal('stream_updated',
-                                    'position_updated',
                                     'playlist_finished',
                                     'playlist_loaded',
                                     'playlist_unloaded',
                                     'volume_change',
-                                    'player_enter_state')
+                                    'player_enter_state',
+                                    'book_durations_ready')
+        # Only the latest position matters to the views, so collapse bursts of updates into one.
+        self.transmitter.add_signal('position_updated', coalesce=signal_.Coalesce())
 
         self.player_dbi = PlayerDBI()
         self.track_dbi = book.TrackDBI()
         self.playlist_dbi = book.PlaylistDBI()
 
-        self.player_adapter = GstPlayerA()
+        self.player_adapter = GstPlayerA(backend)
+
+        # The durations of every track in the book, once the background scan has found them.
+        self.book_durations: BookDurationIndex | None = None
+        self.duration_scanner = BookDurationScanner(self.player_dbi, self.player_adapter.discover_stream)
+        self.duration_scanner.transmitter.connect('durations_ready', self._on_book_durations_ready)
+        # Reads the upcoming tracks into the page cache, so that starting them doesn't wait on the disk.
+        self.track_prefetcher = TrackPrefetcher()
+
         self.player_adapter.transmitter.connect('time_updated', self._on_time_updated)
         self.player_adapter.transmitter.connect('stream_loaded', self._on_stream_loaded)
         self.player_adapter.transmitter.connect('eos', self._on_eos)
+        self.player_adapter.transmitter.connect('stream_changed', self._on_stream_changed)
         self.player_adapter.transmitter.connect('volume_change', self.transmitter.send, 'volume_change')
 
         self.stream_data = StreamData()
         self.book_data = book.BookData(book.PlaylistData())
+        # Continue into the next track in the same pipeline, instead of reloading the stream on EOS.
+        self.gapless = gapless
+
+        # The update periods asked for by the views, keyed by whoever asked. See request_update_time_period().
+        self._update_time_period_requests: dict[object, StreamTime] = {}
+        self._update_time_period: StreamTime | None = None
+        self._apply_update_time_period()
 
         # Set the initial state to Player.
         self._set_state(PlayerStateInitial)
@@ -331,9 +452,9 @@ class Player:  # pylint: disable=unused-argument
         """
         self.player_adapter.set_volume(volume)
 
-    def set_track(self, track_number: int) -> None:
+    def set_track(self, track_number: int, position: StreamTime | None = None) -> None:
         """
-        Set the current track to track_number.
+        Set the current track to track_number, starting at position, or at the beginning if position is None.
 
         Raises: RuntimeError if set_track() fails to generate a completely instantiated StreamData object.
 
@@ -395,9 +516,26 @@ class Player:  # pylint: disable=unused-argument
         self.logger.warning('calling go_to_position() not implemented in this state, %s.', self.__class__.__name__)
         return False
 
+    def go_to_book_position(self, time_: StreamTime) -> bool:
+        """
+        Transport control method to set the position within the whole book to time_,
+        switching to the track that contains time_ only if it isn't the current track.
+        A time_ before the beginning of the book goes to the beginning,
+        and a time_ at or past the end goes to the end of the last track.
+
+        return: False if the durations of the book's tracks aren't known yet.
+
+        Note: PlayerState's should implement this by calling _go_to_book_position().
+        """
+        self.logger.warning('calling go_to_book_position() not implemented in this state, %s.',
+                            self.__class__.__name__)
+        return False
+
     def seek(self, time_delta: SeekTime) -> None:
         """
         Seek forward or backward in a track by an amount equal to time_delta.
+        Seeks past either end of the track continue into the neighboring tracks
+        once the durations of the book's tracks are known, stopping at the beginning and end of the book.
 
         time_delta: The amount of time to skip forwad or backward in a track.
         returns: False if the new position is past the end or beginning of a track.
@@ -413,6 +551,17 @@ class Player:  # pylint: disable=unused-argument
         """Only used by PlayerStateInitial"""
         raise NotImplementedError
 
+    def shutdown(self) -> None:
+        """
+        Stop the background work and release the media player backend, e.g. when the application is closing.
+        The Player is not used afterwards.
+
+        Note: This is valid to call in all states.
+        """
+        self.duration_scanner.cancel()
+        self.track_prefetcher.cancel()
+        self.player_adapter.shutdown()
+
     def set_update_time_period(self, period_length: StreamTime) -> bool:
         """
         Tell Player backend to set the period length for sending 'update_time' signals.
@@ -420,9 +569,43 @@ class Player:  # pylint: disable=unused-argument
 
         Note: This is valid to call in all states. On the backend it's just setting
         an instance vaiable.
+
+        Note: This overrides the requested update periods until the requests change.
+        Views should use request_update_time_period() instead.
         """
+        # Remember the period, so that a request for the period it replaced isn't taken to be unchanged.
+        self._update_time_period = period_length
         self.player_adapter.set_update_time_period(period_length)
 
+    def request_update_time_period(self, requester: object, period_length: StreamTime) -> None:
+        """
+        Ask for 'position_updated' to be sent at least every period_length.
+        requester: any hashable that identifies the caller. A later request from the same requester replaces it.
+
+        The backend polls at the shortest period that has been requested. With no requests,
+        it polls only as often as needed to keep the saved position current.
+
+        Note: This is valid to call in all states.
+        """
+        self._update_time_period_requests[requester] = period_length
+        self._apply_update_time_period()
+
+    def release_update_time_period(self, requester: object) -> None:
+        """
+        Withdraw the update period requested by requester, if it has one.
+
+        Note: This is valid to call in all states.
+        """
+        if self._update_time_period_requests.pop(requester, None) is not None:
+            self._apply_update_time_period()
+
+    def _apply_update_time_period(self) -> None:
+        """Pass the shortest requested update period to the backend, if it has changed."""
+        period_length = min(self._update_time_period_requests.values(), default=self.persistence_update_period)
+        if self._update_time_period is None or period_length != self._update_time_period:
+            self._update_time_period = period_length
+            self.player_adapter.set_update_time_period(period_length)
+
 
     def _load_playlist(self, playlist_data: book.PlaylistData) -> None:
         """Implementation for self.load_playlist"""
@@ -450,11 +633,21 @@ class Player:  # pylint: disable=unused-argument
         self.stream_data.path = current_track.get_file_path()
         self.stream_data.position_data = position_data
         self.stream_data.track_number = current_track.get_number()
+        self._load_cached_stream_info(self.stream_data)
         self.book_data = new_book_data
         self.transmitter.send('playlist_loaded', self.book_data)
+        self.book_durations = None
+        self.duration_scanner.scan(self.book_data)
+        self.track_prefetcher.cancel()
 
-    def _set_track(self, track_number: int) -> None:
+    def _set_track(self, track_number: int, position: StreamTime | None = None) -> None:
         """Implementation for self.set_track"""
+        self.stream_data = self._get_new_stream_data(track_number)
+        if position is not None:
+            self.stream_data.position_data.time = position
+
+    def _get_new_stream_data(self, track_number: int) -> StreamData:
+        """Create a StreamData positioned at the beginning of track_number."""
         track = self.book_data.get_track_by_track_number(track_number)
 
         position_data = PositionData()
@@ -466,9 +659,35 @@ class Player:  # pylint: disable=unused-argument
         new_stream_data.path = track.get_file_path()
         new_stream_data.position_data = position_data
         new_stream_data.track_number = track.get_number()
+        self._load_cached_stream_info(new_stream_data)
+        return new_stream_data
 
-        self.stream_data = new_stream_data
-        self._save_position()
+    def _load_cached_stream_info(self, stream_data: StreamData) -> None:
+        """
+        Fill in the duration and stream info of stream_data from the cache,
+        so that the player backend can skip discovering the stream.
+        """
+        stream_data.duration = None
+        stream_data.stream_info = None
+        if (cached := self.player_dbi.get_stream_info(stream_data.path)) is not None:
+            stream_data.duration, stream_data.stream_info = cached
+
+    def _save_discovered_stream_info(self, stream_data: StreamData) -> None:
+        """Cache the stream info that the player backend discovered for stream_data."""
+        if stream_data.stream_info is None:
+            if (stream_info := self.player_adapter.query_discovered_stream_info()) is not None:
+                stream_data.stream_info = stream_info
+                self.player_dbi.save_stream_info(stream_data.path, stream_data.duration, stream_info)
+
+    def _set_next_stream(self) -> None:
+        """
+        Tell the player backend which track follows the current one, for gapless playback.
+        The last track has no next stream, so the playlist still finishes with EOS.
+        """
+        next_stream_data = None
+        if self.gapless and self.stream_data.track_number + 1 < self.book_data.get_n_tracks():
+            next_stream_data = self._get_new_stream_data(self.stream_data.track_number + 1)
+        self.player_adapter.set_next_stream(next_stream_data)
 
     def _set_track_relative(self, track_delta: Literal[-1, 1]):
         """Implementation for self.set_track_relative"""
@@ -477,6 +696,9 @@ class Player:  # pylint: disable=unused-argument
 
     def _unload_playlist(self) -> None:
         """Implementation for self.unload_playlist"""
+        self.duration_scanner.cancel()
+        self.track_prefetcher.cancel()
+        self.book_durations = None
         self.stream_data = StreamData()
         self.transmitter.send('playlist_unloaded')
 
@@ -505,25 +727,82 @@ class Player:  # pylint: disable=unused-argument
             new_track_number = track_count - 1
         return new_track_number
 
-    def _on_stream_loaded(self) -> None:
+    def _on_stream_loaded(self, stream_data: StreamData | None = None) -> None:
         """
         The media player backend adapter has signaled that the stream is fully loaded.
+
+        The position is saved here rather than in _set_track(), so that skipping quickly through tracks
+        only saves the track that is finally loaded. Streams that were loaded and then skipped past are ignored.
         """
+        if stream_data is not None and stream_data is not self.stream_data:
+            self.logger.debug('_on_stream_loaded: ignoring abandoned stream %s', stream_data.path)
+            return
         self.logger.debug('_on_stream_loaded')
+        self._save_position()
         self.stream_data.duration = self.player_adapter.query_duration()
         self.stream_data.volume = self.player_adapter.query_volume()
+        self._save_discovered_stream_info(self.stream_data)
         self.transmitter.send('stream_updated', self.stream_data)
+        self._set_next_stream()
 
-    def _on_time_updated(self, position: StreamTime) -> None:
+    def _on_stream_changed(self, stream_data: StreamData) -> None:
+        """
+        The media player backend has continued into the next track without reloading the stream.
         """
-        The media player backend has updated the playback position.
+        self.logger.debug('_on_stream_changed')
+        stream_data.duration = self.player_adapter.query_duration()
+        stream_data.volume = self.player_adapter.query_volume()
+        self._save_discovered_stream_info(stream_data)
+        self.stream_data = stream_data
+        self._save_position()
+        self.transmitter.send('stream_updated', self.stream_data)
+        self._set_next_stream()
+
+    def _on_time_updated(self, position: StreamTime, stream_data: StreamData | None = None) -> None:
         """
+        The media player backend has updated the playback position of the stream in stream_data.
+
+        Positions of any other stream than self.stream_data are ignored. After a gapless change,
+        the backend sends the new stream's positions before 'stream_changed' reaches Player,
+        and they must not be saved as positions in the previous track.
+        """
+        if stream_data is not None and stream_data is not self.stream_data:
+            self.logger.debug('_on_time_updated: ignoring the position of stream %s', stream_data.path)
+            return
         self.logger.debug('_on_time_updated')
         self.stream_data.position_data.time = position
         self.transmitter.send('position_updated', position)
         # Save position when 30 seconds elapsed.
         if position.get_time('s') - self.stream_data.last_saved_position.get_time('s') > 29:
             self._save_position()
+        self.track_prefetcher.update(self.book_data, self.stream_data)
+
+    def _on_book_durations_ready(self, book_durations: BookDurationIndex) -> None:
+        """
+        The background scan has found the durations of every track in the book.
+        """
+        self.book_durations = book_durations
+        self.transmitter.send('book_durations_ready', book_durations)
+
+    def get_book_elapsed(self) -> StreamTime | None:
+        """
+        Get the time played so far in the whole book.
+
+        Returns None until the durations of the book's tracks are known.
+        """
+        if self.book_durations is None or self.stream_data.position_data is None:
+            return None
+        return self.book_durations.elapsed(self.stream_data.track_number, self.stream_data.position_data.time)
+
+    def get_book_remaining(self) -> StreamTime | None:
+        """
+        Get the time left to play in the whole book.
+
+        Returns None until the durations of the book's tracks are known.
+        """
+        if self.book_durations is None or self.stream_data.position_data is None:
+            return None
+        return self.book_durations.remaining(self.stream_data.track_number, self.stream_data.position_data.time)
 
     def _save_position(self) -> None:
         self.player_dbi.save_position(self.stream_data.position_data)
@@ -539,6 +818,19 @@ class Player:  # pylint: disable=unused-argument
         else:
             return False
 
+    def _go_to_book_position(self, time_: StreamTime) -> bool:
+        """Implementation for self.go_to_book_position"""
+        if self.book_durations is None or self.book_durations.total <= StreamTime(0):
+            return False
+        # The end of the book is the last nanosecond of the last track, since a position equal to
+        # a track's duration is past its end.
+        time_ = min(max(time_, StreamTime(0)), self.book_durations.total - StreamTime(1))
+        track_number, position = self.book_durations.locate(time_)
+        if track_number == self.stream_data.track_number:
+            return self._go_to_position(position)
+        self.set_track(track_number, position)
+        return True
+
     def _seek(self, time_delta: SeekTime) -> bool:
         """Implementation for self.seek"""
         if (position := self.player_adapter.query_position()) is not None:
@@ -546,6 +838,10 @@ class Player:  # pylint: disable=unused-argument
         else:
             position = self.stream_data.position_data.time + time_delta.value
 
+        if (self.book_durations is not None and self.stream_data.duration is not None
+                and not StreamTime(0) <= position < self.stream_data.duration):
+            # Continue the seek into the neighboring track.
+            return self._go_to_book_position(self.book_durations.elapsed(self.stream_data.track_number, position))
         return self._go_to_position(time_=position)
 
     def _state_entry(self) -> None:
@@ -580,9 +876,9 @@ class  PlayerStatePlaying(Player):
         self.player_adapter.load_stream(stream_data=self.stream_data)
         self._set_state(PlayerStatePaused)
 
-    def set_track(self, track_number: int) -> None:
+    def set_track(self, track_number: int, position: StreamTime | None = None) -> None:
         self.player_adapter.unload_stream()
-        self._set_track(track_number)
+        self._set_track(track_number, position)
         self.player_adapter.load_stream(self.stream_data)
         self.player_adapter.play()
 
@@ -593,7 +889,7 @@ class  PlayerStatePlaying(Player):
         self.player_adapter.play()
 
     def unload_playlist(self) -> None:
-        self.player_adapter.unload_stream()
+        self.player_adapter.unload_stream(release_pipeline=True)
         self._unload_playlist()
         self._set_state(PlayerStateNoPlaylistLoaded)
 
@@ -611,6 +907,9 @@ class  PlayerStatePlaying(Player):
     def go_to_position(self, time_: StreamTime) -> bool:
         return self._go_to_position(time_)
 
+    def go_to_book_position(self, time_: StreamTime) -> bool:
+        return self._go_to_book_position(time_)
+
     def set_volume(self, volume: float) -> None:
         self._set_volume(volume)
 
@@ -624,9 +923,9 @@ class  PlayerStatePaused(Player):
         self._load_playlist(playlist_data)
         self.player_adapter.load_stream(self.stream_data)
 
-    def set_track(self, track_number: int) -> None:
+    def set_track(self, track_number: int, position: StreamTime | None = None) -> None:
         self.player_adapter.unload_stream()
-        self._set_track(track_number)
+        self._set_track(track_number, position)
         self.player_adapter.load_stream(self.stream_data)
 
     def set_track_relative(self, track_delta: Literal[-1, 1]) -> None:
@@ -635,7 +934,7 @@ class  PlayerStatePaused(Player):
         self.player_adapter.load_stream(self.stream_data)
 
     def unload_playlist(self) -> None:
-        self.player_adapter.unload_stream()
+        self.player_adapter.unload_stream(release_pipeline=True)
         self._unload_playlist()
         self._set_state(PlayerStateNoPlaylistLoaded)
 
@@ -652,6 +951,9 @@ class  PlayerStatePaused(Player):
     def go_to_position(self, time_: StreamTime) -> bool:
         return self._go_to_position(time_)
 
+    def go_to_book_position(self, time_: StreamTime) -> bool:
+        return self._go_to_book_position(time_)
+
     def set_volume(self, volume: float) -> None:
         self._set_volume(volume)
 
@@ -695,6 +997,10 @@ class PlayerC:
                 if (playlist_id := args[0]) is not None and playlist_id == self.player.book_data.playlist_data.get_id():
                     self.player.unload_playlist()
 
+    def shutdown(self) -> None:
+        """Release the player's backend, the application is closing."""
+        self.player.shutdown()
+
 
 class MetaTask:
     """
@@ -706,7 +1012,7 @@ class MetaTask:
     """
 
     def __init__(self):
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='MetaTask')
         self.transmitter.add_signal('meta_task_complete')
         self._meta_task = Lock()
         self._tasks = {}
@@ -772,18 +1078,153 @@ class GstPlayerError(Exception):
     """Exeption raised by the GstPlayer class."""
 
 
-class GstPlayer:
-    """The wrapper for the gstreamer backend"""
+# Disabling because this is an interface and the args are used in the implementation classes.
+class PlayerBackend:  # pylint: disable=unused-argument
+    """
+    The interface that GstPlayerA drives. GstPlayer implements it with GStreamer,
+    simulated_player.SimulatedPlayer with a virtual clock.
+
+    Stream commands: load_stream, unload_stream, play, pause, set_position, set_volume, set_update_time_period.
+    They return False without doing anything while the backend is busy with another stream command.
+    Otherwise they return True, and the backend sends 'stream_ready' once the command is complete.
+    They raise GstPlayerError if the command can't be carried out, e.g. unload_stream with no stream loaded.
+
+    shutdown releases everything at once, abandoning any stream command in progress.
+
+    Queries return immediately. query_position, query_stream_info and query_discovered_stream_info raise
+    GstPlayerError while the backend is busy, query_duration raises it when there is no duration to report.
+
+    The transmitter sends:
+    'stream_ready':     a stream command is complete.
+    'eos':              the end of the last stream was reached.
+    'stream_changed':   with the StreamData of the next stream, which is now playing without a gap.
+    'volume_change':    with the new volume.
+    'time_updated':     with the StreamTime position, and the StreamData of the stream that it is a position in,
+                        every update time period while playing.
+    'seek_complete':    reserved, not currently sent.
+    """
+    transmitter: signal_.Signal
+
+    def load_stream(self, stream_data: StreamData) -> bool:
+        """Load the stream and prepare for playback, paused at stream_data.position_data.time."""
+        raise NotImplementedError
+
+    def unload_stream(self, release_pipeline: bool = False) -> bool:
+        """
+        Unload the current stream.
+        release_pipeline: also release what the backend keeps for the next stream, because none will follow.
+        """
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """
+        Release the backend's resources immediately, abandoning any stream command in progress.
+        Nothing is sent afterwards, and the backend is not used again.
+        """
+        raise NotImplementedError
+
+    def set_next_stream(self, stream_data: StreamData | None) -> bool:
+        """
+        Set the stream that playback continues with, without a gap, when the current stream finishes.
+        Passing None lets the current stream end with EOS. This is not a stream command, and never waits.
+        """
+        raise NotImplementedError
+
+    def play(self) -> bool:
+        """Start playback."""
+        raise NotImplementedError
+
+    def pause(self) -> bool:
+        """Pause playback."""
+        raise NotImplementedError
+
+    def set_position(self, time_: StreamTime) -> bool:
+        """Set the playback position in the current stream."""
+        raise NotImplementedError
+
+    def set_volume(self, volume: float) -> bool:
+        """Set the playback volume, normalized to 0 <= volume <= 1."""
+        raise NotImplementedError
+
+    def set_update_time_period(self, period_length: StreamTime) -> bool:
+        """Set the period length for sending 'time_updated' signals while playing."""
+        raise NotImplementedError
+
+    def query_position(self) -> StreamTime:
+        """Get the playback position in the current stream."""
+        raise NotImplementedError
+
+    def query_duration(self) -> StreamTime:
+        """Get the duration of the current stream."""
+        raise NotImplementedError
+
+    def query_volume(self) -> float:
+        """Get the playback volume, normalized to 0 <= volume <= 1. Valid while busy."""
+        raise NotImplementedError
+
+    def query_stream_info(self) -> str | None:
+        """Get the description of the current stream."""
+        raise NotImplementedError
+
+    def query_discovered_stream_info(self) -> str | None:
+        """
+        Get the description of the current stream, if it was discovered while loading the stream.
+        Returns None if it was given in the StreamData, or the discovery failed.
+        """
+        raise NotImplementedError
+
+    def discover_stream(self, path: Path) -> tuple[StreamTime, str] | None:
+        """
+        Find the duration and description of the file at path, blocking until it is done.
+        Called from worker threads, not the main thread.
+
+        Returns: (duration, stream info string), or None if the discovery failed.
+        """
+        raise NotImplementedError
+
+
+class GstPlayer(PlayerBackend):
+    """
+    The wrapper for the gstreamer backend
+
+    audio_sink: optional gst-launch description of the audio sink, e.g. 'fakesink sync=true' to play headless.
+    The playbin chooses the sink when it is not given.
+
+    reuse_pipeline: When True, unload_stream() leaves the playbin in the READY state, and the next load_stream()
+    only switches its uri, keeping the bus watch and the sinks. When False, unload_stream() sets the playbin
+    to NULL and discards it, and each load_stream() builds a new one.
+    Either way, unload_stream(release_pipeline=True), used when the playlist is unloaded, and shutdown()
+    set the playbin to NULL and discard it.
+
+    Gapless playback: set_next_stream() gives GstPlayer the stream that follows the current one.
+    When the playbin is about to finish the current stream, it continues with the next stream in the same
+    pipeline instead of reaching EOS, and GstPlayer sends 'stream_changed' with the next stream's StreamData
+    once it is playing.
+    """
     logger = logging.getLogger('GstPlayer')
 
-    def __init__(self):
+    def __init__(self, audio_sink: str | None = None, reuse_pipeline: bool = True):
         Gst.init(None)
         self.pipeline: Gst.Pipeline | None = None
+        self.reuse_pipeline = reuse_pipeline
+        self._audio_sink = audio_sink
+        self._stream_loaded = False
+        # Incremented each time a stream is loaded or unloaded, so that deferred callbacks can tell
+        # whether the stream they were scheduled for is still the one in the pipeline.
+        self._stream_generation = 0
+        # The next stream is handed to the playbin from a streaming thread in _on_about_to_finish().
+        self._next_stream_lock = threading.Lock()
+        self._next_stream_data: StreamData | None = None
+        self._pending_stream_data: StreamData | None = None
+        # The stream that is playing, which 'time_updated' is sent with. It changes on the stream-start
+        # of a next stream, before 'stream_changed' is sent.
+        self._stream_data: StreamData | None = None
         self.update_time_period = StreamTime(1, 's')
         self.update_time_period_pending = StreamTime(1, 's')
         self.update_time_id = None
-        self.transmitter = signal_.Signal()
-        self.transmitter.add_signal('time_updated', 'stream_ready', 'eos', 'seek_complete', 'volume_change')
+        self.transmitter = signal_.Signal(batched=True, name='GstPlayer')
+        self.transmitter.add_signal('stream_ready', 'eos', 'seek_complete', 'volume_change', 'stream_changed')
+        self.transmitter.add_signal('time_updated', coalesce=signal_.Coalesce())
 
         self.stream_tasks = MetaTask()
         self.stream_tasks.add_subtask('unload_stream', 'duration_ready', 'start_position_set', 'seek', 'state_change',
@@ -816,24 +1257,99 @@ class GstPlayer:
     def load_stream(self, stream_data: StreamData):
         """Load the stream and prepare for playback."""
         if not self.stream_tasks.running():
-            self._init_pipeline(stream_data)
-            self._init_message_bus()
+            if self._stream_loaded:
+                raise GstPlayerError('A stream is already loaded.')
+            if self.pipeline is None:
+                self._init_pipeline()
+                self._init_message_bus()
+            self._set_uri(stream_data)
             self._set_state(state=Gst.State.PAUSED)
-            self._stream_info.gather(self.get_uri_from_path(stream_data.path))
-            for task in ('duration_ready', 'load_stream', 'start_position_set', 'gather_stream_info'):
+            for task in ('duration_ready', 'load_stream', 'start_position_set'):
                 self.stream_tasks.begin_subtask(task)
+            self._gather_stream_info(stream_data)
             GLib.idle_add(self._load_stream_controller, stream_data.position_data.time)
             return True
         return False
 
-    def unload_stream(self):
-        """Cleanup pipeline."""
-        if not self.stream_tasks.running() and self._close_pipeline():
+    def unload_stream(self, release_pipeline: bool = False):
+        """
+        Cleanup pipeline.
+        release_pipeline: set the playbin to NULL and discard it, even if it would be reused.
+        """
+        if not self.stream_tasks.running() and self._close_pipeline(release_pipeline):
             self.stream_tasks.begin_subtask('unload_stream')
             self._g_idle_add_once(self.stream_tasks.end_subtask, 'unload_stream')
             return True
         return False
 
+    def set_next_stream(self, stream_data: StreamData | None) -> bool:
+        """
+        Set the stream that playback continues with, without a gap, when the current stream finishes.
+        Passing None lets the current stream end with EOS.
+
+        The next stream starts at its beginning. It is forgotten when the pipeline is closed.
+
+        Returns True, set_next_stream() is not a stream task and never waits on GstPlayer.
+        """
+        with self._next_stream_lock:
+            self._next_stream_data = stream_data
+        return True
+
+    def _on_about_to_finish(self, playbin: Gst.Element) -> None:
+        """
+        The playbin has buffered the end of the current stream. Give it the next stream, if there is one.
+
+        Note: This is called from a GStreamer streaming thread.
+        """
+        with self._next_stream_lock:
+            stream_data, self._next_stream_data = self._next_stream_data, None
+            if stream_data is None:
+                return
+            self._pending_stream_data = stream_data
+        playbin.set_property('uri', self.get_uri_from_path(stream_data.path))
+
+    def _on_stream_start(self, _, __) -> None:
+        """
+        A stream has started playing.
+        When it is the next stream set in _on_about_to_finish(), wait for its duration and announce the change.
+        """
+        with self._next_stream_lock:
+            stream_data, self._pending_stream_data = self._pending_stream_data, None
+        if stream_data is not None:
+            self._stream_data = stream_data
+            self._gather_stream_info(stream_data)
+            GLib.timeout_add(10, self._stream_changed_controller, self._stream_generation, stream_data)
+
+    def _stream_changed_controller(self, stream_generation: int, stream_data: StreamData) -> bool:
+        """
+        Send 'stream_changed' once the duration of the new stream is known.
+
+        This method is intended to be placed on the GLib.MainLoop by GLib.timeout_add
+        so that it is called periodically until the duration is available.
+
+        Returns:
+            True to continue being called by GLib.MainLoop()
+            False to stop being called by GLib.MainLoop()
+        """
+        if stream_generation != self._stream_generation:
+            # The stream was unloaded before the duration became available.
+            return False
+        query_success, _ = self.pipeline.query_duration(Gst.Format.TIME)
+        if not query_success or self.stream_tasks.subtask_running('gather_stream_info'):
+            return True
+        self.transmitter.send('stream_changed', stream_data)
+        return False
+
+    def _gather_stream_info(self, stream_data: StreamData) -> None:
+        """
+        Use the stream info cached in stream_data, or run the discoverer on the stream
+        as the 'gather_stream_info' subtask when there is none.
+        """
+        if stream_data.stream_info is not None:
+            self._stream_info.set_stream_info(stream_data.stream_info)
+        elif self.stream_tasks.begin_subtask('gather_stream_info'):
+            self._stream_info.gather(self.get_uri_from_path(stream_data.path))
+
     def _finalize_state_change(self, state: Gst.State) -> None:
         """
         Manage the _update_time periodic callback.
@@ -842,7 +1358,7 @@ class GstPlayer:
         match state:
             case Gst.State.PLAYING:
                 self.update_time_period = self.update_time_period_pending
-                self.update_time_id = GLib.timeout_add(self.update_time_period.get_time('ms'), self._update_time)
+                self._add_update_time_source()
                 self._update_time()
 
             case Gst.State.PAUSED:
@@ -851,7 +1367,7 @@ class GstPlayer:
                     self.update_time_id = None
                 self._update_time()
 
-            case Gst.State.NULL if self.update_time_id is not None:
+            case Gst.State.READY | Gst.State.NULL if self.update_time_id is not None:
                 GLib.Source.remove(self.update_time_id)
                 self.update_time_id = None
 
@@ -925,9 +1441,7 @@ class GstPlayer:
 
         Returns the volume normalized to 0 <= volume <= 1
         """
-        if not self.stream_tasks.running():
-            return self._query_volume()
-        raise GstPlayerError('Failed to retrieve the volume: GstPlayer is busy')
+        return self._query_volume()
 
     def _query_volume(self) -> float:
         """
@@ -956,6 +1470,10 @@ class GstPlayer:
         """
         if not self.stream_tasks.running() and self.stream_tasks.begin_subtask('set_update_time_period'):
             self.update_time_period_pending = period_length
+            if self.update_time_id is not None and self.update_time_period != period_length:
+                # Don't wait out the old period, it may be a long one.
+                self.update_time_period = period_length
+                self._add_update_time_source()
             self._g_idle_add_once(self.stream_tasks.end_subtask, 'set_update_time_period')
             return True
         return False
@@ -971,6 +1489,21 @@ class GstPlayer:
             uri = Gst.filename_to_uri(uri)
         return uri
 
+    def _add_update_time_source(self) -> None:
+        """
+        Call _update_time every self.update_time_period.
+
+        Whole second periods use GLib.timeout_add_seconds, which lets GLib group the wakeups of every
+        source that is due in the same second, instead of waking the process for each one.
+        """
+        if self.update_time_id is not None:
+            GLib.Source.remove(self.update_time_id)
+        period_ms = self.update_time_period.get_time('ms')
+        if period_ms >= 1000 and period_ms % 1000 == 0:
+            self.update_time_id = GLib.timeout_add_seconds(period_ms // 1000, self._update_time)
+        else:
+            self.update_time_id = GLib.timeout_add(period_ms, self._update_time)
+
     def _update_time(self):
         """
         Send notification that the stream's position has changed.
@@ -978,24 +1511,58 @@ class GstPlayer:
         if not self.stream_tasks.running():
             if self.update_time_period != self.update_time_period_pending:
                 self.update_time_period = self.update_time_period_pending
-                GLib.Source.remove(self.update_time_id)
-                self.update_time_id = GLib.timeout_add(self.update_time_period.get_time('ms'), self._update_time)
+                self._add_update_time_source()
             time_ = self.query_position()
             self._g_idle_add_once(
-                self.transmitter.send, 'time_updated', time_, priority=GLib.PRIORITY_DEFAULT
+                self.transmitter.send, 'time_updated', time_, self._stream_data, priority=GLib.PRIORITY_DEFAULT
             )
         # Returning True allows this method to continue being called.
         return True
 
-    def _close_pipeline(self):
-        """Cleanup the pipeline"""
-        if self.pipeline is None:
-            raise GstPlayerError('Pipeline does not exist')
-        if self._set_state(state=Gst.State.NULL):
-            self.pipeline = None
+    def _close_pipeline(self, release_pipeline: bool = False):
+        """
+        Unload the stream from the pipeline.
+        Keep the pipeline in the READY state for the next stream if self.reuse_pipeline and not release_pipeline,
+        otherwise cleanup the pipeline. release_pipeline also cleans up a pipeline that has no stream loaded.
+        """
+        release_pipeline = release_pipeline or not self.reuse_pipeline
+        if self.pipeline is None or not (self._stream_loaded or release_pipeline):
+            raise GstPlayerError('No stream is loaded in the pipeline.')
+        if self._set_state(state=Gst.State.NULL if release_pipeline else Gst.State.READY):
+            if release_pipeline:
+                self._release_pipeline()
+            self._stream_loaded = False
+            self._stream_generation += 1
+            self._stream_data = None
+            with self._next_stream_lock:
+                self._next_stream_data = None
+                self._pending_stream_data = None
             return True
         return False
 
+    def _release_pipeline(self) -> None:
+        """Discard the pipeline, which is in the NULL state, along with its bus watch."""
+        self.pipeline.get_bus().remove_signal_watch()
+        self.pipeline = None
+
+    def shutdown(self) -> None:
+        """
+        Set the playbin to NULL and discard it, abandoning any stream task in progress.
+        Nothing is sent afterwards, and GstPlayer is not used again.
+        """
+        if self.update_time_id is not None:
+            GLib.Source.remove(self.update_time_id)
+            self.update_time_id = None
+        if self.pipeline is not None:
+            self.pipeline.set_state(Gst.State.NULL)
+            self._release_pipeline()
+        self._stream_loaded = False
+        self._stream_generation += 1
+        self._stream_data = None
+        with self._next_stream_lock:
+            self._next_stream_data = None
+            self._pending_stream_data = None
+
     def _on_volume_changed(self, _, __) -> None:
         """
         Notify that the stream's volume was changed outside of book_ease.
@@ -1009,8 +1576,9 @@ class GstPlayer:
         bus.add_signal_watch()
         bus.connect("message::error", self._on_error)
         bus.connect("message::eos", self._on_eos)
-        bus.connect("message::duration-changed", self._on_duration_ready)
+        bus.connect("message::stream-start", self._on_stream_start)
         self.pipeline.connect("notify::volume", self._on_volume_changed)
+        self.pipeline.connect("about-to-finish", self._on_about_to_finish)
         # bus.connect("message::application", self.on_application_message)
 
     def _on_seek_complete(self, bus, _, msg_handle=None):
@@ -1022,11 +1590,11 @@ class GstPlayer:
             self.stream_tasks.end_subtask('seek')
             try:
                 cur_position = self.query_position()
-                self.transmitter.send('time_updated', cur_position)
+                self.transmitter.send('time_updated', cur_position, self._stream_data)
             except GstPlayerError:
                 self.logger.warning('Failed to query stream position. Pending tasks: %s', self.stream_tasks.get_running_subtasks())
 
-    def _init_pipeline(self, stream_data: StreamData):
+    def _init_pipeline(self):
         """
         Initialize self.pipeline into a playbin element.
         """
@@ -1037,8 +1605,19 @@ class GstPlayer:
         self.pipeline.set_property(
             'video-sink', Gst.ElementFactory.make("fakevideosink", "video_sink")
         )
-        uri = self.get_uri_from_path(stream_data.path)
-        self.pipeline.set_property('uri', uri)
+        if self._audio_sink is not None:
+            self.pipeline.set_property('audio-sink', Gst.parse_launch(self._audio_sink))
+
+    def _set_uri(self, stream_data: StreamData):
+        """
+        Point the pipeline, which is in the NULL or READY state, at the stream in stream_data.
+        """
+        self.pipeline.set_property('uri', self.get_uri_from_path(stream_data.path))
+        # _on_duration_ready disconnects itself once the duration of this stream is known.
+        self.pipeline.get_bus().connect("message::duration-changed", self._on_duration_ready)
+        self._stream_loaded = True
+        self._stream_generation += 1
+        self._stream_data = stream_data
 
     @staticmethod
     def _on_error(_, msg):
@@ -1172,6 +1751,19 @@ class GstPlayer:
             return self._stream_info.get_stream_info()
         raise GstPlayerError('Failed to query stream info.')
 
+    def query_discovered_stream_info(self) -> str | None:
+        """
+        Get the stream info that the discoverer gathered while loading the current stream.
+
+        Returns None if the discovery failed, or the stream info was not discovered
+        because it was given in the StreamData.
+
+        Raises: GstPlayerError if GstPlayer is busy.
+        """
+        if not self.stream_tasks.running():
+            return self._stream_info.get_stream_info() if self._stream_info.discovered else None
+        raise GstPlayerError('Failed to query stream info.')
+
     def query_position(self) -> StreamTime:
         """
         Attempt to query the pipeline's position in the stream.
@@ -1199,108 +1791,321 @@ class GstPlayer:
             return StreamTime(cur_duration, 'ns')
         raise GstPlayerError('Failed to query the current duration.')
 
+    def discover_stream(self, path: Path) -> tuple[StreamTime, str] | None:
+        """
+        Discover the duration and stream info of the file at path, blocking until it is done.
+        Intended to be run in a worker thread.
+
+        Returns: (duration, stream info string), or None if the discovery failed.
+        """
+        return discover_stream(path)
+
+
+class PlayerCommandType(Enum):
+    """The GstPlayer commands that GstPlayerA queues."""
+    LOAD_STREAM = 'load_stream'
+    UNLOAD_STREAM = 'unload_stream'
+    PLAY = 'play'
+    PAUSE = 'pause'
+    SET_POSITION = 'set_position'
+    SET_VOLUME = 'set_volume'
+    SET_UPDATE_TIME_PERIOD = 'set_update_time_period'
+
+
+class PlayerCommand:
+    """A GstPlayer command waiting in a PlayerCommandQueue."""
+    __slots__ = ['command_type', 'function', 'args', 'queued_time']
+
+    def __init__(self, command_type: PlayerCommandType, function: Callable[..., bool], *args) -> None:
+        self.command_type = command_type
+        self.function = function
+        """GstPlayer method. These always return False if GstPlayer is busy."""
+        self.args = args
+        self.queued_time = time.monotonic()
+        """When the command was first queued. Merging a later command into this one does not reset it."""
+
+    def execute(self) -> bool:
+        """Call the GstPlayer method. Returns False if GstPlayer was busy and the command must be retried."""
+        return self.function(*self.args)
+
+
+@dataclass
+class PlayerCommandStats:
+    """Diagnostic counters for a PlayerCommandQueue."""
+    queued: int = 0
+    merged: int = 0
+    cancelled: int = 0
+    discarded: int = 0
+    completed: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def latency_mean(self) -> float:
+        """Mean number of seconds between a command being queued and GstPlayer finishing it."""
+        return self.latency_total / self.completed if self.completed else 0.0
+
+
+class PlayerCommandQueue:
+    """
+    The commands that GstPlayerA passes to GstPlayer one at a time, oldest first.
+
+    A command is merged into the queue instead of being appended when that has the same result:
+
+    * set_position, set_volume, set_update_time_period and load_stream are last-wins.
+      The new arguments replace those of the same command that is already waiting.
+
+    * play and pause cancel each other. A play waiting after the last load or unload is removed by a pause,
+      and the pause is dropped, and vice versa.
+
+    * unload_stream discards everything queued for the stream it unloads, see discard_stream_commands().
+    """
+    _last_wins = frozenset((
+        PlayerCommandType.SET_POSITION,
+        PlayerCommandType.SET_VOLUME,
+        PlayerCommandType.SET_UPDATE_TIME_PERIOD,
+        PlayerCommandType.LOAD_STREAM
+    ))
+    _cancelling_pairs = {
+        PlayerCommandType.PLAY: PlayerCommandType.PAUSE,
+        PlayerCommandType.PAUSE: PlayerCommandType.PLAY
+    }
+    # Commands that apply to the player rather than to the stream, so they outlive unload_stream.
+    _stream_independent = frozenset((PlayerCommandType.SET_VOLUME, PlayerCommandType.SET_UPDATE_TIME_PERIOD))
+
+    def __init__(self) -> None:
+        # New commands are added on the left and popped from the right.
+        self._deque: collections.deque[PlayerCommand] = collections.deque()
+        self.stats = PlayerCommandStats()
+
+    def __len__(self) -> int:
+        return len(self._deque)
+
+    def __iter__(self):
+        return iter(self._deque)
+
+    def find(self, command_type: PlayerCommandType) -> PlayerCommand | None:
+        """Get the newest waiting command of command_type, or None if there isn't one."""
+        for command in self._deque:
+            if command.command_type is command_type:
+                return command
+        return None
+
+    def push(self, command: PlayerCommand) -> None:
+        """Add command to the queue, applying the merge rules."""
+        if command.command_type in self._last_wins:
+            if (queued := self.find(command.command_type)) is not None:
+                queued.args = command.args
+                self.stats.merged += 1
+                return
+        elif (opposite := self._cancelling_pairs.get(command.command_type)) is not None:
+            for queued in self._deque:
+                if queued.command_type in (PlayerCommandType.LOAD_STREAM, PlayerCommandType.UNLOAD_STREAM):
+                    break
+                if queued.command_type is opposite:
+                    self._deque.remove(queued)
+                    self.stats.cancelled += 2
+                    self._update_depth()
+                    return
+                if queued.command_type is command.command_type:
+                    break
+        self._deque.appendleft(command)
+        self.stats.queued += 1
+        self._update_depth()
+
+    def pop(self) -> PlayerCommand:
+        """Remove and return the oldest command."""
+        command = self._deque.pop()
+        self._update_depth()
+        return command
+
+    def requeue(self, command: PlayerCommand) -> None:
+        """Put a command that GstPlayer was too busy to accept back at the front of the queue."""
+        self._deque.append(command)
+        self._update_depth()
+
+    def discard_stream_commands(self) -> bool:
+        """
+        Remove the waiting commands that only apply to the current stream.
+
+        A waiting unload_stream is kept, as are the stream independent commands.
+        Returns True if an unload_stream is still waiting.
+        """
+        unload_queued = False
+        kept_commands = []
+        for command in self._deque:
+            if command.command_type is PlayerCommandType.UNLOAD_STREAM:
+                unload_queued = True
+                kept_commands.append(command)
+            elif command.command_type in self._stream_independent:
+                kept_commands.append(command)
+        self.stats.discarded += len(self._deque) - len(kept_commands)
+        self._deque.clear()
+        self._deque.extend(kept_commands)
+        self._update_depth()
+        return unload_queued
+
+    def clear(self) -> None:
+        """Remove all waiting commands."""
+        self.stats.discarded += len(self._deque)
+        self._deque.clear()
+        self._update_depth()
+
+    def command_completed(self, command: PlayerCommand) -> None:
+        """Record that GstPlayer has finished command."""
+        latency = time.monotonic() - command.queued_time
+        self.stats.completed += 1
+        self.stats.latency_total += latency
+        self.stats.latency_max = max(self.stats.latency_max, latency)
+
+    def _update_depth(self) -> None:
+        self.stats.depth = len(self._deque)
+        self.stats.max_depth = max(self.stats.max_depth, self.stats.depth)
+
 
 class GstPlayerA:
     """
     Adapter to go between Player and GstPlayer.
     Provides queuing services, allowing Player to fire and forget commands to GstPlayer.
+
+    gst_player: the PlayerBackend to adapt, e.g. a GstPlayer with a headless audio sink, or a
+    simulated_player.SimulatedPlayer. A default GstPlayer when not given.
     """
     logger = logging.getLogger('GstPlayerA')
 
-    def __init__(self):
-        self._gst_player = GstPlayer()
-        self._deque = collections.deque()
-        self._queued_position = None
+    def __init__(self, gst_player: PlayerBackend | None = None):
+        self._gst_player = gst_player if gst_player is not None else GstPlayer()
+        self._commands = PlayerCommandQueue()
+        # The command that GstPlayer accepted, and has not yet signaled 'stream_ready' for.
+        self._command_in_progress: PlayerCommand | None = None
 
-        self.transmitter = signal_.Signal()
-        self.transmitter.add_signal('stream_loaded', 'time_updated', 'eos', 'volume_change')
-        # 'stream_loaded' gets a connect_once called during load_stream() so don't connect here.
+        self.transmitter = signal_.Signal(batched=True, name='GstPlayerA')
+        self.transmitter.add_signal('stream_loaded', 'eos', 'volume_change', 'stream_changed')
+        self.transmitter.add_signal('time_updated', coalesce=signal_.Coalesce())
+        # 'stream_loaded' gets a connect_once called during pop() so don't connect here.
         self._gst_player.transmitter.connect('time_updated', self.transmitter.send, 'time_updated')
         self._gst_player.transmitter.connect('eos', self.transmitter.send, 'eos')
+        self._gst_player.transmitter.connect('stream_changed', self.transmitter.send, 'stream_changed')
         self._gst_player.transmitter.connect('volume_change', self.transmitter.send, 'volume_change')
         self._call_in_progress = False
 
-    def _appendleft(self, command: tuple):
+    def _push(self, command_type: PlayerCommandType, function: Callable[..., bool], *args) -> None:
         """
-        Wrapper for self._deque.appendleft.
-        Adds pop() to the GLib.MainLoop.
+        Add a command to the queue.
+        Calls pop() if GstPlayer is not already working through the queue.
         """
-        self._deque.appendleft(command)
+        self._commands.push(PlayerCommand(command_type, function, *args))
         if not self._call_in_progress:
             self.pop()
 
+    def get_command_stats(self) -> PlayerCommandStats:
+        """Get a copy of the diagnostic counters for the command queue."""
+        return dataclasses.replace(self._commands.stats)
+
     def load_stream(self, stream_data: StreamData):
         """
-        Add a load_stream command to the deque.
+        Add a load_stream command to the queue.
+
+        A load_stream command that is still waiting in the queue gets its stream_data replaced,
+        so that only the most recently requested stream is loaded.
+        """
+        self._push(PlayerCommandType.LOAD_STREAM, self._gst_player.load_stream, stream_data)
+
+    def unload_stream(self, release_pipeline: bool = False):
         """
-        def post_pop():
-            self._gst_player.transmitter.connect_once('stream_ready', self.transmitter.send, "stream_loaded")
+        Add an unload_stream command to the queue.
+        release_pipeline: have GstPlayer release the pipeline instead of keeping it for the next stream.
 
-        self._appendleft((post_pop, self._gst_player.load_stream, stream_data))
+        Any commands queued for the stream being unloaded are discarded, because unloading would undo them anyway.
+        An unload_stream that is already waiting in the queue is kept instead of queuing another one,
+        so a burst of track changes collapses into a single unload and a single load of the final track.
+        """
+        if not self._commands.discard_stream_commands():
+            self._push(PlayerCommandType.UNLOAD_STREAM, self._gst_player.unload_stream, release_pipeline)
+        elif release_pipeline:
+            self._commands.find(PlayerCommandType.UNLOAD_STREAM).args = (True,)
 
-    def unload_stream(self):
+    def shutdown(self) -> None:
         """
-        Add an unload_stream command to the deque.
+        Discard the queued commands and shut down GstPlayer straight away.
+        This is not queued, the main loop may no longer be running to work through the queue.
         """
-        self._deque.clear()
-        self._appendleft((lambda: None, self._gst_player.unload_stream))
+        self._commands.clear()
+        self._command_in_progress = None
+        self._gst_player.shutdown()
+
+    def set_next_stream(self, stream_data: StreamData | None) -> None:
+        """
+        Set the stream that GstPlayer continues with, without a gap, when the current stream finishes.
+
+        This is not queued. It never has to wait on GstPlayer, and only applies to the stream that is playing.
+        """
+        self._gst_player.set_next_stream(stream_data)
 
     def pop(self):
         """
-        Remove and execute a command from the deque.
+        Remove and execute a command from the queue.
 
-        If the called method returns False, then the command remains in the deque.
+        If the called method returns False, then the command remains in the queue.
         """
-        if self._deque:
+        # pop() is called on 'stream_ready', which means that the command in progress has finished.
+        if self._command_in_progress is not None:
+            self._commands.command_completed(self._command_in_progress)
+            self._command_in_progress = None
+
+        if self._commands:
+            cmd = None
             try:
                 self._gst_player.transmitter.connect_once('stream_ready', self.pop)
                 if not self._call_in_progress:
                     self._call_in_progress = True
 
-                cmd = self._deque.pop()
-                # cmd[0]  : Callable    post_pop callback
-                # cmd[1]  : Callable    GstPlayer command. These always return False if GstPlayer is busy.
-                # cmd[2:] : Any         GstPlayer command args
-                if cmd[1](*cmd[2:]):
-                    cmd[0]()
+                cmd = self._commands.pop()
+                if cmd.execute():
+                    self._command_in_progress = cmd
+                    if cmd.command_type is PlayerCommandType.LOAD_STREAM:
+                        # Send the stream that was actually loaded,
+                        # so that the receiver can ignore streams it has abandoned.
+                        self._gst_player.transmitter.connect_once(
+                            'stream_ready', self.transmitter.send, "stream_loaded", *cmd.args
+                        )
                 else:
-                    self._deque.append(cmd)
+                    self._commands.requeue(cmd)
 
             except GstPlayerError as e:
-                print(e)
+                if cmd.command_type is PlayerCommandType.UNLOAD_STREAM:
+                    # unload_stream() can be queued for a stream that is already unloaded. That's expected.
+                    self.logger.debug('pop: nothing to unload: %s', e)
+                else:
+                    self.logger.warning('pop: %s failed: %s', cmd.command_type.value, e)
                 self.pop()
-            except Exception as e:
-                print(e)
-                self._deque.clear()
+            except Exception:
+                self.logger.error('pop: clearing the command queue after an unexpected error')
+                self._commands.clear()
                 raise
         else:
             self._call_in_progress = False
 
     def play(self):
         """
-        Add a play command to the deque.
+        Add a play command to the queue.
         """
-        self._appendleft((lambda: None, self._gst_player.play))
+        self._push(PlayerCommandType.PLAY, self._gst_player.play)
 
     def pause(self):
         """
-        Add a pause command to the deque.
+        Add a pause command to the queue.
         """
         self.logger.debug('pause')
-        self._appendleft((lambda: None, self._gst_player.pause))
+        self._push(PlayerCommandType.PAUSE, self._gst_player.pause)
 
     def set_position(self, position: StreamTime):
         """
-        Add a set_position command to the deque.
+        Add a set_position command to the queue.
         """
-        def post_pop():
-            self._queued_position = None
-
-        if self._queued_position is None:
-            self._queued_position = (post_pop, self._gst_player.set_position, position)
-            self._appendleft(self._queued_position)
-        else:
-            self._queued_position[2].set_time(position.get_time())
+        self._push(PlayerCommandType.SET_POSITION, self._gst_player.set_position, position)
 
     def query_stream_info(self) -> str | None:
         """
@@ -1310,17 +2115,31 @@ class GstPlayerA:
         """
         return self._gst_player.query_stream_info()
 
+    def query_discovered_stream_info(self) -> str | None:
+        """
+        Query the stream info that GstPlayer discovered for the current stream,
+        or None if it was not discovered.
+        """
+        return self._gst_player.query_discovered_stream_info()
+
     def query_duration(self) -> StreamTime:
         """
         Query the duration from GstPlayer.
         """
         return self._gst_player.query_duration()
 
+    def discover_stream(self, path: Path) -> tuple[StreamTime, str] | None:
+        """
+        Discover the duration and stream info of the file at path with GstPlayer.
+        This is not queued. It blocks, and is intended to be run in a worker thread.
+        """
+        return self._gst_player.discover_stream(path)
+
     def query_volume(self) -> float:
         """
         Retrieve the current volume from the player backend.
         """
-        return self._gst_player._query_volume()
+        return self._gst_player.query_volume()
 
     def query_position(self) -> StreamTime:
         """
@@ -1329,8 +2148,8 @@ class GstPlayerA:
         Returns the queued position if is exists, or queries the position from GstPlayer.
         """
         current_position = None
-        if self._queued_position:
-            current_position = self._queued_position[2]
+        if (queued := self._commands.find(PlayerCommandType.SET_POSITION)) is not None:
+            current_position = queued.args[0]
         else:
             try:
                 current_position = self._gst_player.query_position()
@@ -1343,16 +2162,16 @@ class GstPlayerA:
 
     def set_volume(self, volume: float) -> None:
         """
-        Add a set volume command to the deque.
+        Add a set volume command to the queue.
         """
-        self._appendleft((lambda: None, self._gst_player.set_volume, volume))
+        self._push(PlayerCommandType.SET_VOLUME, self._gst_player.set_volume, volume)
 
     def set_update_time_period(self, period_length: StreamTime) -> bool:
         """
         Tell GstPlayer to set the period length for sending 'update_time' signals.
         period_length: amount of time to wait between each sending of 'update_time'
         """
-        self._appendleft((lambda: None, self._gst_player.set_update_time_period, period_length))
+        self._push(PlayerCommandType.SET_UPDATE_TIME_PERIOD, self._gst_player.set_update_time_period, period_length)
 
 class GstStreamInfoError(Exception):
     """Exception raised by GstStreamInfo"""
@@ -1368,7 +2187,7 @@ class GstStreamInfo:
     logger = logging.getLogger('GstStreamInfo')
 
     def __init__(self) -> None:
-        self.transmitter = signal_.Signal()
+        self.transmitter = signal_.Signal(name='GstStreamInfo')
         self.transmitter.add_signal('stream_info_ready')
 
         self._discoverer: GstPbutils.Discoverer  = GstPbutils.Discoverer.new(5 * Gst.SECOND)
@@ -1377,6 +2196,8 @@ class GstStreamInfo:
 
         self._stream_info: io.StringIO | None = None
         self._n_discovered_streams = 0
+        # True when the stream info was gathered by the discoverer without errors.
+        self.discovered = False
 
     def _on_discovery_finished(self, *_) -> None:
         """
@@ -1409,6 +2230,7 @@ class GstStreamInfo:
                     self._stream_info.write('GstStreamer BUSYMISSING PLUGINS')
             return
 
+        self.discovered = True
         self._n_discovered_streams += 1
         self._stream_info.write(f'Stream {self._n_discovered_streams}:\n')
         self._stream_info.write(f'    uri: {info.get_uri()}\n')
@@ -1446,9 +2268,7 @@ class GstStreamInfo:
         elif isinstance(gval, numbers.Number):
             if key == 'duration':
                 duration = StreamTime(gval, 'ns')
-                hours = duration.get_clock_value('h')
-                minutes = duration.get_clock_value('m')
-                seconds = duration.get_clock_value('s')
+                hours, minutes, seconds, _ = duration.get_clock_values()
                 tag_string = f'{"    " * depth}{key}: {hours:02}:{minutes:02}:{seconds:02}\n'
             else:
                 tag_string = f'{"    " * depth}{key}: {gval}\n'
@@ -1502,9 +2322,30 @@ class GstStreamInfo:
         Start the stream discovery process.
         """
         self._stream_info = io.StringIO()
+        self.discovered = False
         self._discoverer.start()
         self._discoverer.discover_uri_async(stream_uri)
 
+    def set_stream_info(self, stream_info: str) -> None:
+        """
+        Use stream info that was gathered previously, instead of running the discoverer.
+        """
+        self._stream_info = io.StringIO(stream_info)
+        self.discovered = False
+
+    def describe(self, info: GstPbutils.DiscovererInfo) -> str | None:
+        """
+        Build the stream info string from info, which was gathered by another discoverer.
+
+        Returns None if the discovery failed.
+        """
+        self._stream_info = io.StringIO()
+        self._n_discovered_streams = 0
+        self.discovered = False
+        self._on_discovered(None, info, None)
+        self._n_discovered_streams = 0
+        return self.get_stream_info() if self.discovered else None
+
     def get_stream_info(self) -> str | None:
         """
         Get the stream info string gathered by GstStreamInfo.
@@ -1513,3 +2354,324 @@ class GstStreamInfo:
                 has not been gathered to build the string.
         """
         return self._stream_info.getvalue() if self._stream_info is not None else None
+
+
+def discover_stream(path: Path, timeout: StreamTime = StreamTime(5, 's')) -> tuple[StreamTime, str] | None:
+    """
+    Discover the duration and stream info of the file at path, blocking until it is done.
+    Intended to be run in a worker thread.
+
+    Returns: (duration, stream info string), or None if the discovery failed.
+    """
+    discoverer = GstPbutils.Discoverer.new(timeout.get_time())
+    try:
+        info = discoverer.discover_uri(GstPlayer.get_uri_from_path(path))
+    except GLib.Error:
+        return None
+    if (stream_info := GstStreamInfo().describe(info)) is None:
+        return None
+    return StreamTime(info.get_duration()), stream_info
+
+
+class BookDurationIndex:
+    """
+    Cumulative durations of the tracks of a book.
+
+    The start time of every track within the book is precomputed, so converting between a
+    (track_number, position) pair and the elapsed time of the whole book is O(1),
+    and locating the track that contains an elapsed time is a binary search.
+
+    Tracks whose duration is unknown count as empty. complete is False when there are any.
+    """
+
+    def __init__(self, track_numbers: list[int], durations: list[StreamTime | None]) -> None:
+        self.complete = all(duration is not None for duration in durations)
+        self._track_numbers = list(track_numbers)
+        self._index_by_track_number = {number: i for i, number in enumerate(self._track_numbers)}
+        # _starts[i] is the start of the i-th track in nanoseconds, and _starts[-1] is the length of the book.
+        self._starts = list(itertools.accumulate(
+            (duration.get_time() if duration is not None else 0 for duration in durations), initial=0
+        ))
+
+    @property
+    def total(self) -> StreamTime:
+        """The duration of the whole book."""
+        return StreamTime(self._starts[-1])
+
+    def track_start(self, track_number: int) -> StreamTime:
+        """Get the time within the book at which track_number starts."""
+        return StreamTime(self._starts[self._index_by_track_number[track_number]])
+
+    def elapsed(self, track_number: int, position: StreamTime) -> StreamTime:
+        """Get the time within the book of position in track_number."""
+        return StreamTime(self._starts[self._index_by_track_number[track_number]] + position.get_time())
+
+    def remaining(self, track_number: int, position: StreamTime) -> StreamTime:
+        """Get the time left in the book after position in track_number."""
+        return StreamTime(self._starts[-1] - self._starts[self._index_by_track_number[track_number]]
+                          - position.get_time())
+
+    def locate(self, elapsed: StreamTime) -> tuple[int, StreamTime]:
+        """
+        Find the track and the position within that track of a time within the book.
+        Times before the start or past the end of the book are clamped to the first or last track.
+
+        Returns: (track_number, position)
+        """
+        if not self._track_numbers:
+            raise ValueError('the book has no tracks')
+        elapsed_ns = elapsed.get_time()
+        # The last track with a start <= elapsed; bisect_right skips over any empty tracks.
+        index = min(max(bisect.bisect_right(self._starts, elapsed_ns) - 1, 0), len(self._track_numbers) - 1)
+        return self._track_numbers[index], StreamTime(elapsed_ns - self._starts[index])
+
+
+class BookDurationScanner:
+    """
+    Find the duration of every track of a book in the background, and build its BookDurationIndex.
+
+    The track files are stat'ed on the default worker pool, since that can block for a long time on a network
+    filesystem or a spun down disk. The durations are then read from the stream info cache in one batch.
+    The tracks that aren't cached are discovered on the worker pool too, and the results are cached for the next time.
+    The cache is only read and written in the main thread, which the database connection belongs to.
+
+    The 'durations_ready' signal is sent with the BookDurationIndex once every track has been scanned.
+    """
+    logger = logging.getLogger('BookDurationScanner')
+    # Below interactive work that is waiting on the pool.
+    _priority = -10
+
+    def __init__(self,
+                 player_dbi: PlayerDBI,
+                 discover: Callable[[Path], tuple[StreamTime, str] | None] = discover_stream) -> None:
+        """
+        discover: finds the duration and stream info of a file, called in worker threads.
+        """
+        self.transmitter = signal_.Signal(name='BookDurationScanner')
+        self.transmitter.add_signal('durations_ready')
+        self._player_dbi = player_dbi
+        self._discover = discover
+        self._track_numbers: list[int] = []
+        self._durations: dict[int, StreamTime | None] = {}
+        self._futures: list[glib_utils.MainLoopFuture] = []
+        # Incremented by every scan() and cancel(), so that results of an abandoned scan are ignored.
+        self._generation = 0
+
+    def scan(self, book_data: book.BookData) -> None:
+        """Start scanning the tracks of book_data, abandoning any scan that is already running."""
+        self.cancel()
+        generation = self._generation
+        tracks = sorted(book_data.track_list, key=lambda track: track.get_number())
+        self._track_numbers = [track.get_number() for track in tracks]
+        self._durations = {}
+
+        future = glib_utils.default_worker_pool().submit(
+            self._stat_files, ([track.get_file_path() for track in tracks],), priority=self._priority
+        )
+        future.add_done_callback(lambda future_: self._on_stat_files_done(future_, tracks, generation))
+        self._futures.append(future)
+
+    @staticmethod
+    def _stat_files(paths: list[Path]) -> list[os.stat_result | None]:
+        """Stat each of paths, giving None for the files that can't be stat'ed. Called in a worker thread."""
+        stats = []
+        for path in paths:
+            try:
+                stats.append(path.stat())
+            except OSError:
+                stats.append(None)
+        return stats
+
+    def _discover_and_stat(self, path: Path) -> tuple[tuple[StreamTime, str] | None, os.stat_result | None]:
+        """Discover the file at path, and stat it to cache the result with. Called in a worker thread."""
+        result = self._discover(path)
+        try:
+            return result, path.stat()
+        except OSError:
+            return result, None
+
+    def _on_stat_files_done(self, stat_future: glib_utils.MainLoopFuture, tracks: list, generation: int) -> None:
+        """Read the durations of the stat'ed tracks from the cache, and discover the rest."""
+        if generation != self._generation or stat_future.cancelled():
+            return
+        uncached = []
+        with audio_book_tables.DB_CONNECTION.query():
+            for track, stat in zip(tracks, stat_future.result()):
+                if stat is not None and (cached := self._player_dbi.get_stream_info(track.get_file_path(), stat)):
+                    self._durations[track.get_number()] = cached[0]
+                else:
+                    uncached.append(track)
+
+        pool = glib_utils.default_worker_pool()
+        for track in uncached:
+            future = pool.submit(self._discover_and_stat, (track.get_file_path(),), priority=self._priority)
+            future.add_done_callback(
+                lambda future_, track_=track: self._on_discovered(future_, track_, generation)
+            )
+            self._futures.append(future)
+        self._finish_if_complete()
+
+    def cancel(self) -> None:
+        """Abandon the current scan. Discoveries that already started are left to finish and ignored."""
+        self._generation += 1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def _on_discovered(self, future: glib_utils.MainLoopFuture, track, generation: int) -> None:
+        """Record and cache the result of discovering track."""
+        if generation != self._generation or future.cancelled():
+            return
+        result = stat = None
+        try:
+            result, stat = future.result()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # A track that can't be discovered only leaves a hole in the index.
+            self.logger.exception('failed to discover %s', track.get_file_path())
+        if result is not None:
+            duration, stream_info = result
+            if stat is not None:
+                self._player_dbi.save_stream_info(track.get_file_path(), duration, stream_info, stat)
+            self._durations[track.get_number()] = duration
+        else:
+            self._durations[track.get_number()] = None
+        self._finish_if_complete()
+
+    def _finish_if_complete(self) -> None:
+        """Send 'durations_ready' once every track has a result."""
+        if len(self._durations) == len(self._track_numbers):
+            self._futures = []
+            index = BookDurationIndex(self._track_numbers,
+                                      [self._durations[number] for number in self._track_numbers])
+            self.transmitter.send('durations_ready', index)
+
+
+def prefetch_file(path: Path,
+                  max_bytes: int,
+                  bytes_per_second: int,
+                  cancel_event: threading.Event | None = None) -> int:
+    """
+    Read the first max_bytes of the file at path, at no more than bytes_per_second, so that it is in the page cache
+    before it is played. Intended to be run in a worker thread.
+
+    The data is read rather than only advised with posix_fadvise(WILLNEED), because advice is asynchronous,
+    so it can't be rate limited, and some network filesystems ignore it.
+
+    Returns: the number of bytes read. Stops early if cancel_event is set.
+    """
+    buffer = bytearray(256 * 1024)
+    total = 0
+    start = time.monotonic()
+    with open(path, 'rb', buffering=0) as file:
+        while total < max_bytes:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if not (n_read := file.readinto(memoryview(buffer)[:max_bytes - total])):
+                break
+            total += n_read
+            # Sleep off any time that this is ahead of the rate limit.
+            if (ahead := total / bytes_per_second - (time.monotonic() - start)) > 0:
+                if cancel_event is not None:
+                    cancel_event.wait(ahead)
+                else:
+                    time.sleep(ahead)
+    return total
+
+
+class TrackPrefetcher:
+    """
+    Read the tracks that follow the current one into the page cache in the background,
+    so that starting them doesn't stall on a spinning disk or network filesystem.
+
+    update() is called with every position update. Once the current stream has played trigger_percent of its
+    duration, the next n_tracks tracks of the book are read, one after another, on the default worker pool.
+    Reading is limited to bytes_per_second, and to the first max_bytes_per_track of each track,
+    so that it never competes with the stream that is playing.
+    Each track is read once per book.
+    """
+    logger = logging.getLogger('TrackPrefetcher')
+    # Below BookDurationScanner, whose results are shown to the user.
+    _priority = -20
+
+    def __init__(self,
+                 n_tracks: int = 2,
+                 trigger_percent: float = 50,
+                 bytes_per_second: int = 4 * 1024 * 1024,
+                 max_bytes_per_track: int = 64 * 1024 * 1024) -> None:
+        self.n_tracks = n_tracks
+        self.trigger_percent = trigger_percent
+        self.bytes_per_second = bytes_per_second
+        self.max_bytes_per_track = max_bytes_per_track
+        # The stream that the prefetch was last started for, so that it is only started once per stream.
+        self._triggered_stream: StreamData | None = None
+        self._prefetched_paths: set[Path] = set()
+        self._future: glib_utils.MainLoopFuture | None = None
+        # The paths given to the running prefetch, and those of them that it has finished.
+        self._future_paths: list[Path] = []
+        self._finished_paths: list[Path] = []
+
+    def update(self, book_data: book.BookData, stream_data: StreamData) -> None:
+        """Start prefetching the tracks after stream_data, if it has played far enough."""
+        if stream_data is self._triggered_stream or self.n_tracks < 1:
+            return
+        if stream_data.duration is None or stream_data.position_data is None or not stream_data.duration.get_time():
+            return
+        if stream_data.position_data.time.get_time() * 100 < stream_data.duration.get_time() * self.trigger_percent:
+            return
+        self._triggered_stream = stream_data
+
+        paths = []
+        last_track_number = min(stream_data.track_number + self.n_tracks, book_data.get_n_tracks() - 1)
+        for track_number in range(stream_data.track_number + 1, last_track_number + 1):
+            path = book_data.get_track_by_track_number(track_number).get_file_path()
+            if path not in self._prefetched_paths:
+                paths.append(path)
+        if not paths:
+            return
+        # A prefetch that is still running is for tracks further back, so it is not needed anymore.
+        self._cancel_future()
+        self._prefetched_paths.update(paths)
+        self._future_paths = paths
+        self._finished_paths = []
+        self._future = glib_utils.default_worker_pool().submit(
+            self._prefetch, (paths, self._finished_paths), priority=self._priority, cancellable=True
+        )
+        self._future.add_done_callback(self._on_prefetched)
+
+    def cancel(self) -> None:
+        """Stop prefetching, and forget what has been prefetched, for when the book is changed."""
+        self._cancel_future()
+        self._triggered_stream = None
+        self._prefetched_paths = set()
+
+    def _cancel_future(self) -> None:
+        """Cancel the running prefetch, and forget the paths it hadn't finished, so they can be prefetched again."""
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+            self._prefetched_paths.difference_update(set(self._future_paths) - set(self._finished_paths))
+
+    def _prefetch(self, paths: list[Path], finished_paths: list[Path], cancel_event: threading.Event) -> int:
+        """Read each of paths in turn, appending them to finished_paths. Run in a worker thread."""
+        total = 0
+        for path in paths:
+            try:
+                total += prefetch_file(path, self.max_bytes_per_track, self.bytes_per_second, cancel_event)
+            except OSError as e:
+                # The track fails to load later on if it really is missing, this only loses its prefetch.
+                self.logger.debug('failed to prefetch %s: %s', path, e)
+            # A read that was cut short by the cancel isn't finished.
+            if cancel_event.is_set():
+                break
+            finished_paths.append(path)
+        return total
+
+    def _on_prefetched(self, future: glib_utils.MainLoopFuture) -> None:
+        if future is self._future:
+            self._future = None
+        if future.cancelled():
+            return
+        try:
+            self.logger.debug('prefetched %d bytes', future.result())
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.logger.exception('prefetch failed')
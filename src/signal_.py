@@ -31,8 +31,18 @@ signal_.GLOBAL_TRANSMITTER = Signal()
 """
 import weakref
 import logging
+import collections
+import itertools
+import threading
+import time
+from dataclasses import dataclass
 from typing import Callable
+from typing import Hashable
+from typing import Iterator
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
 import glib_utils
+import signal_trace
 
 
 GLOBAL_TRANSMITTER = None
@@ -44,17 +54,24 @@ class SignalData:
     """
     logger = logging.getLogger('SignalData')
     logger.addHandler(logging.NullHandler())
+    # __weakref__ is needed because Signal hands out weakref.proxy objects to SignalData.
+    __slots__ = ['_subscriber_died_cb', 'handle', 'conn_id', 'callback', 'callback_key', 'cb_args', 'cb_kwargs',
+                 '__weakref__']
 
     def __init__(self,
                  callback: Callable,
                  subscriber_died_cb: Callable,
                  handle: str,
+                 conn_id: int,
                  *cb_args: tuple,
                  **cb_kwargs: dict) -> None:
 
         self._subscriber_died_cb = subscriber_died_cb
         self.handle = handle
+        self.conn_id = conn_id
+        """Identifies this connection within its Signal."""
         self.callback = weakref.WeakMethod(callback, self._cleanup)
+        self.callback_key = _callback_key(callback)
         self.cb_args = cb_args
         self.cb_kwargs = cb_kwargs
 
@@ -69,13 +86,94 @@ class SignalData:
         except ValueError:
             self.logger.debug('_cleanup() called for a signal that was allready removed')
 
+
+def _callback_key(callback: Callable) -> tuple[int, Callable]:
+    """
+    Get a hashable key that is equal for every bound method object of the same method on the same instance,
+    without keeping a reference to the instance.
+    """
+    return id(callback.__self__), callback.__func__
+
+
+@dataclass(frozen=True)
+class Coalesce:
+    """
+    Coalescing policy for a signal, set with Signal.add_signal(handle, coalesce=Coalesce(...))
+
+    Sends of a coalesced signal are held back instead of being dispatched immediately. While they are held,
+    each new send replaces the previous one, so only the latest values are ever delivered.
+
+    * With no options set, all of the sends made in one iteration of the main loop collapse into one delivery.
+
+    * debounce_ms: Wait until the signal has not been sent for debounce_ms before delivering it.
+
+    * max_rate_hz: Deliver the signal at most max_rate_hz times per second. The first send after a quiet
+      period is delivered right away.
+
+    * key: Function called with the send's arguments. Sends with different keys are coalesced separately,
+      e.g. key=lambda path: path lets updates for different directories through while collapsing
+      repeated updates for the same one.
+    """
+    debounce_ms: int | None = None
+    max_rate_hz: float | None = None
+    key: Callable[..., Hashable] | None = None
+
+
+class _CoalesceState:  # pylint: disable=too-few-public-methods
+    """The held back send of a coalesced signal, for one key."""
+    __slots__ = ['args', 'kwargs', 'pending', 'generation', 'source_id', 'last_delivery']
+
+    def __init__(self) -> None:
+        self.args: tuple = ()
+        self.kwargs: dict = {}
+        self.pending = False
+        """True while there is a send that hasn't been delivered."""
+        self.generation = 0
+        """Incremented every time a delivery is scheduled, so that superseded deliveries can recognise themselves."""
+        self.source_id: int | None = None
+        """The timeout of a scheduled delivery, or of the end of a rate limiting period."""
+        self.last_delivery = float('-inf')
+
+
+class _CoalescedDelivery:  # pylint: disable=too-few-public-methods
+    """
+    A place in a batched Signal's dispatch queue, taken by a coalesced signal.
+    The held back send is only looked up when the queue is drained, so it is delivered with its latest values.
+    """
+    __slots__ = ['key', 'generation']
+
+    def __init__(self, key: tuple[str, Hashable], generation: int) -> None:
+        self.key = key
+        self.generation = generation
+
+
 class Signal():
     """
     helper class to implement signal system (notifications)
     note: instantiated/inherited by server
+
+    Callbacks are not called by send(). They are placed on the GLib event loop.
+    By default, each callback gets its own idle source.
+
+    In batched mode, send() appends the callbacks to a queue belonging to the transmitter instead,
+    and a single idle source drains the queue in order. Every send that happens before the queue is
+    drained shares that one source, which makes batched mode much cheaper for frequently sent signals.
+
+    Thread safety:
+    send() may be called from any thread, e.g. by an AsyncWorker target. The handlers are snapshotted
+    under a lock, and the callbacks are always called in the GLib main context, never in the sending thread.
+    Connecting and disconnecting are also guarded by the lock, so they can safely race with a send.
+    Callbacks are never called while the lock is held.
+
+    Tracing:
+    When signal_trace.TRACER is enabled, sends and callback timings are recorded under the Signal's name.
     """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because the handler tables, the batched dispatch queue and the coalesced sends each need their own.
+    logger = logging.getLogger('Signal')
+    logger.addHandler(logging.NullHandler())
 
-    def __init__(self) -> None:
+    def __init__(self, batched: bool = False, name: str = 'Signal') -> None:
         """
         create empty signal handler container, dict
         note: instantiated/inherited by server
@@ -83,29 +181,65 @@ class Signal():
         _sig_handlers, _sig_handlers_once:
         For each key/val pair,
         the key will be the signal handle
-        and the val will hold a list of SignalData objects that hold
-        the data for a signal call. The containers are populated in connect().
-        """
-        self._sig_handlers = {}
-        self._sig_handlers_once = {}
+        and the val will hold a dict of the SignalData objects that hold
+        the data for a signal call, keyed by SignalData.conn_id in order of connection.
+        The containers are populated in connect(), and connections are removed in constant time.
+
+        _conn_ids_by_callback:
+        The conn_ids of each (handle, callback) pair, in order of connection, so that
+        disconnect_by_call_back() doesn't have to search the handlers.
+
+        batched: Dispatch the callbacks through a single queue. See the class docstring.
 
-    def add_signal(self, *handles: tuple[str]) -> None:
+        name: Identifies this transmitter in signal traces, usually the name of the class that owns it.
+        """
+        self._sig_handlers: dict[str, dict[int, SignalData]] = {}
+        self._sig_handlers_once: dict[str, dict[int, SignalData]] = {}
+        self._conn_ids_by_callback: dict[tuple[str, int, Callable], dict[int, None]] = {}
+        self._conn_ids = itertools.count()
+        self.name = name
+        self._batched = batched
+        # Pending callbacks in batched mode: (handle, weakref.WeakMethod, args, kwargs, sent_at)
+        # sent_at is only set when tracing. Coalesced signals hold their place with a _CoalescedDelivery.
+        self._dispatch_queue = collections.deque()
+        self._drain_scheduled = False
+        # Coalescing policies by handle, and the held back sends by (handle, key).
+        # Coalesced signals may be sent from worker threads, so the held back sends are guarded by a lock.
+        self._coalesce: dict[str, Coalesce] = {}
+        self._coalesce_state: dict[tuple[str, Hashable], _CoalesceState] = {}
+        self._coalesce_lock = threading.Lock()
+        # Guards the handler tables and the dispatch queue.
+        # Reentrant because a subscriber can be garbage collected, and disconnect itself through its
+        # weakref callback, in a thread that already holds the lock.
+        self._lock = threading.RLock()
+
+    def add_signal(self, *handles: tuple[str], coalesce: Coalesce | None = None) -> None:
         """
         create/add signal to the sig handlers list
         note: called by server
+
+        coalesce: Optional policy for collapsing frequent sends of these signals. See Coalesce.
         """
-        for sig_h in (self._sig_handlers, self._sig_handlers_once):
-            for handle in handles:
-                if handle not in sig_h:
-                    sig_h[handle] = []
+        with self._lock:
+            for sig_h in (self._sig_handlers, self._sig_handlers_once):
+                for handle in handles:
+                    if handle not in sig_h:
+                        sig_h[handle] = {}
+            if coalesce is not None:
+                for handle in handles:
+                    self._coalesce[handle] = coalesce
 
     def remove_signal(self, handle: str) -> None:
         """
         remove signal from the sig handlers list
         note: called by server
         """
-        for sig_h in (self._sig_handlers, self._sig_handlers_once):
-            del sig_h[handle]
+        with self._lock:
+            for sig_h in (self._sig_handlers, self._sig_handlers_once):
+                del sig_h[handle]
+            self._coalesce.pop(handle, None)
+            for key in [key for key in self._conn_ids_by_callback if key[0] == handle]:
+                del self._conn_ids_by_callback[key]
 
     def _connect(self,
                  handle: str,
@@ -127,13 +261,15 @@ class Signal():
 
         Returns a weakref.proxy->SignalData object that is added to the list.
         """
-        sig_data = SignalData(cb_method, self.disconnect_by_signal_data, handle, *cb_args, **cb_kwargs)
-
-        sig_handler_dict[handle].append(sig_data)
-        sig_data_proxy = weakref.proxy(sig_data)
+        with self._lock:
+            sig_data = SignalData(cb_method, self.disconnect_by_signal_data, handle, next(self._conn_ids),
+                                  *cb_args, **cb_kwargs)
+            sig_data_proxy = weakref.proxy(sig_data)
+            if pass_sig_data_to_cb:
+                sig_data.cb_kwargs['sig_data'] = sig_data_proxy
 
-        if pass_sig_data_to_cb:
-            sig_data.cb_kwargs['sig_data'] = sig_data_proxy
+            sig_handler_dict[handle][sig_data.conn_id] = sig_data
+            self._conn_ids_by_callback.setdefault((handle, *sig_data.callback_key), {})[sig_data.conn_id] = None
 
         return sig_data_proxy
 
@@ -197,20 +333,239 @@ class Signal():
         handle: signal name
         extra_args: allow server to add args to the signal call
         extra_kwargs: allow server to add kwargs to the signal call
+
+        If the signal was added with a Coalesce policy, the send is held back and delivered
+        according to that policy.
+
+        threadsafe: the callbacks are called in the GLib main context, whichever thread this is called from.
+        """
+        if (policy := self._coalesce.get(handle)) is not None:
+            self._send_coalesced(policy, handle, extra_args, extra_kwargs)
+        else:
+            self._dispatch(handle, extra_args, extra_kwargs)
+
+    def _send_coalesced(self, policy: Coalesce, handle: str, extra_args: tuple, extra_kwargs: dict) -> None:
         """
+        Hold back a send of a coalesced signal, replacing any earlier send with the same key
+        that hasn't been delivered yet, and make sure that a delivery is scheduled.
 
+        threadsafe
+        """
+        key = (handle, policy.key(*extra_args, **extra_kwargs) if policy.key is not None else None)
+        with self._coalesce_lock:
+            state = self._coalesce_state.get(key)
+            if state is None:
+                state = self._coalesce_state[key] = _CoalesceState()
+            state.args = extra_args
+            state.kwargs = extra_kwargs
+            state.pending = True
+
+            if state.source_id is not None:
+                if policy.debounce_ms is None:
+                    # A delivery, or the end of the rate limiting period, is scheduled.
+                    # Either one will deliver these values.
+                    return
+                # Restart the debounce window.
+                GLib.source_remove(state.source_id)
+                state.source_id = None
+
+            delay = 0.0
+            if policy.debounce_ms is not None:
+                delay = policy.debounce_ms / 1000
+            if policy.max_rate_hz is not None:
+                delay = max(delay, state.last_delivery + 1 / policy.max_rate_hz - time.monotonic())
+            self._schedule_coalesced(key, state, delay)
+
+    def _schedule_coalesced(self, key: tuple[str, Hashable], state: _CoalesceState, delay: float) -> None:
+        """
+        Schedule the delivery of the held back send for key, superseding any delivery already scheduled.
+
+        Deliveries are made at the same priority as the other callbacks, and a batched Signal queues an
+        immediate delivery behind the sends made before it, so a coalesced signal can never overtake
+        another signal that was sent earlier.
+
+        Called with _coalesce_lock held.
+        """
+        state.generation += 1
+        if delay <= 0 and self._batched:
+            with self._lock:
+                self._dispatch_queue.append(_CoalescedDelivery(key, state.generation))
+                self._schedule_drain()
+        else:
+            state.source_id = GLib.timeout_add(int(delay * 1000), self._deliver_coalesced, key, state.generation,
+                                               priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+    def _take_coalesced(self, key: tuple[str, Hashable], generation: int) -> tuple[tuple, dict] | None:
+        """
+        Take the held back send for key, if this is the latest delivery scheduled for it.
+        Returns the send's (args, kwargs), or None if the delivery was superseded.
+
+        The state for key is deleted once its send is taken, unless the signal is rate limited.
+        Then it is kept until a period without sends has passed, to hold back the sends that come too soon.
+
+        threadsafe
+        """
+        with self._coalesce_lock:
+            state = self._coalesce_state.get(key)
+            if state is None or state.generation != generation:
+                # This delivery was superseded by a later send.
+                return None
+            state.source_id = None
+            state.pending = False
+            if (policy := self._coalesce.get(key[0])) is None or policy.max_rate_hz is None:
+                # The signal has been removed, or the state isn't needed to limit the rate.
+                del self._coalesce_state[key]
+                if policy is None:
+                    return None
+            else:
+                state.last_delivery = time.monotonic()
+                state.generation += 1
+                state.source_id = GLib.timeout_add(int(1000 / policy.max_rate_hz), self._end_rate_period,
+                                                   key, state.generation, priority=GLib.PRIORITY_DEFAULT_IDLE)
+            return state.args, state.kwargs
+
+    def _end_rate_period(self, key: tuple[str, Hashable], generation: int) -> bool:
+        """
+        Timeout callback at the end of a rate limited signal's period.
+        Delivers the latest send made during the period, or forgets the key if there wasn't one.
+        Returns False so that the timeout only fires once.
+        """
+        with self._coalesce_lock:
+            state = self._coalesce_state.get(key)
+            if state is None or state.generation != generation:
+                return False
+            state.source_id = None
+            if state.pending:
+                self._schedule_coalesced(key, state, 0)
+            else:
+                del self._coalesce_state[key]
+        return False
+
+    def _deliver_coalesced(self, key: tuple[str, Hashable], generation: int) -> bool:
+        """
+        Timeout callback that dispatches the latest held back send for key.
+        Returns False so that the timeout only fires once.
+        """
+        if (send := self._take_coalesced(key, generation)) is not None:
+            self._dispatch(key[0], *send)
+        return False
+
+    def _dispatch(self, handle: str, extra_args: tuple, extra_kwargs: dict) -> None:
+        """
+        Place each callback connected to handle on the event loop.
+
+        threadsafe
+        """
+        with self._lock:
+            pending = self._collect(handle, extra_args, extra_kwargs)
+            if self._batched:
+                self._dispatch_queue.extend(pending)
+                if self._dispatch_queue:
+                    self._schedule_drain()
+                return
+
+        for _, weak_callback, args, kwargs, sent_at in pending:
+            if (callback := weak_callback()) is not None:
+                glib_utils.g_idle_add_once(self._invoke, handle, callback, sent_at, args, kwargs)
+
+    def _collect(self, handle: str, extra_args: tuple, extra_kwargs: dict) -> list[tuple]:
+        """
+        Get the callbacks of a send of handle, in the order they are to be called,
+        as (handle, weakref.WeakMethod, args, kwargs, sent_at). The connect_once callbacks are disconnected.
+
+        Called with _lock held.
+        """
+        pending = []
+        sent_at = signal_trace.TRACER.record_send(self.name, handle)
         # self._sig_handlers_once[handle] must be cleared before calling the callback in case
         # the callback reconnects itself by calling connect_once. If not, the reconnected callback gets
         # dsconnected as soon as control returns to this method. Previously, there was no
         # temp_sig_handlers_once and self._sig_handlers_once[handle] was cleared after the for loop.
         temp_sig_handlers_once = {}
         temp_sig_handlers_once[handle] = self._sig_handlers_once[handle]
-        self._sig_handlers_once[handle] = []
+        self._sig_handlers_once[handle] = {}
+        for signal in temp_sig_handlers_once[handle].values():
+            self._forget_callback(signal)
 
         for sig_h in (self._sig_handlers, temp_sig_handlers_once):
-            # reversed so a calback can remove itself wihout disrupting the iteration.
-            for signal in reversed(sig_h[handle]):
-                glib_utils.g_idle_add_once(signal.callback(), *signal.cb_args, *extra_args, **signal.cb_kwargs, **extra_kwargs)
+            # Iterate over a copy so that a subscriber dying during the loop can remove itself,
+            # newest connection first.
+            for signal in reversed(tuple(sig_h[handle].values())):
+                # The callback stays a weak reference until it is dispatched.
+                pending.append((handle,
+                                signal.callback,
+                                (*signal.cb_args, *extra_args),
+                                {**signal.cb_kwargs, **extra_kwargs},
+                                sent_at))
+        return pending
+
+    def _schedule_drain(self) -> None:
+        """Make sure that the dispatch queue will be drained. Called with _lock held."""
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            # GLib.idle_add is threadsafe, and always dispatches in the main context.
+            glib_utils.g_idle_add(self._drain_dispatch_queue)
+
+    def _invoke(self,  # pylint: disable=too-many-arguments
+                # The arguments all describe the one callback invocation.
+                handle: str,
+                callback: Callable,
+                sent_at: float | None,
+                args: tuple,
+                kwargs: dict) -> None:
+        """
+        Call one of handle's callbacks in the main context,
+        recording it in glib_utils.RUNNING_CALLBACKS and, if it was traced, in signal_trace.TRACER.
+        """
+        glib_utils.RUNNING_CALLBACKS.append((self.name, handle, callback))
+        try:
+            if sent_at is None:
+                callback(*args, **kwargs)
+            else:
+                signal_trace.TRACER.call(self.name, handle, sent_at, callback, args, kwargs)
+        finally:
+            glib_utils.RUNNING_CALLBACKS.pop()
+
+    def _drain_dispatch_queue(self) -> bool:
+        """
+        Idle callback that calls the callbacks queued by send() in batched mode.
+
+        Only the callbacks that were queued when the drain started are called. Any that get queued
+        by those callbacks are left for the next iteration of the event loop, so that a signal that
+        keeps re-sending itself can't starve the rest of the loop.
+
+        Returns: True to keep the idle source alive if there are still callbacks waiting.
+        """
+        with self._lock:
+            batch = list(self._dispatch_queue)
+            self._dispatch_queue.clear()
+        for handle, weak_callback, args, kwargs, sent_at in self._expand_coalesced(batch):
+            # Skip subscribers that have been garbage collected since the signal was sent.
+            if (callback := weak_callback()) is not None:
+                try:
+                    self._invoke(handle, callback, sent_at, args, kwargs)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # One failing subscriber must not prevent the others from being notified.
+                    self.logger.exception('callback %s raised an exception', callback)
+
+        with self._lock:
+            if self._dispatch_queue:
+                return True
+            self._drain_scheduled = False
+            return False
+
+    def _expand_coalesced(self, batch: list) -> Iterator[tuple]:
+        """
+        Iterate over the callbacks in a batch taken from the dispatch queue,
+        replacing each _CoalescedDelivery with the callbacks of its held back send.
+        """
+        for entry in batch:
+            if not isinstance(entry, _CoalescedDelivery):
+                yield entry
+            elif (send := self._take_coalesced(entry.key, entry.generation)) is not None:
+                with self._lock:
+                    pending = self._collect(entry.key[0], *send)
+                yield from pending
 
     def disconnect_by_call_back(self, handle: str, call_back: Callable) -> None:
         """
@@ -221,11 +576,15 @@ class Signal():
         calling disconnect_by_call_back. Callbacks should use disconnect_by_signal_data() instead,
         or preferably use connect_once() whenever possible.
         """
-        for sig_h in (self._sig_handlers, self._sig_handlers_once):
-            for sig in sig_h[handle]:
-                if call_back == sig.callback():
-                    sig_h[handle].remove(sig)
-                    return
+        with self._lock:
+            if handle not in self._sig_handlers:
+                raise KeyError(handle)
+            conn_ids = self._conn_ids_by_callback.get((handle, *_callback_key(call_back)), {})
+            for conn_id in conn_ids:
+                for sig_h in (self._sig_handlers, self._sig_handlers_once):
+                    if (sig_data := sig_h[handle].get(conn_id)) is not None:
+                        self._remove(sig_data, sig_h)
+                        return
         raise ValueError(f'call_back: {call_back} not found for signal: {handle}.')
 
     def disconnect_by_signal_data(self, sig_data: SignalData, handle: str=None) -> None:
@@ -235,16 +594,29 @@ class Signal():
         It is safe for callbacks to use this method to disconnect themselves from the signal,
         but it is recommended to use connect_once() whenever possible.
 
-        Searches for sig_data in the signal specified by handle. If handle is not specified,
-        then disconnect_by_signal_data searches for the sig_data in all rgistered signals.
+        sig_data knows which signal it belongs to, so handle is only checked against it.
         """
-        handles = list(handle) if handle is not None else list(self._sig_handlers)
-        for _handle in handles:
-            for sig_h in (self._sig_handlers, self._sig_handlers_once):
-                try:
-                    sig_h[_handle].remove(sig_data)
-                    return
-                except ValueError:
-                    # Only raise the exception once it is proven that sig_data isn't to be found.
-                    pass
+        if handle is None or handle == sig_data.handle:
+            with self._lock:
+                for sig_h in (self._sig_handlers, self._sig_handlers_once):
+                    # sig_data is usually the weakref.proxy returned by connect(), so look it up by conn_id.
+                    if (stored := sig_h.get(sig_data.handle, {}).get(sig_data.conn_id)) is not None:
+                        self._remove(stored, sig_h)
+                        return
         raise ValueError(f'sig_data: {sig_data} not found.')
+
+    def _remove(self, sig_data: SignalData, sig_handler_dict: dict) -> None:
+        """
+        Remove sig_data from sig_handler_dict, i.e. self._sig_handlers or self._sig_handlers_once
+        self._lock must be held by the caller.
+        """
+        del sig_handler_dict[sig_data.handle][sig_data.conn_id]
+        self._forget_callback(sig_data)
+
+    def _forget_callback(self, sig_data: SignalData) -> None:
+        """Remove sig_data from the index used by disconnect_by_call_back(). self._lock must be held by the caller."""
+        key = (sig_data.handle, *sig_data.callback_key)
+        if (conn_ids := self._conn_ids_by_callback.get(key)) is not None:
+            conn_ids.pop(sig_data.conn_id, None)
+            if not conn_ids:
+                del self._conn_ids_by_callback[key]
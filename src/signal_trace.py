@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+#  signal_trace.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+This module provides opt-in tracing of signal_.Signal dispatch.
+
+When TRACER is enabled, every Signal records each send, and each callback invocation is timed:
+the queue latency between the send and the callback being called on the main loop,
+and the time spent in the callback. Tracing is disabled by default and costs an attribute
+lookup and a method call per send while disabled.
+
+usage:
+signal_trace.TRACER.enable()
+...
+print(signal_trace.TRACER.format_table())
+signal_trace.TRACER.dump_chrome_trace('signals.json')  # open in chrome://tracing or https://ui.perfetto.dev
+
+book_ease enables the tracer at startup when the BOOK_EASE_SIGNAL_TRACE environment variable is set,
+and writes the trace to the file it names on exit.
+"""
+
+from __future__ import annotations
+import collections
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+
+@dataclass
+class CallbackStats:
+    """Accumulated timings for one subscriber callback of one signal."""
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because each field is a column of the report.
+    signal_name: str
+    handle: str
+    callback: str
+    calls: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    exec_total: float = 0.0
+    exec_max: float = 0.0
+
+    @property
+    def latency_mean(self) -> float:
+        """Mean number of seconds between the send and the callback being called."""
+        return self.latency_total / self.calls if self.calls else 0.0
+
+    @property
+    def exec_mean(self) -> float:
+        """Mean number of seconds spent in the callback."""
+        return self.exec_total / self.calls if self.calls else 0.0
+
+
+class SignalTracer:
+    """
+    Collect dispatch statistics from every signal_.Signal.
+
+    * Sends are counted per (signal name, handle), callback timings per (signal name, handle, callback).
+
+    * Individual events are also kept for the Chrome trace, up to max_events of the most recent ones.
+
+    * threadsafe: sends are recorded in whichever thread sends the signal.
+    """
+
+    def __init__(self, max_events: int = 100000) -> None:
+        self._enabled = False
+        self._lock = threading.Lock()
+        self._send_counts: dict[tuple[str, str], int] = {}
+        self._stats: dict[tuple[str, str, str], CallbackStats] = {}
+        self._events = collections.deque(maxlen=max_events)
+        self._pid = os.getpid()
+
+    @property
+    def enabled(self) -> bool:
+        """Determine if signals are currently being traced."""
+        return self._enabled
+
+    def enable(self) -> None:
+        """Start tracing. Sends that were already waiting to be dispatched are not traced."""
+        self._enabled = True
+
+    def disable(self) -> None:
+        """Stop tracing. The statistics collected so far are kept."""
+        self._enabled = False
+
+    def reset(self) -> None:
+        """Discard the statistics collected so far."""
+        with self._lock:
+            self._send_counts.clear()
+            self._stats.clear()
+            self._events.clear()
+
+    def record_send(self, signal_name: str, handle: str) -> float | None:
+        """
+        Count a send of a signal.
+        Returns: the time of the send, to be passed to call(), or None if tracing is disabled.
+        """
+        if not self._enabled:
+            return None
+        sent_at = time.perf_counter()
+        key = (signal_name, handle)
+        with self._lock:
+            self._send_counts[key] = self._send_counts.get(key, 0) + 1
+            self._events.append({'name': handle, 'cat': signal_name, 'ph': 'i', 's': 't',
+                                 'ts': sent_at * 1e6, 'pid': self._pid, 'tid': threading.get_ident()})
+        return sent_at
+
+    def call(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+             # The arguments all describe the one callback invocation.
+             signal_name: str,
+             handle: str,
+             sent_at: float,
+             callback: Callable,
+             args: tuple,
+             kwargs: dict) -> any:
+        """Call callback(*args, **kwargs), recording how long it waited since sent_at and how long it took."""
+        start = time.perf_counter()
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            self._record_call(signal_name, handle, getattr(callback, '__qualname__', repr(callback)),
+                              start - sent_at, start, end - start)
+
+    def _record_call(self,  # pylint: disable=too-many-arguments,too-many-positional-arguments
+                     # The arguments all describe the one callback invocation.
+                     signal_name: str,
+                     handle: str,
+                     callback_name: str,
+                     latency: float,
+                     start: float,
+                     duration: float) -> None:
+        """Add a callback invocation to the statistics and the event log."""
+        key = (signal_name, handle, callback_name)
+        with self._lock:
+            if (stats := self._stats.get(key)) is None:
+                stats = self._stats[key] = CallbackStats(signal_name, handle, callback_name)
+            stats.calls += 1
+            stats.latency_total += latency
+            stats.latency_max = max(stats.latency_max, latency)
+            stats.exec_total += duration
+            stats.exec_max = max(stats.exec_max, duration)
+            self._events.append({'name': callback_name, 'cat': f'{signal_name}.{handle}', 'ph': 'X',
+                                 'ts': start * 1e6, 'dur': duration * 1e6,
+                                 'pid': self._pid, 'tid': threading.get_ident(),
+                                 'args': {'queue_latency_us': round(latency * 1e6, 1)}})
+
+    def send_counts(self) -> dict[tuple[str, str], int]:
+        """Get the number of sends of each (signal name, handle)."""
+        with self._lock:
+            return dict(self._send_counts)
+
+    def stats(self) -> list[CallbackStats]:
+        """Get a copy of the callback statistics, the callbacks with the most total execution time first."""
+        with self._lock:
+            stats = [CallbackStats(**vars(stats)) for stats in self._stats.values()]
+        return sorted(stats, key=lambda stats: stats.exec_total, reverse=True)
+
+    def format_table(self) -> str:
+        """Format the statistics as a plain text table, with times in milliseconds."""
+        send_counts = self.send_counts()
+        header = (f'{"signal":<40} {"callback":<50} {"sends":>7} {"calls":>7}'
+                  f' {"exec total":>11} {"exec mean":>10} {"exec max":>10} {"lat mean":>10} {"lat max":>10}')
+        lines = [header, '-' * len(header)]
+        for stats in self.stats():
+            lines.append(f'{stats.signal_name + "." + stats.handle:<40.40} {stats.callback:<50.50}'
+                         f' {send_counts.get((stats.signal_name, stats.handle), 0):>7} {stats.calls:>7}'
+                         f' {stats.exec_total * 1000:>11.2f} {stats.exec_mean * 1000:>10.3f}'
+                         f' {stats.exec_max * 1000:>10.3f} {stats.latency_mean * 1000:>10.3f}'
+                         f' {stats.latency_max * 1000:>10.3f}')
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Get the recorded events in the Chrome trace event format."""
+        with self._lock:
+            return {'traceEvents': list(self._events), 'displayTimeUnit': 'ms'}
+
+    def dump_chrome_trace(self, path: Path | str) -> None:
+        """Write the recorded events to path as Chrome trace JSON."""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file)
+
+
+TRACER = SignalTracer()
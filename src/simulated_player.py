@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+#
+#  simulated_player.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=wrong-import-position
+# disabled because gi.repository requires an import order that pylint dislikes.
+
+"""
+This module provides a player.PlayerBackend that simulates playback instead of decoding audio.
+
+SimulatedPlayer keeps the position of its stream on a VirtualClock. Nothing happens until the clock is
+advanced, and then the backend's events happen in a fixed order, so a run can be repeated exactly.
+run() alternates between advancing the clock and dispatching the signals that are waiting in the
+GLib main context, which lets Player and GstPlayerA be driven through hours of playback in a moment:
+
+    clock = VirtualClock()
+    player_ = player.Player(backend=SimulatedPlayer(clock))
+    ...
+    run(clock, until=clock.now() + StreamTime(1, 'h'))
+"""
+
+from __future__ import annotations
+import heapq
+import itertools
+from pathlib import Path
+from typing import Callable
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import signal_
+from player import GstPlayerError, PlayerBackend, StreamData, StreamTime
+
+
+class VirtualClock:
+    """
+    Simulated time, that only moves when it is advanced.
+
+    Callbacks scheduled with call_later() are called by advance(), in order of the time they are due,
+    and in the order they were scheduled when they are due at the same time.
+    """
+
+    def __init__(self) -> None:
+        self.now_ns = 0
+        self._events: list[tuple[int, int, list]] = []
+        self._sequence = itertools.count()
+
+    def now(self) -> StreamTime:
+        """Get the current time."""
+        return StreamTime(self.now_ns)
+
+    def call_later(self, delay: StreamTime, callback: Callable, *args) -> list:
+        """
+        Schedule callback(*args) to be called delay after now.
+        Returns a handle for cancel().
+        """
+        event = [callback, args]
+        heapq.heappush(self._events, (self.now_ns + max(0, delay.get_time()), next(self._sequence), event))
+        return event
+
+    @staticmethod
+    def cancel(event: list | None) -> None:
+        """Stop a scheduled callback from being called. Passing None does nothing."""
+        if event is not None:
+            event[0] = None
+
+    def advance(self, until: StreamTime | None = None) -> bool:
+        """
+        Move the time forward to the next scheduled callback, and call it.
+
+        until: don't move past this time. If nothing is due by then, the time is moved to until.
+
+        Returns False if there was nothing to call.
+        """
+        until_ns = until.get_time() if until is not None else None
+        while self._events:
+            due_ns, _, event = self._events[0]
+            if event[0] is None:
+                heapq.heappop(self._events)
+                continue
+            if until_ns is not None and due_ns > until_ns:
+                break
+            heapq.heappop(self._events)
+            self.now_ns = max(self.now_ns, due_ns)
+            callback, args = event
+            event[0] = None
+            callback(*args)
+            return True
+        if until_ns is not None:
+            self.now_ns = max(self.now_ns, until_ns)
+        return False
+
+
+def run(clock: VirtualClock, until: StreamTime | None = None) -> None:
+    """
+    Run a simulation in the default GLib main context.
+
+    Everything that is ready in the main context is dispatched before the clock is advanced to the next
+    scheduled callback, so the signals sent at one virtual time are all delivered before the next.
+    Returns when nothing more is scheduled, or the clock reaches until.
+
+    Note: A simulation that is playing always has something scheduled, so until is required to stop it.
+    """
+    context = GLib.MainContext.default()
+    while True:
+        while context.iteration(False):
+            pass
+        if not clock.advance(until):
+            return
+
+
+class SimulatedPlayer(PlayerBackend):
+    """
+    A PlayerBackend that plays streams on a VirtualClock.
+
+    clock: the VirtualClock that the streams play on.
+
+    durations: the duration of each stream, by str(path). Streams that aren't listed last default_duration.
+
+    load_latency, command_latency: how long loading a stream, and every other stream command, takes.
+
+    Like GstPlayer, the stream commands return False while another one is in progress, 'stream_ready' is sent
+    when each one completes, 'time_updated' every update time period while playing, and a next stream
+    set with set_next_stream() is continued into without an EOS.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Disabled because the simulation keeps the same stream state as GstPlayer, plus its latencies and pending events.
+
+    def __init__(self,
+                 clock: VirtualClock,
+                 durations: dict[str, StreamTime] | None = None,
+                 default_duration: StreamTime = StreamTime(10, 'm'),
+                 load_latency: StreamTime = StreamTime(20, 'ms'),
+                 command_latency: StreamTime = StreamTime(1, 'ms')) -> None:
+        self.clock = clock
+        self.durations = durations if durations is not None else {}
+        self.default_duration = default_duration
+        self.load_latency = load_latency
+        self.command_latency = command_latency
+
+        self.transmitter = signal_.Signal(batched=True, name='SimulatedPlayer')
+        self.transmitter.add_signal('stream_ready', 'eos', 'seek_complete', 'volume_change', 'stream_changed')
+        self.transmitter.add_signal('time_updated', coalesce=signal_.Coalesce())
+
+        self.stream_data: StreamData | None = None
+        self.next_stream_data: StreamData | None = None
+        self.playing = False
+        self.volume = 1.0
+        self.update_time_period = StreamTime(1, 's')
+        self._duration_ns = 0
+        # The position is _position_ns at the virtual time _position_set_ns, and moves with the clock while playing.
+        self._position_ns = 0
+        self._position_set_ns = 0
+        self._busy = False
+        self._command_event: list | None = None
+        # Set once the stream is unloaded with release_pipeline, or the player is shut down.
+        self.pipeline_released = False
+        self._end_event: list | None = None
+        self._update_time_event: list | None = None
+
+    def duration_of(self, path: Path) -> StreamTime:
+        """Get the simulated duration of the file at path."""
+        return self.durations.get(str(path), self.default_duration)
+
+    def _begin(self, latency: StreamTime, complete: Callable, *args) -> bool:
+        """
+        Start a stream command that calls complete(*args) after latency and then sends 'stream_ready'.
+        Returns False if another stream command is in progress.
+        """
+        if self._busy:
+            return False
+        self._busy = True
+        self._command_event = self.clock.call_later(latency, self._complete, complete, args)
+        return True
+
+    def _complete(self, complete: Callable, args: tuple) -> None:
+        """Finish a stream command."""
+        self._busy = False
+        self._command_event = None
+        complete(*args)
+        self.transmitter.send('stream_ready')
+
+    def _require_stream(self) -> None:
+        if self.stream_data is None:
+            raise GstPlayerError('No stream is loaded.')
+
+    def _current_position_ns(self) -> int:
+        if not self.playing:
+            return self._position_ns
+        return min(self._duration_ns, self._position_ns + self.clock.now_ns - self._position_set_ns)
+
+    def _set_position_ns(self, position_ns: int) -> None:
+        """Move the position, and reschedule the end of the stream."""
+        self._position_ns = min(max(0, position_ns), self._duration_ns)
+        self._position_set_ns = self.clock.now_ns
+        self._schedule_playback()
+
+    def _schedule_playback(self) -> None:
+        """(Re)schedule the end of the stream and the 'time_updated' ticks, if playing."""
+        VirtualClock.cancel(self._end_event)
+        VirtualClock.cancel(self._update_time_event)
+        self._end_event = self._update_time_event = None
+        if self.playing:
+            self._end_event = self.clock.call_later(StreamTime(self._duration_ns - self._position_ns), self._on_end)
+            self._update_time_event = self.clock.call_later(self.update_time_period, self._update_time)
+
+    def _update_time(self) -> None:
+        """Send the position, every update time period while playing."""
+        self._update_time_event = self.clock.call_later(self.update_time_period, self._update_time)
+        self.transmitter.send('time_updated', StreamTime(self._current_position_ns()), self.stream_data)
+
+    def _on_end(self) -> None:
+        """The stream has played to its end. Continue into the next stream, or send 'eos'."""
+        self._end_event = None
+        if self.next_stream_data is not None:
+            self.stream_data, self.next_stream_data = self.next_stream_data, None
+            self._duration_ns = self.duration_of(self.stream_data.path).get_time()
+            self._set_position_ns(0)
+            self.transmitter.send('stream_changed', self.stream_data)
+        else:
+            self._position_ns = self._current_position_ns()
+            self._position_set_ns = self.clock.now_ns
+            VirtualClock.cancel(self._update_time_event)
+            self._update_time_event = None
+            self.transmitter.send('eos')
+
+    def load_stream(self, stream_data: StreamData) -> bool:
+        if self.stream_data is not None and not self._busy:
+            raise GstPlayerError('A stream is already loaded.')
+        return self._begin(self.load_latency, self._load_stream, stream_data)
+
+    def _load_stream(self, stream_data: StreamData) -> None:
+        self.stream_data = stream_data
+        self.pipeline_released = False
+        self.playing = False
+        self._duration_ns = self.duration_of(stream_data.path).get_time()
+        self._set_position_ns(stream_data.position_data.time.get_time())
+        self.transmitter.send('time_updated', StreamTime(self._position_ns), self.stream_data)
+
+    def unload_stream(self, release_pipeline: bool = False) -> bool:
+        if not self._busy and not release_pipeline:
+            self._require_stream()
+        return self._begin(self.command_latency, self._unload_stream, release_pipeline)
+
+    def _unload_stream(self, release_pipeline: bool) -> None:
+        self.stream_data = self.next_stream_data = None
+        self.playing = False
+        self.pipeline_released = release_pipeline
+        self._set_position_ns(0)
+
+    def shutdown(self) -> None:
+        VirtualClock.cancel(self._command_event)
+        self._command_event = None
+        self.stream_data = self.next_stream_data = None
+        self.playing = False
+        self._busy = False
+        self.pipeline_released = True
+        self._schedule_playback()
+
+    def set_next_stream(self, stream_data: StreamData | None) -> bool:
+        self.next_stream_data = stream_data
+        return True
+
+    def play(self) -> bool:
+        if not self._busy:
+            self._require_stream()
+        return self._begin(self.command_latency, self._set_playing, True)
+
+    def pause(self) -> bool:
+        if not self._busy:
+            self._require_stream()
+        return self._begin(self.command_latency, self._set_playing, False)
+
+    def _set_playing(self, playing: bool) -> None:
+        position_ns = self._current_position_ns()
+        self.playing = playing
+        self._set_position_ns(position_ns)
+        self.transmitter.send('time_updated', StreamTime(self._position_ns), self.stream_data)
+
+    def set_position(self, time_: StreamTime) -> bool:
+        if not self._busy:
+            self._require_stream()
+            if time_ < StreamTime(0):
+                raise GstPlayerError('Failed to set stream playback position.')
+        return self._begin(self.command_latency, self._set_position_ns, time_.get_time())
+
+    def set_volume(self, volume: float) -> bool:
+        return self._begin(self.command_latency, self._set_volume, volume)
+
+    def _set_volume(self, volume: float) -> None:
+        self.volume = volume
+        self.transmitter.send('volume_change', volume)
+
+    def set_update_time_period(self, period_length: StreamTime) -> bool:
+        return self._begin(self.command_latency, self._set_update_time_period, period_length)
+
+    def _set_update_time_period(self, period_length: StreamTime) -> None:
+        self.update_time_period = period_length
+        self._set_position_ns(self._current_position_ns())
+
+    def query_position(self) -> StreamTime:
+        if self._busy or self.stream_data is None:
+            raise GstPlayerError('Failed to query current position.')
+        return StreamTime(self._current_position_ns())
+
+    def query_duration(self) -> StreamTime:
+        self._require_stream()
+        return StreamTime(self._duration_ns)
+
+    def query_volume(self) -> float:
+        return self.volume
+
+    def query_stream_info(self) -> str | None:
+        if self._busy:
+            raise GstPlayerError('Failed to query stream info.')
+        return self.stream_data.stream_info if self.stream_data is not None else None
+
+    def query_discovered_stream_info(self) -> str | None:
+        if self._busy:
+            raise GstPlayerError('Failed to query stream info.')
+
+    def discover_stream(self, path: Path) -> tuple[StreamTime, str] | None:
+        return self.duration_of(path), f'simulated stream: {Path(path).name}'
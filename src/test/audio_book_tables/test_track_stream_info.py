@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+#  test_track_stream_info.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=redefined-outer-name
+# disable redefined-outer-name because it is required to redefine an outer name to use pytest fixtures.
+#
+# pylint: disable=too-few-public-methods
+#
+
+"""
+Test for class audio_book_tables.TrackStreamInfo.
+This test requires sqlite_tools.DBConnectionManager, because it does matter that the connection is in the exact same
+state as what's being used in the program, ie foreign keys.
+"""
+
+import sqlite3
+from test.audio_book_tables import sample_data
+import pytest
+import audio_book_tables
+import sqlite_tools
+
+
+@pytest.fixture
+def in_mem_db_str() -> str:
+    """connection string for an in memory database"""
+    return ":memory:"
+
+
+def init_test_data_base(con) -> sample_data.SampleDatabaseCreator:
+    """initialize the necessary tables for this test"""
+    s_db_c = sample_data.SampleDatabaseCreator()
+    s_db_c.populate_track_file(con)
+    audio_book_tables.TrackStreamInfo.init_table(con)
+    return s_db_c
+
+
+class TestInitTable:
+    """Test for method TrackStreamInfo.init_table."""
+
+    def test_creates_table_with_correct_columns(self, in_mem_db_str):
+        """Show that the table gets created with the correct columns."""
+        db_con_man = sqlite_tools.DBConnectionManager(in_mem_db_str)
+        with db_con_man.query() as con:
+            audio_book_tables.TrackStreamInfo.init_table(con)
+            cur = con.execute('pragma table_info(track_stream_info)')
+            data = [(row['name'], row['type']) for row in cur.fetchall()]
+            assert ('track_file_id', 'INTEGER') in data
+            assert ('size', 'INTEGER') in data
+            assert ('mtime_ns', 'INTEGER') in data
+            assert ('duration', 'INTEGER') in data
+            assert ('stream_info', 'TEXT') in data
+
+
+class TestUpsertRow:
+    """Test for method TrackStreamInfo.upsert_row"""
+
+    def test_fails_without_matching_track_file_foreign_key(self, in_mem_db_str):
+        """Show that upsert_row fails when the track_file_id doesn't exist in table track_file"""
+        db_con_man = sqlite_tools.DBConnectionManager(in_mem_db_str)
+        with db_con_man.query() as con:
+            sample_data = init_test_data_base(con)
+            track_file_id = max(row['id'] for row in sample_data.track_file_list) + 1
+            with pytest.raises(sqlite3.IntegrityError):
+                audio_book_tables.TrackStreamInfo.upsert_row(
+                    con, track_file_id=track_file_id, size=1, mtime_ns=1, duration=1, stream_info='info'
+                )
+
+    def test_updates_row_when_duplicate_track_file_id(self, in_mem_db_str):
+        """Show that upsert_row replaces the cached values of a track_file that is already cached."""
+        db_con_man = sqlite_tools.DBConnectionManager(in_mem_db_str)
+        with db_con_man.query() as con:
+            sample_data = init_test_data_base(con)
+            track_file_id = sample_data.track_file_list[0]['id']
+            audio_book_tables.TrackStreamInfo.upsert_row(
+                con, track_file_id=track_file_id, size=1, mtime_ns=2, duration=3, stream_info='old'
+            )
+            audio_book_tables.TrackStreamInfo.upsert_row(
+                con, track_file_id=track_file_id, size=4, mtime_ns=5, duration=6, stream_info='new'
+            )
+            rows = con.execute('SELECT * FROM track_stream_info').fetchall()
+            assert len(rows) == 1
+            assert tuple(rows[0]) == (track_file_id, 4, 5, 6, 'new')
+
+
+class TestGetRowByPath:
+    """Test for method TrackStreamInfo.get_row_by_path"""
+
+    def test_returns_row_when_size_and_mtime_match(self, in_mem_db_str):
+        """Show that get_row_by_path returns the cached row of the track_file with matching path."""
+        db_con_man = sqlite_tools.DBConnectionManager(in_mem_db_str)
+        with db_con_man.query() as con:
+            sample_data = init_test_data_base(con)
+            track_file = sample_data.track_file_list[1]
+            audio_book_tables.TrackStreamInfo.upsert_row(
+                con, track_file_id=track_file['id'], size=100, mtime_ns=200, duration=300, stream_info='info'
+            )
+            row = audio_book_tables.TrackStreamInfo.get_row_by_path(con, track_file['path'], 100, 200)
+            assert row['duration'] == 300
+            assert row['stream_info'] == 'info'
+
+    def test_returns_none_when_file_changed(self, in_mem_db_str):
+        """Show that get_row_by_path ignores the cached row when the file's size or mtime changed."""
+        db_con_man = sqlite_tools.DBConnectionManager(in_mem_db_str)
+        with db_con_man.query() as con:
+            sample_data = init_test_data_base(con)
+            track_file = sample_data.track_file_list[1]
+            audio_book_tables.TrackStreamInfo.upsert_row(
+                con, track_file_id=track_file['id'], size=100, mtime_ns=200, duration=300, stream_info='info'
+            )
+            assert audio_book_tables.TrackStreamInfo.get_row_by_path(con, track_file['path'], 101, 200) is None
+            assert audio_book_tables.TrackStreamInfo.get_row_by_path(con, track_file['path'], 100, 201) is None
+            assert audio_book_tables.TrackStreamInfo.get_row_by_path(con, 'not/a/cached/path', 100, 200) is None
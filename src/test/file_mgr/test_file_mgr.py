@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+#
+#  test_file_mgr.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=protected-access
+# disabled because this module is testing protected methods.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+
+"""
+Unit test for class file_mgr.FileMgr
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest import mock
+import pytest
+import file_mgr
+from file_op_progress import FileOpProgress
+from tree_walker import TreeWalker
+
+
+@pytest.fixture()
+def file_mgr_():
+    """Create a FileMgr without touching the application database or sending any signals."""
+    with mock.patch('file_mgr.FileMgrDBI'), mock.patch('file_mgr.signal_.GLOBAL_TRANSMITTER'):
+        yield file_mgr.FileMgr()
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    """
+    Create a tree to copy or delete, next to a directory that it links to:
+        tree/a
+        tree/sub/b
+        tree/sub/empty/
+        tree/sub/link -> outside
+        outside/c
+    """
+    (tmp_path / 'tree' / 'sub' / 'empty').mkdir(parents=True)
+    (tmp_path / 'outside').mkdir()
+    (tmp_path / 'tree' / 'a').write_bytes(b'a')
+    (tmp_path / 'tree' / 'sub' / 'b').write_bytes(b'bb')
+    (tmp_path / 'outside' / 'c').write_bytes(b'c')
+    (tmp_path / 'tree' / 'sub' / 'link').symlink_to(tmp_path / 'outside')
+    return tmp_path / 'tree'
+
+
+def make_deep_tree(root: Path, depth: int) -> None:
+    """Create depth nested directories below root, each holding a file."""
+    path = root
+    for level in range(depth):
+        path = path / f'd{level}'
+        path.mkdir(parents=True)
+        (path / 'file').write_bytes(b'x')
+
+
+def fail_to_open(name: str):
+    """Get a replacement for os.open() in tree_walker that can't open directories called name."""
+    real_open = os.open
+
+    def open_(path, *args, **kwargs):
+        if path == name:
+            raise PermissionError(13, 'Permission denied')
+        return real_open(path, *args, **kwargs)
+    return mock.patch('tree_walker.os.open', open_)
+
+
+class TestSetProgressTotals:
+    """Unit test for method _set_progress_totals()"""
+
+    def test_counts_files_and_bytes(self, file_mgr_, tmp_path):
+        """
+        Assert that every file and subdirectory below the top level directories is counted,
+        and the bytes of the files are summed.
+        """
+        (tmp_path / 'top' / 'sub').mkdir(parents=True)
+        (tmp_path / 'top' / 'a').write_bytes(bytes(10))
+        (tmp_path / 'top' / 'sub' / 'b').write_bytes(bytes(5))
+        (tmp_path / 'c').write_bytes(bytes(1))
+        progress = mock.Mock(spec=FileOpProgress)
+        progress.has_totals.return_value = False
+
+        file_mgr_._set_progress_totals(progress, tmp_path / 'top', tmp_path / 'c')
+        # sub, a, b and c
+        progress.set_totals.assert_called_once_with(4, 16)
+
+    def test_symlinks_are_not_followed(self, file_mgr_, tmp_path):
+        """Assert that a symlink is counted as one file, by its own size rather than that of its target."""
+        (tmp_path / 'top').mkdir()
+        (tmp_path / 'big').write_bytes(bytes(1000))
+        (tmp_path / 'top' / 'link').symlink_to(tmp_path / 'big')
+        progress = mock.Mock(spec=FileOpProgress)
+        progress.has_totals.return_value = False
+
+        file_mgr_._set_progress_totals(progress, tmp_path / 'top')
+        n_files, n_bytes = progress.set_totals.call_args.args
+        assert n_files == 1
+        assert n_bytes < 1000
+
+    def test_keeps_existing_totals(self, file_mgr_, tmp_path):
+        """Assert that the totals of a progress that already has them are left alone."""
+        progress = mock.Mock(spec=FileOpProgress)
+        progress.has_totals.return_value = True
+        file_mgr_._set_progress_totals(progress, tmp_path)
+        progress.set_totals.assert_not_called()
+
+
+class TestIsRemote:
+    """Unit test for method is_remote()"""
+
+    @mock.patch('file_mgr.Gio')
+    def test_reads_filesystem_remote(self, gio, tmp_path):
+        """Assert that the answer comes from the filesystem::remote attribute of the path's filesystem."""
+        info = gio.File.new_for_path.return_value.query_filesystem_info.return_value
+        info.get_attribute_boolean.return_value = True
+        assert file_mgr.FileMgr.is_remote(tmp_path)
+        gio.File.new_for_path.assert_called_once_with(str(tmp_path))
+        info.get_attribute_boolean.assert_called_once_with(gio.FILE_ATTRIBUTE_FILESYSTEM_REMOTE)
+
+
+class TestPrefersCopyTree:
+    """Unit test for method prefers_copy_tree()"""
+
+    def test_prefers_copy_tree_across_devices(self, tmp_path):
+        """Assert that the concurrent copy is preferred between two devices, without asking about remote."""
+        src_stat = mock.Mock(st_dev=1)
+        dest_stat = mock.Mock(st_dev=2)
+        with mock.patch.object(Path, 'stat', side_effect=(src_stat, dest_stat)), \
+             mock.patch.object(file_mgr.FileMgr, 'is_remote') as is_remote:
+            assert file_mgr.FileMgr.prefers_copy_tree(tmp_path / 'src', tmp_path / 'dest')
+        is_remote.assert_not_called()
+
+    @pytest.mark.parametrize('remote', (False, True))
+    def test_same_device_prefers_copy_tree_if_remote(self, tmp_path, remote):
+        """Assert that within one device, the concurrent copy is only preferred on a remote filesystem."""
+        with mock.patch.object(file_mgr.FileMgr, 'is_remote', return_value=remote):
+            assert file_mgr.FileMgr.prefers_copy_tree(tmp_path, tmp_path) is remote
+
+
+class TestPasteCopy:
+    """Unit test for method paste_copy()"""
+
+    @pytest.mark.parametrize('prefers_copy_tree', (False, True))
+    def test_directory(self, file_mgr_, tree, tmp_path, prefers_copy_tree):
+        """Assert that a directory is copied with copy_tree() only if prefers_copy_tree()."""
+        dest = tmp_path / 'copy'
+        with mock.patch.object(file_mgr_, 'prefers_copy_tree', return_value=prefers_copy_tree) as prefers, \
+             mock.patch.object(file_mgr_, 'copy_tree', return_value=[]) as copy_tree, \
+             mock.patch.object(file_mgr_, 'copy', return_value=[]) as copy:
+            file_mgr_.paste_copy(tree, dest)
+        prefers.assert_called_once_with(tree, tmp_path)
+        assert copy_tree.called is prefers_copy_tree
+        assert copy.called is not prefers_copy_tree
+
+    def test_file_is_copied_serially(self, file_mgr_, tree, tmp_path):
+        """Assert that a file is copied with copy(), without looking at the devices."""
+        with mock.patch.object(file_mgr_, 'prefers_copy_tree') as prefers:
+            assert not file_mgr_.paste_copy(tree / 'a', tmp_path / 'a')
+        prefers.assert_not_called()
+        assert (tmp_path / 'a').read_bytes() == b'a'
+
+
+class TestCopy:
+    """Unit test for method _copy()"""
+
+    def test_copies_nested_tree(self, file_mgr_, tree, tmp_path):
+        """Assert that the contents of every level are copied, and symlinks are copied rather than followed."""
+        dest = tmp_path / 'copy'
+        assert not file_mgr_._copy(tree, dest, None, None)
+        assert (dest / 'a').read_bytes() == b'a'
+        assert (dest / 'sub' / 'b').read_bytes() == b'bb'
+        assert (dest / 'sub' / 'empty').is_dir()
+        assert (dest / 'sub' / 'link').is_symlink()
+        assert os.readlink(dest / 'sub' / 'link') == str(tmp_path / 'outside')
+
+    def test_copies_directory_mtimes(self, file_mgr_, tree, tmp_path):
+        """Assert that the modification times of the copied directories are those of the originals."""
+        os.utime(tree / 'sub', ns=(1_000_000_000, 1_000_000_000))
+        file_mgr_._copy(tree, tmp_path / 'copy', None, None)
+        assert os.stat(tmp_path / 'copy' / 'sub').st_mtime_ns == 1_000_000_000
+
+    def test_copies_into_existing_directory(self, file_mgr_, tree, tmp_path):
+        """Assert that a directory copied to an existing directory of another name is copied into it."""
+        (tmp_path / 'dest').mkdir()
+        assert not file_mgr_._copy(tree, tmp_path / 'dest', None, None)
+        assert (tmp_path / 'dest' / 'tree' / 'sub' / 'b').is_file()
+
+    def test_existing_files_are_not_overwritten(self, file_mgr_, tree, tmp_path):
+        """Assert that merging into a copy reports the files that exist, and leaves them alone."""
+        dest = tmp_path / 'copy' / 'tree'
+        dest.mkdir(parents=True)
+        (dest / 'a').write_bytes(b'keep')
+        errors = file_mgr_._copy(tree, dest, None, None)
+        assert [error.file for error in errors] == [tree / 'a']
+        assert (dest / 'a').read_bytes() == b'keep'
+        assert (dest / 'sub' / 'b').is_file()
+
+    def test_deeper_than_open_descriptor_limit(self, file_mgr_, tmp_path):
+        """Assert that a tree deeper than the walker keeps descriptors open for is copied completely."""
+        depth = TreeWalker._max_open_dirs + 8
+        make_deep_tree(tmp_path / 'tree', depth)
+        assert not file_mgr_._copy(tmp_path / 'tree', tmp_path / 'copy', None, None)
+        assert len(list((tmp_path / 'copy').rglob('file'))) == depth
+
+    def test_unreadable_directory_is_reported(self, file_mgr_, tree, tmp_path):
+        """Assert that a directory that can't be read is reported, and the rest of the tree is copied."""
+        with fail_to_open('sub'):
+            errors = file_mgr_._copy(tree, tmp_path / 'copy', None, None)
+        assert [error.file for error in errors] == [tree / 'sub']
+        assert (tmp_path / 'copy' / 'a').is_file()
+
+    def test_cancelled(self, file_mgr_, tree, tmp_path):
+        """Assert that nothing is copied once the cancel_event is set."""
+        cancel_event = mock.Mock()
+        cancel_event.is_set.return_value = True
+        assert file_mgr_._copy(tree, tmp_path / 'copy', cancel_event, None)
+        assert not (tmp_path / 'copy').exists()
+
+
+class TestIsPopulatedDir:
+    """Unit test for method _is_populated_dir()"""
+
+    def test_populated_dir(self, tree):
+        """Assert that a directory holding anything is populated."""
+        assert file_mgr.FileMgr._is_populated_dir(tree)
+
+    def test_empty_dir(self, tree):
+        """Assert that an empty directory is not populated."""
+        assert not file_mgr.FileMgr._is_populated_dir(tree / 'sub' / 'empty')
+
+    def test_file(self, tree):
+        """Assert that a file is not a populated directory."""
+        assert not file_mgr.FileMgr._is_populated_dir(tree / 'a')
+
+    def test_symlink_to_populated_dir(self, tree):
+        """Assert that a symlink is not a populated directory, even when its target is one."""
+        assert not file_mgr.FileMgr._is_populated_dir(tree / 'sub' / 'link')
+
+
+class TestDelete:
+    """Unit test for method _delete()"""
+
+    def test_deletes_nested_tree(self, file_mgr_, tree, tmp_path):
+        """Assert that every level is deleted, and that symlinks are deleted without touching their targets."""
+        assert not file_mgr_._delete(tree, recursive=True)
+        assert not tree.exists()
+        assert (tmp_path / 'outside' / 'c').is_file()
+
+    def test_populated_dir_requires_recursive(self, file_mgr_, tree):
+        """Assert that a populated directory isn't deleted without recursive, but an empty one is."""
+        errors = file_mgr_._delete(tree, tree / 'sub' / 'empty')
+        assert [error.file for error in errors] == [tree]
+        assert (tree / 'a').is_file()
+        assert not (tree / 'sub' / 'empty').exists()
+
+    def test_deletes_symlink_root(self, file_mgr_, tree, tmp_path):
+        """Assert that deleting a symlink to a directory deletes only the symlink."""
+        assert not file_mgr_._delete(tree / 'sub' / 'link', recursive=True)
+        assert not os.path.lexists(tree / 'sub' / 'link')
+        assert (tmp_path / 'outside' / 'c').is_file()
+
+    def test_deeper_than_open_descriptor_limit(self, file_mgr_, tmp_path):
+        """Assert that a tree deeper than the walker keeps descriptors open for is deleted completely."""
+        make_deep_tree(tmp_path / 'tree', TreeWalker._max_open_dirs + 8)
+        assert not file_mgr_._delete(tmp_path / 'tree', recursive=True)
+        assert not (tmp_path / 'tree').exists()
+
+    def test_unreadable_directory_is_reported(self, file_mgr_, tree):
+        """Assert that a directory that can't be read is reported, and the rest of the tree is deleted."""
+        with fail_to_open('sub'):
+            errors = file_mgr_._delete(tree, recursive=True)
+        assert tree / 'sub' in [error.file for error in errors]
+        assert not (tree / 'a').exists()
+        assert (tree / 'sub' / 'b').is_file()
+
+    def test_missing_file(self, file_mgr_, tmp_path):
+        """Assert that a file that doesn't exist is reported."""
+        assert [error.file for error in file_mgr_._delete(tmp_path / 'missing')] == [tmp_path / 'missing']
+
+
+def move_journal(dest: Path) -> Path:
+    """Get the location of the journal of a move to dest."""
+    return file_mgr._MoveJournal.path_for(dest)
+
+
+def cancel_after(n_checks: int) -> mock.Mock:
+    """Create a cancel_event that is set after it has been checked n_checks times."""
+    cancel_event = mock.Mock()
+    cancel_event.is_set.side_effect = lambda: cancel_event.is_set.call_count > n_checks
+    return cancel_event
+
+
+class TestMoveAcrossDevices:
+    """Unit test for method _move_across_devices()"""
+
+    def test_moves_nested_tree(self, file_mgr_, tree, tmp_path):
+        """Assert that every level is moved, symlinks are moved as symlinks, and no journal is left behind."""
+        dest = tmp_path / 'moved'
+        assert not file_mgr_._move_across_devices(tree, dest)
+        assert not tree.exists()
+        assert (dest / 'a').read_bytes() == b'a'
+        assert (dest / 'sub' / 'b').read_bytes() == b'bb'
+        assert (dest / 'sub' / 'empty').is_dir()
+        assert os.readlink(dest / 'sub' / 'link') == str(tmp_path / 'outside')
+        assert not move_journal(dest).exists()
+
+    def test_cancel_and_resume(self, file_mgr_, tree, tmp_path):
+        """Assert that a cancelled move leaves a journal, and that move() then resumes it to the end."""
+        dest = tmp_path / 'moved'
+        assert file_mgr_._move_across_devices(tree, dest, cancel_event=cancel_after(3))
+        assert move_journal(dest).exists()
+        assert tree.exists()
+
+        assert not file_mgr_.move(tree, dest)
+        assert not tree.exists()
+        assert (dest / 'sub' / 'b').read_bytes() == b'bb'
+        assert not move_journal(dest).exists()
+
+    def test_crash_between_rename_and_copystat(self, file_mgr_, tree, tmp_path):
+        """
+        Assert that a copy that was renamed into place, but didn't get its source's metadata before the
+        application died, is accepted on resume by its contents, and is given the metadata.
+        """
+        dest = tmp_path / 'moved'
+        os.utime(tree / 'a', ns=(1_000_000_000, 1_000_000_000))
+        with mock.patch('file_mgr.shutil.copystat', side_effect=KeyboardInterrupt), pytest.raises(KeyboardInterrupt):
+            file_mgr_._move_across_devices(tree / 'a', dest)
+        assert os.stat(dest).st_mtime_ns != 1_000_000_000
+
+        assert not file_mgr_.move(tree / 'a', dest)
+        assert not (tree / 'a').exists()
+        assert os.stat(dest).st_mtime_ns == 1_000_000_000
+
+    def test_crash_between_record_and_unlink(self, file_mgr_, tree, tmp_path):
+        """Assert that the journal records a file before its source is unlinked, and resume deletes the source."""
+        dest = tmp_path / 'moved'
+        with mock.patch('file_mgr.os.unlink', side_effect=KeyboardInterrupt), pytest.raises(KeyboardInterrupt):
+            file_mgr_._move_across_devices(tree / 'a', dest)
+        assert str((tree / 'a').absolute()) in move_journal(dest).read_text(encoding='utf-8')
+        assert (tree / 'a').exists()
+
+        assert not file_mgr_.move(tree / 'a', dest)
+        assert not (tree / 'a').exists()
+        assert dest.read_bytes() == b'a'
+
+    def test_resume_keeps_unrelated_destination_files(self, file_mgr_, tree, tmp_path):
+        """Assert that a destination file that differs from its unrecorded source is not taken to be its copy."""
+        dest = tmp_path / 'moved'
+        assert file_mgr_._move_across_devices(tree, dest, cancel_event=cancel_after(1))
+        (dest / 'a').write_bytes(b'other')
+
+        errors = file_mgr_.move(tree, dest)
+        assert [error.file for error in errors] == [tree / 'a']
+        assert (tree / 'a').read_bytes() == b'a'
+        assert (dest / 'a').read_bytes() == b'other'
+        assert move_journal(dest).exists()
+
+    def test_foreign_journal_is_refused(self, file_mgr_, tree, tmp_path):
+        """
+        Assert that a journal left by a move of other files doesn't let move() merge into an existing
+        destination, and that nothing is moved or deleted.
+        """
+        dest = tmp_path / 'moved'
+        (dest / 'sub').mkdir(parents=True)
+        (dest / 'a').write_bytes(b'a')
+        move_journal(dest).write_text(
+            json.dumps({'src': str(tmp_path / 'elsewhere'), 'dest': str(dest.absolute())}) + '\n', encoding='utf-8'
+        )
+
+        errors = file_mgr_.move(tree, dest)
+        assert [error.file for error in errors] == [dest]
+        assert (tree / 'a').is_file()
+        assert (tree / 'sub' / 'b').is_file()
+        assert not (dest / 'sub' / 'b').exists()
+
+    def test_unreadable_journal_is_refused(self, file_mgr_, tree, tmp_path):
+        """Assert that a journal that can't be parsed is refused, and nothing is moved."""
+        dest = tmp_path / 'moved'
+        move_journal(dest).write_text('{"src": ', encoding='utf-8')
+        assert [error.file for error in file_mgr_.move(tree, dest)] == [dest]
+        assert (tree / 'a').is_file()
+        assert not dest.exists()
+
+    def test_incomplete_last_record_is_ignored(self, file_mgr_, tree, tmp_path):
+        """Assert that a record cut short by a crash doesn't stop the move from being resumed."""
+        dest = tmp_path / 'moved'
+        assert file_mgr_._move_across_devices(tree, dest, cancel_event=cancel_after(1))
+        with open(move_journal(dest), 'a', encoding='utf-8') as journal:
+            journal.write('{"moved": ')
+        assert not file_mgr_.move(tree, dest)
+        assert not tree.exists()
+
+    def test_destination_is_synced_before_source_is_deleted(self, file_mgr_, tree, tmp_path):
+        """Assert that the destination directory is flushed to disk before the source file is unlinked."""
+        dest = tmp_path / 'moved'
+        calls = mock.Mock()
+        calls.fsync_dir.side_effect = file_mgr.FileMgr._fsync_dir
+        calls.unlink.side_effect = os.unlink
+        with mock.patch.object(file_mgr.FileMgr, '_fsync_dir', calls.fsync_dir), \
+                mock.patch('file_mgr.os.unlink', calls.unlink):
+            assert not file_mgr_._move_across_devices(tree / 'a', dest)
+        # The journal is unlinked last, once the move is complete.
+        assert [call[0] for call in calls.mock_calls] == ['fsync_dir', 'unlink', 'unlink']
+        assert calls.fsync_dir.call_args.args == (tmp_path,)
+        assert calls.unlink.call_args_list[0].args[0] == 'a'
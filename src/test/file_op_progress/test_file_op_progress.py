@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+#  test_file_op_progress.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+
+"""
+Unit test for class file_op_progress.FileOpProgress
+"""
+
+from unittest import mock
+import pytest
+from file_op_progress import FileOpProgress
+
+
+class Clock:
+    """Stands in for time.monotonic(), only moving when it is told to."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    """Patch time.monotonic() in file_op_progress with a Clock."""
+    clock_ = Clock()
+    with mock.patch('file_op_progress.time.monotonic', clock_):
+        yield clock_
+
+
+@pytest.fixture()
+def idle_add():
+    """Patch the idle queue that FileOpProgress publishes through, returning the mock."""
+    with mock.patch('file_op_progress.glib_utils.g_idle_add_once') as g_idle_add_once:
+        yield g_idle_add_once
+
+
+def published(idle_add) -> list:
+    """Get the FileOpProgressData of every 'progress_updated' that was published."""
+    return [call.args[2] for call in idle_add.call_args_list if call.args[1] == 'progress_updated']
+
+
+class TestSetTotals:
+    """Unit test for method set_totals()"""
+
+    @pytest.mark.usefixtures('clock')
+    def test_only_first_call_counts(self, idle_add):
+        """Assert that the totals of a nested operation don't replace those of the outer one."""
+        progress = FileOpProgress('test')
+        progress.set_totals(3, 300)
+        progress.set_totals(10, 1000)
+        assert progress.has_totals()
+        assert (published(idle_add)[-1].files_total, published(idle_add)[-1].bytes_total) == (3, 300)
+        assert len(published(idle_add)) == 1
+
+
+class TestAdvance:
+    """Unit test for method advance()"""
+
+    def test_publishing_is_throttled(self, clock, idle_add):
+        """Assert that a snapshot is only published once min_interval has passed since the last one."""
+        progress = FileOpProgress('test', min_interval=0.25)
+        progress.set_totals(3, 300)
+
+        clock.now += 0.1
+        progress.advance(n_bytes=100, n_files=1)
+        assert len(published(idle_add)) == 1
+
+        clock.now += 0.2
+        progress.advance(n_bytes=100, n_files=1)
+        assert len(published(idle_add)) == 2
+        assert (published(idle_add)[-1].files_done, published(idle_add)[-1].bytes_done) == (2, 200)
+
+    def test_rate_and_eta(self, clock, idle_add):
+        """Assert that the rate is measured between publishes, and the eta follows from it."""
+        progress = FileOpProgress('test', min_interval=0.25)
+        progress.set_totals(2, 2000)
+        clock.now += 1
+        progress.advance(n_bytes=500)
+        data = published(idle_add)[-1]
+        assert data.bytes_per_sec == 500
+        assert data.eta == 3
+        assert data.fraction == 0.25
+
+
+class TestFinish:
+    """Unit test for method finish()"""
+
+    def test_publishes_final_state_then_finished(self, clock, idle_add):
+        """
+        Assert that finish() publishes the final state even within min_interval, then sends 'finished',
+        and that later updates are ignored.
+        """
+        progress = FileOpProgress('test', min_interval=10)
+        progress.set_totals(1, 100)
+        progress.advance(n_bytes=100, n_files=1)
+        assert len(published(idle_add)) == 1
+
+        progress.finish()
+        assert (published(idle_add)[-1].files_done, published(idle_add)[-1].bytes_done) == (1, 100)
+        assert idle_add.call_args.args[1:] == ('finished',)
+
+        clock.now += 20
+        progress.advance(n_bytes=100)
+        assert idle_add.call_args.args[1:] == ('finished',)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+#  test_file_op_scheduler.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+# pylint: disable=protected-access
+# disabled because this module is testing protected methods.
+#
+
+"""
+Unit test for class file_op_scheduler.FileOpScheduler
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+import pytest
+from file_op_scheduler import FileOpScheduler, JobState
+
+
+def lstat(path):
+    """Stands in for os.lstat(), putting each top level directory on its own device."""
+    return SimpleNamespace(st_dev={'a': 1, 'b': 2}[Path(path).parts[1]])
+
+
+@pytest.fixture()
+def scheduler():
+    """Create a FileOpScheduler whose jobs are never really run, on the devices of lstat()."""
+    with mock.patch('file_op_scheduler.glib_utils.WorkerPool'), \
+            mock.patch('file_op_scheduler.glib_utils.PoolWorker', mock.Mock), \
+            mock.patch('file_op_scheduler.os.lstat', lstat):
+        yield FileOpScheduler()
+
+
+def submit(scheduler_: FileOpScheduler, *paths: str, priority: int = 0):
+    """Submit a job that uses paths."""
+    return scheduler_.submit(mock.Mock(), paths=tuple(Path(path) for path in paths), priority=priority)
+
+
+def finish(job, ret_val=None) -> None:
+    """Finish a running job, the way its PoolWorker would."""
+    job.worker.on_finished_cb(*job.worker.cb_args, ret_val)
+
+
+class TestSubmit:
+    """Unit test for method submit()"""
+
+    def test_one_job_per_device(self, scheduler):
+        """Assert that a job waits while its device is in use, but jobs on other devices don't."""
+        job_a1 = submit(scheduler, '/a/1')
+        job_a2 = submit(scheduler, '/a/2')
+        job_b = submit(scheduler, '/b/1')
+        assert scheduler.running_jobs() == [job_a1, job_b]
+        assert scheduler.queued_jobs() == [job_a2]
+        job_a1.worker.start.assert_called_once()
+        assert job_a2.worker is None
+
+    def test_waits_for_every_device(self, scheduler):
+        """Assert that a job using two devices only starts when both are free."""
+        job_a = submit(scheduler, '/a/1')
+        job_b = submit(scheduler, '/b/1')
+        job_ab = submit(scheduler, '/a/2', '/b/2')
+        finish(job_a)
+        assert job_ab.state is JobState.QUEUED
+        finish(job_b)
+        assert job_ab.state is JobState.RUNNING
+
+    def test_max_per_device(self, scheduler):
+        """Assert that max_per_device jobs may share a device."""
+        scheduler.max_per_device = 2
+        submit(scheduler, '/a/1')
+        submit(scheduler, '/a/2')
+        submit(scheduler, '/a/3')
+        assert len(scheduler.running_jobs()) == 2
+
+    def test_unknown_device(self, scheduler):
+        """Assert that a path whose device can't be found doesn't stop the job from being run."""
+        with mock.patch('file_op_scheduler.os.lstat', side_effect=OSError):
+            job = submit(scheduler, '/missing')
+        assert job.devices == frozenset()
+        assert job.state is JobState.RUNNING
+
+
+class TestStartReadyJobs:
+    """Unit test for method _start_ready_jobs()"""
+
+    def test_priority_order(self, scheduler):
+        """Assert that waiting jobs start in order of priority, then in the order they were submitted."""
+        running = submit(scheduler, '/a/0')
+        low = submit(scheduler, '/a/1', priority=0)
+        high = submit(scheduler, '/a/2', priority=5)
+        low_2 = submit(scheduler, '/a/3', priority=0)
+        assert scheduler.queued_jobs() == [high, low, low_2]
+
+        started = []
+        for job in (running, high, low, low_2):
+            assert job.state is JobState.RUNNING
+            started.append(job)
+            finish(job)
+        assert started == [running, high, low, low_2]
+
+
+class TestReprioritize:
+    """Unit test for method reprioritize()"""
+
+    def test_queued_job_moves_ahead(self, scheduler):
+        """Assert that raising a queued job's priority starts it before the jobs it was behind."""
+        running = submit(scheduler, '/a/0')
+        first = submit(scheduler, '/a/1')
+        second = submit(scheduler, '/a/2')
+        scheduler.reprioritize(second, 1)
+        assert scheduler.queued_jobs() == [second, first]
+        finish(running)
+        assert second.state is JobState.RUNNING
+        assert first.state is JobState.QUEUED
+
+
+class TestCancel:
+    """Unit test for method cancel()"""
+
+    @mock.patch('file_op_scheduler.glib_utils.g_idle_add_once')
+    def test_queued_job(self, idle_add, scheduler):
+        """Assert that a queued job is removed without running, and its callback is told there is no result."""
+        submit(scheduler, '/a/0')
+        on_finished_cb = mock.Mock()
+        job = scheduler.submit(mock.Mock(), on_finished_cb=on_finished_cb, cb_args=('arg',), paths=(Path('/a/1'),))
+        scheduler.cancel(job)
+        assert job.state is JobState.CANCELLED
+        assert not scheduler.queued_jobs()
+        assert job.worker is None
+        idle_add.assert_called_once_with(on_finished_cb, 'arg', None)
+
+    def test_running_job(self, scheduler):
+        """Assert that a running job's worker is cancelled, and its device stays busy until it finishes."""
+        job = submit(scheduler, '/a/0')
+        waiting = submit(scheduler, '/a/1')
+        scheduler.cancel(job)
+        job.worker.cancel.assert_called_once()
+        assert waiting.state is JobState.QUEUED
+        finish(job)
+        assert waiting.state is JobState.RUNNING
+
+
+class TestOnJobFinished:
+    """Unit test for method _on_job_finished()"""
+
+    def test_calls_back_with_return_value(self, scheduler):
+        """Assert that the submitter's callback gets the job's return value."""
+        on_finished_cb = mock.Mock()
+        job = scheduler.submit(mock.Mock(), on_finished_cb=on_finished_cb, cb_args=('arg',), paths=(Path('/a/1'),))
+        finish(job, ['error'])
+        on_finished_cb.assert_called_once_with('arg', ['error'])
+        assert job.state is JobState.FINISHED
+        assert not scheduler.running_jobs()
+        assert not scheduler._device_load
+
+
+class TestDevicesOf:
+    """Unit test for method _devices_of()"""
+
+    def test_missing_path_uses_existing_parent(self, tmp_path):
+        """Assert that a path that doesn't exist yet is on the device of its nearest existing parent."""
+        with mock.patch('file_op_scheduler.glib_utils.WorkerPool'):
+            scheduler_ = FileOpScheduler()
+        assert scheduler_._devices_of((tmp_path / 'new' / 'file',)) == {tmp_path.stat().st_dev}
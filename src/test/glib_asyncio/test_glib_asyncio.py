@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+#  test_glib_asyncio.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+
+"""
+Unit test for module glib_asyncio
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import glib_asyncio
+import sqlite_tools
+from signal_ import Signal
+
+
+def run_until_complete(task: asyncio.Future, timeout: float = 5.0):
+    """Iterate the default GLib main context, and nothing else, until task is done. Return its result."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not task.done():
+        assert time.monotonic() < deadline, 'timed out'
+        context.iteration(False)
+        time.sleep(0.001)
+    return task.result()
+
+
+@pytest.fixture
+def loop():
+    """The installed GLibEventLoop"""
+    yield glib_asyncio.install()
+
+
+class TestGLibEventLoop:
+    """
+    Unit test for class glib_asyncio.GLibEventLoop
+    """
+
+    @pytest.mark.usefixtures('loop')
+    def test_coroutines_run_on_the_glib_main_context(self):
+        """Show that GLib alone drives coroutines, including asyncio timers, in the main thread."""
+        async def coro():
+            await asyncio.sleep(0.01)
+            await asyncio.sleep(0)
+            return threading.current_thread()
+
+        assert run_until_complete(glib_asyncio.start(coro())) is threading.main_thread()
+
+    @pytest.mark.usefixtures('loop')
+    def test_glib_callbacks_run_while_a_coroutine_waits(self):
+        """Show that a coroutine waiting on a timer doesn't block other GLib sources."""
+        calls = []
+        GLib.timeout_add(5, lambda: calls.append('glib') or False)
+
+        async def coro():
+            await asyncio.sleep(0.05)
+            return list(calls)
+
+        assert run_until_complete(glib_asyncio.start(coro())) == ['glib']
+
+
+class TestAwaitables:
+    """
+    Unit test for the awaitable wrappers in glib_asyncio
+    """
+
+    @pytest.mark.usefixtures('loop')
+    def test_run_in_pool_returns_result_from_worker_thread(self):
+        """Show that run_in_pool runs the function in another thread and returns its result."""
+        async def coro():
+            return await glib_asyncio.run_in_pool(lambda x: (x, threading.current_thread()), 1)
+
+        result, thread = run_until_complete(glib_asyncio.start(coro()))
+        assert result == 1
+        assert thread is not threading.main_thread()
+
+    def test_cancelling_run_cancellable_sets_cancel_event(self, loop):
+        """Show that cancelling the awaiting task sets the cancel_event passed to the function."""
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        def func(cancel_event: threading.Event):
+            started.set()
+            if cancel_event.wait(timeout=5):
+                cancelled.set()
+
+        task = glib_asyncio.start(glib_asyncio.run_cancellable(func))
+        run_until_complete(loop.run_in_executor(None, started.wait, 5))
+        task.cancel()
+        assert run_until_complete(loop.run_in_executor(None, cancelled.wait, 5))
+
+    @pytest.mark.usefixtures('loop')
+    def test_db_query_runs_in_a_worker_thread(self, tmp_path):
+        """Show that db_query runs the query on another connection, in a transaction that is committed."""
+        db = sqlite_tools.DBConnectionManager(tmp_path / 'test.db')
+
+        def insert(con):
+            con.execute('CREATE TABLE t (thread TEXT)')
+            con.execute('INSERT INTO t VALUES (?)', (threading.current_thread().name,))
+
+        run_until_complete(glib_asyncio.start(glib_asyncio.db_query(db, insert)))
+
+        with db.query() as con:
+            [row] = con.execute('SELECT thread FROM t').fetchall()
+        assert row['thread'] != threading.current_thread().name
+
+    @pytest.mark.usefixtures('loop')
+    def test_wait_for_signal_returns_send_args(self):
+        """Show that wait_for_signal returns the args of the next send of the signal."""
+        tx = Signal()
+        tx.add_signal('handle')
+
+        async def coro():
+            waiting = asyncio.ensure_future(glib_asyncio.wait_for_signal(tx, 'handle'))
+            await asyncio.sleep(0)
+            tx.send('handle', 1, 2)
+            return await waiting
+
+        assert run_until_complete(glib_asyncio.start(coro())) == (1, 2)
+
+    @pytest.mark.usefixtures('loop')
+    def test_cancelled_expect_signal_disconnects(self):
+        """Show that cancelling the future returned by expect_signal disconnects it from the signal."""
+        tx = Signal()
+        tx.add_signal('handle')
+        future = glib_asyncio.expect_signal(tx, 'handle')
+        future.cancel()
+        run_until_complete(glib_asyncio.start(asyncio.sleep(0)))
+
+        assert not tx._sig_handlers_once['handle']  # pylint: disable=protected-access
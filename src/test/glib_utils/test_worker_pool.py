@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+#  test_worker_pool.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+
+"""
+Unit test for glib_utils.WorkerPool and glib_utils.PoolWorker
+"""
+
+import threading
+import time
+import pytest
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import glib_utils
+
+
+def run_main_context_until(predicate, timeout: float = 5.0):
+    """Iterate the default main context until predicate() is True."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        context.iteration(False)
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def pool():
+    """A WorkerPool with a single worker thread, shut down after the test."""
+    worker_pool = glib_utils.WorkerPool(max_workers=1, name='test')
+    yield worker_pool
+    worker_pool.shutdown(cancel_futures=True)
+
+
+def block(pool_: glib_utils.WorkerPool) -> threading.Event:
+    """Occupy the pool's only worker until the returned event is set."""
+    release = threading.Event()
+    pool_.submit(release.wait)
+    return release
+
+
+class TestWorkerPool:
+    """
+    Unit test for glib_utils.WorkerPool
+    """
+
+    def test_runs_tasks_on_at_most_max_workers_threads(self):
+        """Show that many tasks are run on no more than max_workers threads, and return their results."""
+        worker_pool = glib_utils.WorkerPool(max_workers=3)
+        threads = set()
+
+        def task(i):
+            threads.add(threading.current_thread())
+            time.sleep(0.001)
+            return i * 2
+
+        futures = [worker_pool.submit(task, args=(i,)) for i in range(30)]
+        assert [future.result(timeout=5) for future in futures] == [i * 2 for i in range(30)]
+        assert len(threads) <= 3
+        assert threading.main_thread() not in threads
+        worker_pool.shutdown()
+
+    def test_starts_higher_priority_tasks_first(self, pool):
+        """Show that queued tasks are started highest priority first, then in order of submission."""
+        order = []
+        release = block(pool)
+        futures = [pool.submit(order.append, args=(name,), priority=priority)
+                   for name, priority in (('low', -1), ('normal_1', 0), ('high', 1), ('normal_2', 0))]
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        assert order == ['high', 'normal_1', 'normal_2', 'low']
+
+    def test_cancel_removes_queued_task(self, pool):
+        """Show that a task cancelled before it starts is never run."""
+        ran = []
+        release = block(pool)
+        future = pool.submit(ran.append, args=(1,))
+
+        assert future.cancel()
+        release.set()
+        pool.submit(lambda: None).result(timeout=5)
+        assert future.cancelled()
+        assert not ran
+
+    def test_cancel_sets_cancel_event_of_running_task(self, pool):
+        """Show that cancelling a running cancellable task sets the cancel_event passed to it."""
+        started = threading.Event()
+
+        def task(cancel_event: threading.Event):
+            started.set()
+            return cancel_event.wait(timeout=5)
+
+        future = pool.submit(task, cancellable=True)
+        started.wait(timeout=5)
+        assert not future.cancel()
+        assert future.result(timeout=5) is True
+
+    def test_done_callbacks_run_in_main_thread(self, pool):
+        """Show that the callbacks added to a MainLoopFuture are called in the main context."""
+        callback_threads = []
+        future = pool.submit(lambda: 'result')
+        future.add_done_callback(lambda future_: callback_threads.append(threading.current_thread()))
+
+        run_main_context_until(lambda: callback_threads)
+        assert callback_threads == [threading.main_thread()]
+
+
+class TestPoolWorker:
+    """
+    Unit test for glib_utils.PoolWorker
+    """
+
+    def test_on_finished_cb_gets_cb_args_and_return_value(self, pool):
+        """Show that PoolWorker calls on_finished_cb in the main context, the same way that AsyncWorker does."""
+        calls = []
+
+        def on_finished(*args):
+            calls.append((threading.current_thread(), args))
+
+        worker = glib_utils.PoolWorker(target=lambda x, cancel_event: x + 1,
+                                       args=(1,),
+                                       on_finished_cb=on_finished,
+                                       cb_args=('cb_arg',),
+                                       pass_ret_val_to_cb=True,
+                                       cancellable=True,
+                                       pool=pool)
+        worker.start()
+
+        run_main_context_until(lambda: calls)
+        assert calls == [(threading.main_thread(), ('cb_arg', 2))]
+
+    def test_on_finished_cb_is_called_when_cancelled_before_starting(self, pool):
+        """Show that a PoolWorker cancelled while queued still calls on_finished_cb, with a return value of None."""
+        calls = []
+        release = block(pool)
+        worker = glib_utils.PoolWorker(target=lambda cancel_event: 'ran',
+                                       on_finished_cb=calls.append,
+                                       pass_ret_val_to_cb=True,
+                                       cancellable=True,
+                                       pool=pool)
+        worker.start()
+        worker.cancel()
+        release.set()
+
+        run_main_context_until(lambda: calls)
+        assert calls == [None]
+
+    def test_cancel_raises_if_not_cancellable(self, pool):
+        """Show that PoolWorker.cancel() raises the same RuntimeError as AsyncWorker.cancel()."""
+        worker = glib_utils.PoolWorker(target=lambda: None, pool=pool)
+        with pytest.raises(RuntimeError):
+            worker.cancel()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+#  test_main_loop_watchdog.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+
+"""
+Unit test for class main_loop_watchdog.MainLoopWatchdog
+"""
+
+import time
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import glib_utils
+from main_loop_watchdog import MainLoopWatchdog
+from signal_ import Signal
+
+
+def run_main_context_for(seconds: float):
+    """Iterate the default main context for the given number of seconds."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        context.iteration(False)
+        time.sleep(0.001)
+
+
+class TestMainLoopWatchdog:
+    """
+    Unit test for class main_loop_watchdog.MainLoopWatchdog
+    """
+
+    def test_stall_is_attributed_to_blocking_callback(self):
+        """
+        Show that a callback that blocks the main loop is reported once,
+        with the callback in both the running callbacks and the main thread's stack.
+        """
+        reports = []
+        watchdog = MainLoopWatchdog(threshold=0.05, interval=0.01, on_stall=reports.append)
+
+        def populate_file_list():
+            time.sleep(0.3)
+
+        watchdog.start()
+        try:
+            glib_utils.g_idle_add_once(populate_file_list)
+            run_main_context_for(0.4)
+        finally:
+            watchdog.stop()
+
+        assert len(reports) == 1
+        assert reports[0].duration > 0.05
+        assert any('populate_file_list' in callback for callback in reports[0].callbacks)
+        assert any('populate_file_list' in frame for frame in reports[0].stack)
+
+    def test_stall_in_signal_callback_reports_signal_handle(self):
+        """Show that a stall in a Signal callback is attributed to the signal's name and handle."""
+        reports = []
+        watchdog = MainLoopWatchdog(threshold=0.05, interval=0.01, on_stall=reports.append)
+
+        class Subscriber:  # pylint: disable=too-few-public-methods
+            """class only used by this function"""
+            def book_data_load(self):
+                """Sample callback"""
+                time.sleep(0.3)
+
+        sub = Subscriber()
+        tx = Signal(name='BookC')
+        tx.add_signal('book_data_loaded')
+        tx.connect('book_data_loaded', sub.book_data_load)
+
+        watchdog.start()
+        try:
+            tx.send('book_data_loaded')
+            run_main_context_for(0.4)
+        finally:
+            watchdog.stop()
+
+        assert len(reports) == 1
+        assert any(callback.startswith('BookC.book_data_loaded -> ') and 'book_data_load' in callback
+                   for callback in reports[0].callbacks)
+
+    def test_responsive_main_loop_is_not_reported(self):
+        """Show that no stall is reported while the main loop keeps up."""
+        reports = []
+        watchdog = MainLoopWatchdog(threshold=0.1, interval=0.01, on_stall=reports.append)
+        watchdog.start()
+        try:
+            run_main_context_for(0.2)
+        finally:
+            watchdog.stop()
+
+        assert not reports
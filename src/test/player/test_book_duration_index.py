@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+#  test_book_duration_index.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+
+"""
+Unit test for class player.BookDurationIndex
+"""
+
+import pytest
+from player import BookDurationIndex, StreamTime
+
+
+def get_index() -> BookDurationIndex:
+    """Get an index of a book with tracks of 10, 20, and 30 seconds."""
+    return BookDurationIndex([0, 1, 2], [StreamTime(10, 's'), StreamTime(20, 's'), StreamTime(30, 's')])
+
+
+class TestInit:
+    """Unit test for method __init__()"""
+
+    def test_total_is_sum_of_durations(self):
+        """Assert that the total duration is the sum of the track durations."""
+        index = get_index()
+        assert index.total == StreamTime(60, 's')
+        assert index.complete is True
+
+    def test_unknown_durations_count_as_empty(self):
+        """Assert that tracks without a duration are counted as empty, and mark the index as incomplete."""
+        index = BookDurationIndex([0, 1, 2], [StreamTime(10, 's'), None, StreamTime(30, 's')])
+        assert index.total == StreamTime(40, 's')
+        assert index.track_start(2) == StreamTime(10, 's')
+        assert index.complete is False
+
+
+class TestElapsedRemaining:
+    """Unit test for methods track_start(), elapsed() and remaining()"""
+
+    def test_adds_the_start_of_the_track(self):
+        """Assert that elapsed() adds the durations of every previous track to the position."""
+        index = get_index()
+        assert index.track_start(0) == StreamTime(0)
+        assert index.track_start(2) == StreamTime(30, 's')
+        assert index.elapsed(1, StreamTime(5, 's')) == StreamTime(15, 's')
+
+    def test_remaining_is_total_minus_elapsed(self):
+        """Assert that remaining() is the time left in the book."""
+        index = get_index()
+        assert index.remaining(1, StreamTime(5, 's')) == StreamTime(45, 's')
+        assert index.remaining(2, StreamTime(30, 's')) == StreamTime(0)
+
+    def test_uses_track_numbers_not_list_positions(self):
+        """Assert that tracks are looked up by their track numbers."""
+        index = BookDurationIndex([3, 7], [StreamTime(10, 's'), StreamTime(20, 's')])
+        assert index.elapsed(7, StreamTime(1, 's')) == StreamTime(11, 's')
+        with pytest.raises(KeyError):
+            index.elapsed(0, StreamTime(1, 's'))
+
+
+class TestLocate:
+    """Unit test for method locate()"""
+
+    def test_finds_track_and_position(self):
+        """Assert that locate() finds the track containing the time and the position within it."""
+        index = get_index()
+        assert index.locate(StreamTime(0)) == (0, StreamTime(0))
+        assert index.locate(StreamTime(15, 's')) == (1, StreamTime(5, 's'))
+        assert index.locate(StreamTime(30, 's')) == (2, StreamTime(0))
+
+    def test_is_inverse_of_elapsed(self):
+        """Assert that locate() undoes elapsed()."""
+        index = get_index()
+        for track_number, position in ((0, StreamTime(9999, 'ms')), (1, StreamTime(0)), (2, StreamTime(29, 's'))):
+            assert index.locate(index.elapsed(track_number, position)) == (track_number, position)
+
+    def test_clamps_to_first_and_last_track(self):
+        """Assert that times outside the book are placed in the first or last track."""
+        index = get_index()
+        assert index.locate(StreamTime(-5, 's')) == (0, StreamTime(-5, 's'))
+        assert index.locate(StreamTime(70, 's')) == (2, StreamTime(40, 's'))
+
+    def test_skips_empty_tracks(self):
+        """Assert that a time at the start of an empty track is placed in the next track with a duration."""
+        index = BookDurationIndex([0, 1, 2], [StreamTime(10, 's'), None, StreamTime(30, 's')])
+        assert index.locate(StreamTime(10, 's')) == (2, StreamTime(0))
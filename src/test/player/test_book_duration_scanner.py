@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+#  test_book_duration_scanner.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+# pylint: disable=protected-access
+# disabled because this module is testing protected methods.
+#
+
+"""
+Unit test for class player.BookDurationScanner
+"""
+
+import concurrent.futures
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+import pytest
+import book
+import playlist
+from player import BookDurationScanner, StreamTime
+
+
+class Pool:
+    """
+    Stands in for the default worker pool. Submitted tasks wait in pending until run_all() runs them,
+    in the calling thread.
+    """
+
+    def __init__(self) -> None:
+        self.pending: list[tuple[concurrent.futures.Future, Callable, tuple]] = []
+
+    def submit(self, target, args=(), **_kwargs) -> concurrent.futures.Future:
+        """Queue target(*args)."""
+        future = concurrent.futures.Future()
+        self.pending.append((future, target, args))
+        return future
+
+    def run_all(self) -> None:
+        """Run the pending tasks, and the tasks that they submit, until there are none left."""
+        while self.pending:
+            future, target, args = self.pending.pop(0)
+            # Cancelled tasks are skipped, as they are by the pool.
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_result(target(*args))
+
+
+@pytest.fixture()
+def pool():
+    """Patch the default worker pool with a Pool, and the database connection that the cache is read through."""
+    pool_ = Pool()
+    with mock.patch('player.glib_utils.default_worker_pool', return_value=pool_), \
+         mock.patch('player.audio_book_tables.DB_CONNECTION'):
+        yield pool_
+
+
+@pytest.fixture()
+def book_data(tmp_path):
+    """Create a BookData of two tracks that exist in tmp_path."""
+    book_data_ = book.BookData(book.PlaylistData())
+    book_data_.track_list = []
+    for number in range(2):
+        path = tmp_path / f'{number}.ogg'
+        path.touch()
+        book_data_.track_list.append(playlist.Track(file_path=path, number=number))
+    return book_data_
+
+
+@pytest.fixture()
+def player_dbi():
+    """Create a mock PlayerDBI whose cache only has the duration of track 0."""
+    player_dbi_ = mock.Mock()
+    player_dbi_.get_stream_info.side_effect = \
+        lambda path, stat=None: (StreamTime(5, 's'), 'cached') if path.name == '0.ogg' else None
+    return player_dbi_
+
+
+class TestScan:
+    """Unit test for method scan()"""
+
+    def test_files_are_not_stated_in_the_calling_thread(self, pool, book_data, player_dbi):
+        """Assert that scan() leaves the stat of every track, and the cache lookup, to the worker pool."""
+        scanner = BookDurationScanner(player_dbi, mock.Mock())
+        with mock.patch.object(Path, 'stat') as stat:
+            scanner.scan(book_data)
+        stat.assert_not_called()
+        player_dbi.get_stream_info.assert_not_called()
+        assert len(pool.pending) == 1
+
+    def test_discovers_only_uncached_tracks(self, pool, book_data, player_dbi):
+        """
+        Assert that the cached duration is used, the other track is discovered, and its result is cached
+        with the stat taken in the worker.
+        """
+        discover = mock.Mock(return_value=(StreamTime(7, 's'), 'discovered'))
+        scanner = BookDurationScanner(player_dbi, discover)
+        scanner.transmitter = mock.Mock()
+
+        scanner.scan(book_data)
+        pool.run_all()
+
+        discover.assert_called_once_with(book_data.track_list[1].get_file_path())
+        assert player_dbi.save_stream_info.call_args.args[:3] == \
+               (book_data.track_list[1].get_file_path(), StreamTime(7, 's'), 'discovered')
+        assert player_dbi.save_stream_info.call_args.args[3] is not None
+        assert scanner.transmitter.send.call_args.args[1].total == StreamTime(12, 's')
+
+    def test_unreadable_track_is_discovered(self, pool, book_data, player_dbi):
+        """Assert that a track that can't be stat'ed skips the cache, and leaves a hole if discovery fails too."""
+        book_data.track_list[0].get_file_path().unlink()
+        discover = mock.Mock(return_value=None)
+        scanner = BookDurationScanner(player_dbi, discover)
+        scanner.transmitter = mock.Mock()
+
+        scanner.scan(book_data)
+        pool.run_all()
+
+        assert discover.call_count == 2
+        assert scanner.transmitter.send.call_args.args[1].complete is False
+
+    def test_abandoned_scan_is_ignored(self, pool, book_data, player_dbi):
+        """Assert that the results of a scan that was replaced by another one while it was running are ignored."""
+        scanner = BookDurationScanner(player_dbi, mock.Mock(return_value=(StreamTime(7, 's'), 'discovered')))
+        scanner.transmitter = mock.Mock()
+
+        scanner.scan(book_data)
+        # The first scan's task has started, so cancelling it doesn't stop it.
+        pool.pending[0][0].set_running_or_notify_cancel()
+        scanner.scan(book_data)
+        pool.run_all()
+
+        scanner.transmitter.send.assert_called_once()
@@ -59,6 +59,11 @@ Unit test for class player.GstPlayer
 """
 from unittest import mock
 from threading import Thread
+import array
+import math
+import time
+import wave
+import pytest
 from lock_wrapper import Lock
 import gi
 gi.require_version('Gst', '1.0')
@@ -332,7 +337,7 @@ def load_stream(gst_player: GstPlayer, stream_data: player.StreamData, call_twic
     return status
 
 
-def unload_stream(gst_player):
+def unload_stream(gst_player, release_pipeline: bool = False):
     """
     Unload a stream from GstPlayer and wait for it to finish.
 
@@ -340,7 +345,7 @@ def unload_stream(gst_player):
     """
     def us(gst_player: GstPlayer, status: dict):
         try:
-            status['ret_val'] = gst_player.unload_stream()
+            status['ret_val'] = gst_player.unload_stream(release_pipeline)
         except Exception as e:
             status['exception'] = e
 
@@ -762,7 +767,7 @@ class TestQueryPosition:
 
         for position in (0, 5):
             stream_data = get_new_stream_data()
-            stream_data.position.set_time(position, 's')
+            stream_data.position = player.StreamTime(position, 's')
             status = StatusDict()
             run_gstreamer_and_control_thread(control_thread, stream_data, status)
             status.raise_if()
@@ -881,7 +886,8 @@ class TestUnloadStream:
         Gstreamer requires that a pipeline gets put into the NULL state
         so it can stop all of the background threads, and release memory.
 
-        Show that the pipeline's state is set to Null after unload_stream() has been called.
+        Show that the pipeline's state is set to Null after unload_stream() has been called
+        to release the pipeline, as it is when the playlist is unloaded.
         """
 
         @g_control_thread
@@ -897,7 +903,7 @@ class TestUnloadStream:
             status['load_stream'] |= load_stream(gst_player, stream_data)
             pipeline = gst_player.pipeline
 
-            status['unload_stream'] |= unload_stream(gst_player)
+            status['unload_stream'] |= unload_stream(gst_player, release_pipeline=True)
 
             timeout = player.StreamTime(10, 's').get_time()
             status['unload_stream']['pipeline_state'] = pipeline.get_state(timeout=timeout)
@@ -915,6 +921,41 @@ class TestUnloadStream:
                                                              Gst.State.NULL,
                                                              Gst.State.VOID_PENDING)
 
+    def test_keeps_pipeline_in_ready_state_for_the_next_stream(self):
+        """
+        Show that when GstPlayer reuses the pipeline, unload_stream() leaves the pipeline in the READY state,
+        and the next load_stream() loads the stream into that same pipeline.
+        """
+
+        @g_control_thread
+        def control_thread(_,
+                           gst_player: GstPlayer,
+                           stream_data: player.StreamData,
+                           status: dict):
+            """
+            Load, unload, and reload a stream, recording the pipeline and its state after the unload.
+            """
+            status['load_stream'] |= load_stream(gst_player, stream_data)
+            pipeline = gst_player.pipeline
+
+            status['unload_stream'] |= unload_stream(gst_player)
+            timeout = player.StreamTime(10, 's').get_time()
+            status['unload_stream']['pipeline_state'] = pipeline.get_state(timeout=timeout)
+
+            status['load_stream_again'] |= load_stream(gst_player, stream_data)
+            status['load_stream_again']['same_pipeline'] = gst_player.pipeline is pipeline
+
+        status = StatusDict()
+        status['load_stream_again'] = StatusDict.get_new_status('load_stream')
+        stream_data = get_new_stream_data()
+        run_gstreamer_and_control_thread(control_thread, stream_data, status)
+        status.raise_if()
+        assert status['unload_stream']['pipeline_state'] == (Gst.StateChangeReturn.SUCCESS,
+                                                             Gst.State.READY,
+                                                             Gst.State.VOID_PENDING)
+        assert status['load_stream_again']['stream_loaded'] is True
+        assert status['load_stream_again']['same_pipeline'] is True
+
     def test_unload_stream_triggers_ready_callback(self):
         """
         Show that stream_ready signal is sent after unload_stream() has finished all of its tasks.
@@ -941,3 +982,151 @@ class TestUnloadStream:
         status.raise_if()
         assert status['load_stream']['stream_loaded'] is True, 'Failed to initialize test.'
         assert status['unload_stream']['signal_received'] is True
+
+
+class TestShutdown:
+    """Unit test for method shutdown()"""
+
+    def test_pipeline_gets_cleaned_up(self):
+        """
+        Show that shutdown() sets the pipeline's state to NULL, and discards it,
+        while GstPlayer is configured to reuse the pipeline.
+        """
+
+        @g_control_thread
+        def control_thread(_,
+                           gst_player: GstPlayer,
+                           stream_data: player.StreamData,
+                           status: dict):
+            """
+            Load a stream, shut GstPlayer down from the main loop, and record the state of the old pipeline.
+            """
+            status['load_stream'] |= load_stream(gst_player, stream_data)
+            pipeline = gst_player.pipeline
+
+            def shutdown(lock: Lock):
+                gst_player.shutdown()
+                lock.release()
+
+            lock = Lock()
+            lock.acquire()
+            status['shutdown'] = {'exception': None, 'reuse_pipeline': gst_player.reuse_pipeline}
+            GstPlayer()._g_idle_add_once(shutdown, lock)
+            status['shutdown']['returned'] = bool(lock.acquire(timeout=5))
+            status['shutdown']['pipeline_discarded'] = gst_player.pipeline is None
+
+            timeout = player.StreamTime(10, 's').get_time()
+            status['shutdown']['pipeline_state'] = pipeline.get_state(timeout=timeout)
+            pipeline = None
+            # Reload the stream so that @g_control_thread doesn't hang until timeout when it calls unload_stream()
+            load_stream(gst_player, stream_data)
+
+        status = StatusDict()
+        stream_data = get_new_stream_data()
+        run_gstreamer_and_control_thread(control_thread, stream_data, status)
+        status.raise_if()
+        assert status['load_stream']['stream_loaded'] is True, 'Failed to initialize test.'
+        assert status['shutdown']['reuse_pipeline'] is True
+        assert status['shutdown']['returned'] is True
+        assert status['shutdown']['pipeline_discarded'] is True
+        assert status['shutdown']['pipeline_state'] == (Gst.StateChangeReturn.SUCCESS,
+                                                        Gst.State.NULL,
+                                                        Gst.State.VOID_PENDING)
+
+
+def write_tone(path, seconds: float, rate: int = 44100) -> None:
+    """
+    Write a mono 16 bit wav file containing a 440 Hz sine wave.
+    """
+    samples = array.array('h', (int(8000 * math.sin(2 * math.pi * 440 * i / rate))
+                                for i in range(int(seconds * rate))))
+    # pylint: disable=no-member
+    # disabled because pylint takes wave.open() to always return a Wave_read.
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    # pylint: enable=no-member
+
+
+class TestGapless:
+    """Unit test for gapless playback with set_next_stream()"""
+
+    track_seconds = 1.0
+
+    def play_tracks(self, tmp_path, n_tracks: int) -> dict:
+        """
+        Play n_tracks generated tracks through a headless GstPlayer,
+        handing each following track to set_next_stream().
+
+        Returns the StreamData sent with each 'stream_changed', the rendering time of every audio buffer,
+        and whether 'eos' was received.
+        """
+        stream_datas = []
+        for i in range(n_tracks):
+            path = tmp_path / f'track_{i}.wav'
+            write_tone(path, self.track_seconds)
+            stream_data = get_new_stream_data()
+            stream_data.path = path
+            stream_data.track_number = i
+            stream_data.position_data = player.PositionData(time=player.StreamTime(0))
+            stream_datas.append(stream_data)
+
+        gst_player = GstPlayer(audio_sink='fakesink sync=true signal-handoffs=true')
+        loop = GLib.MainLoop()
+        result = {'stream_changed': [], 'buffers': [], 'eos': False}
+
+        def on_handoff(_, buffer, __):
+            # Called from the streaming thread as each buffer is rendered.
+            result['buffers'].append((time.perf_counter(), buffer.duration / Gst.SECOND))
+
+        def on_stream_ready():
+            gst_player.pipeline.get_property('audio-sink').connect('handoff', on_handoff)
+            gst_player.set_next_stream(stream_datas[1] if n_tracks > 1 else None)
+            gst_player.play()
+
+        def on_stream_changed(stream_data):
+            result['stream_changed'].append(stream_data)
+            next_track = stream_data.track_number + 1
+            gst_player.set_next_stream(stream_datas[next_track] if next_track < n_tracks else None)
+
+        def on_eos():
+            result['eos'] = True
+            loop.quit()
+
+        gst_player.transmitter.connect_once('stream_ready', on_stream_ready)
+        gst_player.transmitter.connect('stream_changed', on_stream_changed)
+        gst_player.transmitter.connect('eos', on_eos)
+        GstPlayer._g_idle_add_once(gst_player.load_stream, stream_datas[0])
+        timeout_id = GLib.timeout_add_seconds(int(n_tracks * self.track_seconds) + 10, loop.quit)
+        loop.run()
+        GLib.Source.remove(timeout_id)
+        return result
+
+    def test_sends_stream_changed_for_each_next_stream(self, tmp_path):
+        """
+        Show that GstPlayer continues into each stream given to set_next_stream(),
+        sending 'stream_changed' with its StreamData, and reaches EOS after the last one.
+        """
+        result = self.play_tracks(tmp_path, 3)
+        assert result['eos'] is True, 'playback did not finish'
+        assert [stream_data.track_number for stream_data in result['stream_changed']] == [1, 2]
+
+    def test_plays_next_stream_without_a_gap(self, tmp_path):
+        """
+        Show that the time spent rendering consecutive tracks in one pipeline is no longer than the audio itself,
+        ie. there is no audible gap at the track boundaries.
+        """
+        n_tracks = 3
+        result = self.play_tracks(tmp_path, n_tracks)
+        buffers = result['buffers']
+        assert result['eos'] is True, 'playback did not finish'
+
+        audio_seconds = sum(duration for _, duration in buffers)
+        assert audio_seconds == pytest.approx(n_tracks * self.track_seconds, abs=0.05)
+        # Buffers are rendered when their start time is reached, so the span from the first buffer
+        # to the end of the last one is the audio plus every gap between the tracks.
+        rendered_seconds = buffers[-1][0] + buffers[-1][1] - buffers[0][0]
+        gap_seconds = rendered_seconds - audio_seconds
+        assert gap_seconds < 0.05 * (n_tracks - 1), f'{gap_seconds * 1000:.0f} ms of gaps between tracks'
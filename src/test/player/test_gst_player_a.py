@@ -53,6 +53,7 @@
 """
 Unit test for class player.GstPlayerA
 """
+import logging
 from unittest import mock
 import gi
 gi.require_version('Gst', '1.0')
@@ -118,6 +119,25 @@ class TestLoadStream:
         stream_loaded_callback.assert_called()
         stream_loaded_callback.assert_called_once()
 
+    def test_replaces_stream_data_of_queued_load_stream(self):
+        """
+        Show that a second load_stream() replaces the stream_data of a load_stream command that is still queued,
+        so that GstPlayer only loads the most recently requested stream.
+        """
+        player_a = GstPlayerA()
+        player_a._gst_player = get_mock_gst_player()
+        stream_data_1 = get_new_stream_data()
+        stream_data_2 = get_new_stream_data()
+
+        player_a.play()
+        player_a.load_stream(stream_data_1)
+        player_a.load_stream(stream_data_2)
+        assert len(player_a._commands) == 1, 'The two load_stream commands were not merged.'
+
+        player_a.pop()
+        player_a._gst_player.load_stream.assert_called_once_with(stream_data_2)
+
+
 
 class TestUnloadStream:
     """
@@ -162,10 +182,65 @@ class TestUnloadStream:
         player_a.play()
         player_a.play()
         player_a.play()
-        assert len(player_a._deque) == 2, 'Failed to set baseline for test.'
+        assert len(player_a._commands) == 2, 'Failed to set baseline for test.'
 
         player_a.unload_stream()
-        assert len(player_a._deque) == 1, 'Failed to clear queue before appending unload_stream().'
+        assert len(player_a._commands) == 1, 'Failed to clear queue before appending unload_stream().'
+
+    def test_keeps_previously_queued_unload_stream(self):
+        """
+        Show that repeated track changes collapse into a single unload_stream command
+        followed by a single load_stream command for the final stream.
+        """
+        player_a = GstPlayerA()
+        player_a._gst_player = get_mock_gst_player()
+        final_stream_data = get_new_stream_data()
+
+        player_a.play()
+        for _ in range(10):
+            player_a.unload_stream()
+            player_a.load_stream(get_new_stream_data())
+            player_a.play()
+        player_a.unload_stream()
+        player_a.load_stream(final_stream_data)
+
+        while player_a._commands:
+            player_a.pop()
+        assert player_a._gst_player.unload_stream.call_count == 1
+        player_a._gst_player.load_stream.assert_called_once_with(final_stream_data)
+
+    def test_discards_queued_position(self):
+        """
+        Show that unload_stream() discards a queued set_position command along with the rest of the queue,
+        so that query_position() no longer reports it.
+        """
+        player_a = GstPlayerA()
+        player_a._gst_player = get_mock_gst_player()
+
+        player_a.play()
+        player_a.set_position(player.StreamTime(5))
+        player_a.unload_stream()
+
+        g_position = player.StreamTime(0)
+        player_a._gst_player.query_position = mock.Mock(return_value=g_position)
+        assert player_a.query_position() is g_position
+
+    def test_keeps_queued_volume_changes(self):
+        """
+        Show that unload_stream() does not discard set_volume commands, because the volume outlives the stream.
+        """
+        player_a = GstPlayerA()
+        player_a._gst_player = get_mock_gst_player()
+        player_a._gst_player.set_volume = mock.Mock(return_value=True)
+
+        player_a.play()
+        player_a.set_volume(0.5)
+        player_a.unload_stream()
+
+        while player_a._commands:
+            player_a.pop()
+        player_a._gst_player.set_volume.assert_called_once_with(0.5)
+
 
 
 class TestPlay:
@@ -402,9 +477,30 @@ class TestPop:
         player_a.play()
         player_a.play()
 
-        assert len(player_a._deque) == 2, 'Failed to initialize test correctly.'
+        assert len(player_a._commands) == 2, 'Failed to initialize test correctly.'
         player_a._gst_player.transmitter.send('stream_ready')
-        assert len(player_a._deque) == 0
+        assert len(player_a._commands) == 0
+
+    def test_failed_unload_is_logged_not_printed(self, caplog, capsys):
+        """
+        Show that pop() logs a GstPlayerError from unloading an already unloaded stream at debug level,
+        prints nothing, and moves on to the next command.
+        """
+        player_a = GstPlayerA()
+        player_a._gst_player = get_mock_gst_player(return_values=True)
+        player_a._gst_player.unload_stream = mock.Mock(
+            side_effect=GstPlayerError('No stream is loaded in the pipeline.')
+        )
+
+        with caplog.at_level(logging.DEBUG, logger='GstPlayerA'):
+            player_a.unload_stream()
+            player_a.play()
+
+        assert player_a._gst_player.play.call_count == 1
+        assert capsys.readouterr().out == ''
+        records = [record for record in caplog.records if 'No stream is loaded' in record.getMessage()]
+        assert len(records) == 1
+        assert records[0].levelno == logging.DEBUG
 
     def test_cmd_not_popped_when_gst_player_busy(self):
         """
@@ -707,3 +707,190 @@ class Test_OnTimeUpdated:
         new_stream_time = player.StreamTime(29, 's')
         player_._on_time_updated(new_stream_time)
         player_._save_position.assert_not_called()
+
+    @mock.patch('player.GstPlayerA')
+    @mock.patch('player.PlayerDBI')
+    @mock.patch('player.book.TrackDBI')
+    @mock.patch('player.book.PlaylistDBI')
+    def test_ignores_position_of_another_stream(self, *_):
+        """
+        Assert that a position sent with a stream other than the current one, e.g. the next track
+        before 'stream_changed' arrives, is neither applied nor saved.
+        """
+        player_ = Player()
+        player_.stream_data = player.StreamData(position_data=player.PositionData(time=player.StreamTime(50, 's')))
+        player_._save_position = mock.Mock()
+        player_._on_time_updated(player.StreamTime(2, 's'), player.StreamData())
+        assert player_.stream_data.position_data.time == player.StreamTime(50, 's')
+        player_._save_position.assert_not_called()
+
+        player_._on_time_updated(player.StreamTime(55, 's'), player_.stream_data)
+        assert player_.stream_data.position_data.time == player.StreamTime(55, 's')
+
+
+# noinspection PyPep8Naming
+class Test_GoToBookPosition:
+    """Unit test for method _go_to_book_position()"""
+
+    @pytest.fixture()
+    @mock.patch('player.GstPlayerA')
+    @mock.patch('player.PlayerDBI')
+    @mock.patch('player.book.TrackDBI')
+    @mock.patch('player.book.PlaylistDBI')
+    def player_(self, *_):
+        """
+        Create a Player on track 1 of a book with tracks of 10, 20, and 30 seconds.
+        """
+        player_ = Player()
+        player_.stream_data = player.StreamData(
+            track_number=1,
+            duration=player.StreamTime(20, 's'),
+            position_data=player.PositionData(time=player.StreamTime(5, 's'))
+        )
+        player_.book_durations = player.BookDurationIndex(
+            [0, 1, 2], [player.StreamTime(10, 's'), player.StreamTime(20, 's'), player.StreamTime(30, 's')]
+        )
+        player_.player_adapter.query_position.return_value = None
+        player_._go_to_position = mock.Mock(return_value=True)
+        player_.set_track = mock.Mock()
+        return player_
+
+    def test_sets_position_without_switching_tracks_within_current_track(self, player_):
+        """
+        Assert that a book position within the current track only sets the position of the current stream.
+        """
+        assert player_._go_to_book_position(player.StreamTime(25, 's')) is True
+        player_._go_to_position.assert_called_with(player.StreamTime(15, 's'))
+        player_.set_track.assert_not_called()
+
+    def test_switches_to_the_track_containing_the_position(self, player_):
+        """
+        Assert that a book position in another track switches to that track at the position within it.
+        """
+        assert player_._go_to_book_position(player.StreamTime(45, 's')) is True
+        player_.set_track.assert_called_with(2, player.StreamTime(15, 's'))
+        player_._go_to_position.assert_not_called()
+
+    def test_clamps_to_the_beginning_of_the_book(self, player_):
+        """
+        Assert that a position before the beginning of the book goes to the beginning of the first track.
+        """
+        assert player_._go_to_book_position(player.StreamTime(-1, 's')) is True
+        player_.set_track.assert_called_with(0, player.StreamTime(0))
+
+    @pytest.mark.parametrize('seconds', (60, 61))
+    def test_clamps_to_the_end_of_the_book(self, player_, seconds):
+        """
+        Assert that the end of the book, where the slider can be released, and positions past it
+        go to the end of the last track.
+        """
+        assert player_._go_to_book_position(player.StreamTime(seconds, 's')) is True
+        player_.set_track.assert_called_with(2, player.StreamTime(30, 's') - player.StreamTime(1))
+
+    def test_returns_false_until_durations_are_known(self, player_):
+        """
+        Assert that nothing happens before the durations of the book's tracks are known.
+        """
+        player_.book_durations = None
+        assert player_._go_to_book_position(player.StreamTime(25, 's')) is False
+
+    def test_seek_continues_into_the_next_track(self, player_):
+        """
+        Assert that _seek() past the end of the current track moves into the next track.
+        """
+        player_.stream_data.position_data.time = player.StreamTime(18, 's')
+        player_._seek(player.SeekTime.FORWARD_SHORT)
+        player_.set_track.assert_called_with(2, player.StreamTime(3, 's'))
+
+    def test_seek_continues_into_the_previous_track(self, player_):
+        """
+        Assert that _seek() before the beginning of the current track moves into the previous track.
+        """
+        player_.stream_data.position_data.time = player.StreamTime(2, 's')
+        player_._seek(player.SeekTime.REVERSE_SHORT)
+        player_.set_track.assert_called_with(0, player.StreamTime(7, 's'))
+
+    def test_seek_stops_at_the_beginning_of_the_book(self, player_):
+        """
+        Assert that _seek() before the beginning of the first track goes to its beginning, instead of failing.
+        """
+        player_.stream_data = player.StreamData(
+            track_number=0,
+            duration=player.StreamTime(10, 's'),
+            position_data=player.PositionData(time=player.StreamTime(2, 's'))
+        )
+        assert player_._seek(player.SeekTime.REVERSE_SHORT) is True
+        player_._go_to_position.assert_called_with(player.StreamTime(0))
+
+    def test_seek_stops_at_the_end_of_the_book(self, player_):
+        """
+        Assert that _seek() past the end of the last track goes to its end, instead of failing.
+        """
+        player_.stream_data = player.StreamData(
+            track_number=2,
+            duration=player.StreamTime(30, 's'),
+            position_data=player.PositionData(time=player.StreamTime(28, 's'))
+        )
+        assert player_._seek(player.SeekTime.FORWARD_SHORT) is True
+        player_._go_to_position.assert_called_with(player.StreamTime(30, 's') - player.StreamTime(1))
+
+
+class TestRequestUpdateTimePeriod:
+    """Unit test for methods request_update_time_period() and release_update_time_period()"""
+
+    @pytest.fixture()
+    @mock.patch('player.GstPlayerA')
+    @mock.patch('player.PlayerDBI')
+    @mock.patch('player.book.TrackDBI')
+    @mock.patch('player.book.PlaylistDBI')
+    def player_(self, *_):
+        """
+        Create a Player with a mock player adapter.
+        """
+        return Player()
+
+    def test_uses_persistence_period_without_requests(self, player_):
+        """
+        Assert that the backend only polls often enough to save the position when nothing has been requested.
+        """
+        player_.player_adapter.set_update_time_period.assert_called_once_with(Player.persistence_update_period)
+
+    def test_uses_shortest_requested_period(self, player_):
+        """
+        Assert that the backend polls at the shortest period that has been requested.
+        """
+        player_.request_update_time_period('slow', player.StreamTime(1, 's'))
+        player_.request_update_time_period('fast', player.StreamTime(50, 'ms'))
+        player_.player_adapter.set_update_time_period.assert_called_with(player.StreamTime(50, 'ms'))
+
+    def test_release_falls_back_to_remaining_requests(self, player_):
+        """
+        Assert that releasing a request returns the backend to the shortest of the remaining requests,
+        and to the persistence period when none remain.
+        """
+        player_.request_update_time_period('slow', player.StreamTime(1, 's'))
+        player_.request_update_time_period('fast', player.StreamTime(50, 'ms'))
+        player_.release_update_time_period('fast')
+        player_.player_adapter.set_update_time_period.assert_called_with(player.StreamTime(1, 's'))
+        player_.release_update_time_period('slow')
+        player_.player_adapter.set_update_time_period.assert_called_with(Player.persistence_update_period)
+
+    def test_does_not_resend_unchanged_period(self, player_):
+        """
+        Assert that a request that doesn't change the shortest period isn't passed to the backend.
+        """
+        player_.request_update_time_period('fast', player.StreamTime(50, 'ms'))
+        call_count = player_.player_adapter.set_update_time_period.call_count
+        player_.request_update_time_period('slow', player.StreamTime(1, 's'))
+        player_.request_update_time_period('fast', player.StreamTime(50, 'ms'))
+        assert player_.player_adapter.set_update_time_period.call_count == call_count
+
+    def test_request_after_direct_set_is_sent(self, player_):
+        """
+        Assert that after set_update_time_period(), a request for the period that it replaced
+        is passed to the backend.
+        """
+        player_.request_update_time_period('view', player.StreamTime(50, 'ms'))
+        player_.set_update_time_period(player.StreamTime(5, 's'))
+        player_.request_update_time_period('view', player.StreamTime(50, 'ms'))
+        player_.player_adapter.set_update_time_period.assert_called_with(player.StreamTime(50, 'ms'))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+#  test_player_command_queue.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+
+"""
+Unit test for class player.PlayerCommandQueue
+"""
+
+from unittest import mock
+from player import PlayerCommand, PlayerCommandQueue, PlayerCommandType
+
+
+def push(queue: PlayerCommandQueue, command_type: PlayerCommandType, *args) -> None:
+    """Push a command of command_type onto queue, with a mock standing in for the GstPlayer method."""
+    queue.push(PlayerCommand(command_type, mock.Mock(return_value=True), *args))
+
+
+def drain(queue: PlayerCommandQueue) -> list[tuple]:
+    """Pop every command from queue, returning (command_type, *args) for each, oldest first."""
+    commands = []
+    while queue:
+        command = queue.pop()
+        commands.append((command.command_type, *command.args))
+    return commands
+
+
+class TestPush:
+    """Unit test for method push()"""
+
+    def test_last_set_volume_wins(self):
+        """Assert that a volume drag collapses into one set_volume with the final volume."""
+        queue = PlayerCommandQueue()
+        for volume in (0.1, 0.2, 0.3):
+            push(queue, PlayerCommandType.SET_VOLUME, volume)
+        assert drain(queue) == [(PlayerCommandType.SET_VOLUME, 0.3)]
+        assert queue.stats.merged == 2
+
+    def test_last_load_stream_wins(self):
+        """Assert that a waiting load_stream is superseded by a later one."""
+        queue = PlayerCommandQueue()
+        push(queue, PlayerCommandType.LOAD_STREAM, 'first')
+        push(queue, PlayerCommandType.LOAD_STREAM, 'second')
+        assert drain(queue) == [(PlayerCommandType.LOAD_STREAM, 'second')]
+
+    def test_merged_command_keeps_its_place_in_the_queue(self):
+        """Assert that merging replaces the arguments of the waiting command, rather than moving it."""
+        queue = PlayerCommandQueue()
+        push(queue, PlayerCommandType.SET_POSITION, 1)
+        push(queue, PlayerCommandType.PLAY)
+        push(queue, PlayerCommandType.SET_POSITION, 2)
+        assert drain(queue) == [(PlayerCommandType.SET_POSITION, 2), (PlayerCommandType.PLAY,)]
+
+    def test_play_and_pause_cancel(self):
+        """Assert that a pause queued after a waiting play removes both."""
+        queue = PlayerCommandQueue()
+        push(queue, PlayerCommandType.SET_VOLUME, 0.5)
+        push(queue, PlayerCommandType.PLAY)
+        push(queue, PlayerCommandType.PAUSE)
+        assert drain(queue) == [(PlayerCommandType.SET_VOLUME, 0.5)]
+        assert queue.stats.cancelled == 2
+
+    def test_repeated_toggles_leave_the_odd_one(self):
+        """Assert that an odd number of alternating play/pause toggles leaves only the last."""
+        queue = PlayerCommandQueue()
+        for command_type in (PlayerCommandType.PAUSE, PlayerCommandType.PLAY, PlayerCommandType.PAUSE):
+            push(queue, command_type)
+        assert drain(queue) == [(PlayerCommandType.PAUSE,)]
+
+    def test_play_and_pause_do_not_cancel_across_a_load(self):
+        """Assert that a play waiting before a load_stream is not cancelled by a pause after it."""
+        queue = PlayerCommandQueue()
+        push(queue, PlayerCommandType.PLAY)
+        push(queue, PlayerCommandType.LOAD_STREAM, 'stream')
+        push(queue, PlayerCommandType.PAUSE)
+        assert len(queue) == 3
+
+
+class TestDiscardStreamCommands:
+    """Unit test for method discard_stream_commands()"""
+
+    def test_keeps_unload_and_stream_independent_commands(self):
+        """Assert that only the commands that apply to the current stream are removed."""
+        queue = PlayerCommandQueue()
+        push(queue, PlayerCommandType.UNLOAD_STREAM)
+        push(queue, PlayerCommandType.LOAD_STREAM, 'stream')
+        push(queue, PlayerCommandType.SET_VOLUME, 0.5)
+        push(queue, PlayerCommandType.PLAY)
+        push(queue, PlayerCommandType.SET_UPDATE_TIME_PERIOD, 1)
+
+        assert queue.discard_stream_commands()
+        assert drain(queue) == [
+            (PlayerCommandType.UNLOAD_STREAM,),
+            (PlayerCommandType.SET_VOLUME, 0.5),
+            (PlayerCommandType.SET_UPDATE_TIME_PERIOD, 1)
+        ]
+        assert queue.stats.discarded == 2
+
+
+class TestStats:
+    """Unit test for the diagnostic counters"""
+
+    def test_depth_and_latency(self):
+        """Assert that the queue depth and the latency of completed commands are recorded."""
+        queue = PlayerCommandQueue()
+        push(queue, PlayerCommandType.PLAY)
+        push(queue, PlayerCommandType.SET_POSITION, 1)
+        assert queue.stats.depth == 2
+
+        command = queue.pop()
+        queue.command_completed(command)
+        assert queue.stats.depth == 1
+        assert queue.stats.max_depth == 2
+        assert queue.stats.completed == 1
+        assert queue.stats.latency_max >= queue.stats.latency_mean >= 0
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+#
+#  test_simulated_player.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+
+"""
+Unit test for module simulated_player, and a randomized stress test of player.Player running on it.
+"""
+
+import logging
+import random
+from pathlib import Path
+from unittest import mock
+import pytest
+import audio_book_tables
+import sqlite_tools
+import book
+import playlist
+import player
+from player import GstPlayerError, PositionData, StreamData, StreamTime
+from simulated_player import SimulatedPlayer, VirtualClock, run
+
+# The number of tracks in the book_data fixture.
+N_TRACKS = 8
+
+
+class Recorder:
+    """Records the signals a SimulatedPlayer sends, as (virtual time, handle, *args)."""
+
+    def __init__(self, backend: SimulatedPlayer, *handles: str) -> None:
+        self.backend = backend
+        self.received = []
+        for handle in handles:
+            backend.transmitter.connect(handle, self.record, handle)
+
+    def record(self, handle: str, *args) -> None:
+        """Signal callback"""
+        self.received.append((self.backend.clock.now(), handle, *args))
+
+    def handles(self) -> list[str]:
+        """Get the handles of the received signals, in order."""
+        return [received[1] for received in self.received]
+
+
+def new_stream_data(path: str, time_: StreamTime = StreamTime(0)) -> StreamData:
+    """Create the StreamData for loading the stream at path."""
+    stream_data = StreamData(path=Path(path))
+    stream_data.position_data = PositionData()
+    stream_data.position_data.time = time_
+    return stream_data
+
+
+@pytest.fixture()
+def clock():
+    """Create a VirtualClock."""
+    return VirtualClock()
+
+
+@pytest.fixture()
+def backend(clock):
+    """Create a SimulatedPlayer with a ten second stream 'a' and a twenty second stream 'b'."""
+    return SimulatedPlayer(clock, durations={'a': StreamTime(10, 's'), 'b': StreamTime(20, 's')})
+
+
+@pytest.fixture()
+def book_data(tmp_path):
+    """Save a book of N_TRACKS tracks to a temporary database."""
+    paths = [tmp_path / f'{number:02}.ogg' for number in range(N_TRACKS)]
+    for path in paths:
+        path.touch()
+    with mock.patch.object(audio_book_tables, 'db', tmp_path / 'stress.db'), \
+         mock.patch.object(audio_book_tables, 'DB_CONNECTION',
+                           sqlite_tools.DBConnectionManager(tmp_path / 'stress.db')):
+        playlist_data = book.PlaylistData(title='stress', path=tmp_path)
+        playlist_data.set_id(book.PlaylistDBI().save(playlist_data))
+        track_dbi = book.TrackDBI()
+        for number, path in enumerate(paths):
+            track = playlist.Track(file_path=path, number=number)
+            track_dbi.save_pl_track(playlist_data.get_id(), track_dbi.save_track_file(track), track)
+        yield playlist_data, paths
+
+
+class TestVirtualClock:
+    """Unit test for class VirtualClock"""
+
+    def test_calls_in_due_order(self, clock):
+        """Assert that callbacks are called in order of their due time, and then the order they were scheduled."""
+        called = []
+        clock.call_later(StreamTime(2, 's'), called.append, 'late')
+        clock.call_later(StreamTime(1, 's'), called.append, 'first')
+        clock.call_later(StreamTime(1, 's'), called.append, 'second')
+        while clock.advance():
+            pass
+        assert called == ['first', 'second', 'late']
+        assert clock.now() == StreamTime(2, 's')
+
+    def test_cancelled_callback_is_not_called(self, clock):
+        """Assert that a cancelled callback is skipped."""
+        called = []
+        clock.cancel(clock.call_later(StreamTime(1, 's'), called.append, 'cancelled'))
+        assert not clock.advance()
+        assert not called
+
+    def test_advance_stops_at_until(self, clock):
+        """Assert that advance() doesn't call anything due after until, but moves the time to until."""
+        called = []
+        clock.call_later(StreamTime(5, 's'), called.append, 'later')
+        assert not clock.advance(StreamTime(1, 's'))
+        assert not called
+        assert clock.now() == StreamTime(1, 's')
+
+
+class TestSimulatedPlayer:
+    """Unit test for class SimulatedPlayer"""
+
+    def test_stream_commands_complete_after_their_latency(self, clock, backend):
+        """Assert that 'stream_ready' is sent once the load latency has passed, and not before."""
+        recorder = Recorder(backend, 'stream_ready')
+        assert backend.load_stream(new_stream_data('a'))
+        run(clock)
+        assert recorder.received == [(backend.load_latency, 'stream_ready')]
+
+    def test_busy_backend_refuses_commands(self, backend):
+        """Assert that stream commands return False while another one is in progress."""
+        assert backend.load_stream(new_stream_data('a'))
+        assert not backend.play()
+        with pytest.raises(GstPlayerError):
+            backend.query_position()
+
+    def test_load_while_loaded_raises(self, clock, backend):
+        """Assert that loading over a loaded stream is an error, as it is with GstPlayer."""
+        backend.load_stream(new_stream_data('a'))
+        run(clock)
+        with pytest.raises(GstPlayerError):
+            backend.load_stream(new_stream_data('b'))
+
+    def test_loads_at_saved_position(self, clock, backend):
+        """Assert that a stream is loaded paused at the position in its StreamData."""
+        backend.load_stream(new_stream_data('a', StreamTime(4, 's')))
+        run(clock)
+        assert backend.query_position() == StreamTime(4, 's')
+        assert backend.query_duration() == StreamTime(10, 's')
+
+    def test_position_follows_clock_while_playing(self, clock, backend):
+        """Assert that the position moves with the virtual clock while playing, and stops when paused."""
+        backend.load_stream(new_stream_data('a'))
+        run(clock)
+        backend.play()
+        run(clock, until=clock.now() + StreamTime(3, 's'))
+        assert backend.query_position() == StreamTime(3, 's') - backend.command_latency
+        backend.pause()
+        run(clock, until=clock.now() + StreamTime(3, 's'))
+        assert backend.query_position() == StreamTime(3, 's')
+
+    def test_sends_eos_at_end_of_stream(self, clock, backend):
+        """Assert that 'eos' is sent when the stream plays to its end, and nothing is left scheduled."""
+        recorder = Recorder(backend, 'eos', 'time_updated')
+        backend.load_stream(new_stream_data('a'))
+        run(clock)
+        backend.play()
+        run(clock)
+        assert recorder.handles()[-1] == 'eos'
+        assert recorder.received[-1][0] == backend.load_latency + backend.command_latency + StreamTime(10, 's')
+
+    def test_continues_into_next_stream(self, clock, backend):
+        """Assert that a next stream is played without an EOS, and 'stream_changed' is sent with it."""
+        recorder = Recorder(backend, 'eos', 'stream_changed')
+        backend.load_stream(new_stream_data('a'))
+        run(clock)
+        next_stream = new_stream_data('b')
+        backend.set_next_stream(next_stream)
+        backend.play()
+        run(clock)
+        assert recorder.handles() == ['stream_changed', 'eos']
+        assert recorder.received[0][2] is next_stream
+        assert backend.query_duration() == StreamTime(20, 's')
+
+    def test_sends_time_updated_every_period(self, clock, backend):
+        """Assert that the position is sent every update time period while playing."""
+        recorder = Recorder(backend, 'time_updated')
+        backend.load_stream(new_stream_data('a'))
+        run(clock)
+        backend.set_update_time_period(StreamTime(1, 's'))
+        run(clock)
+        backend.play()
+        run(clock, until=clock.now() + StreamTime(5500, 'ms'))
+        # The load and play each send one, and the rest come from the ticker.
+        assert recorder.handles().count('time_updated') == 2 + 5
+
+    def test_seek_past_end_sends_eos(self, clock, backend):
+        """Assert that seeking past the end of a playing stream ends it."""
+        recorder = Recorder(backend, 'eos')
+        backend.load_stream(new_stream_data('a'))
+        run(clock)
+        backend.play()
+        run(clock, until=clock.now())
+        backend.set_position(StreamTime(1, 'm'))
+        run(clock)
+        assert recorder.handles() == ['eos']
+
+
+class TestPlayerPipeline:
+    """Test that player.Player releases the backend's pipeline once no stream will follow."""
+
+    @pytest.fixture()
+    def player_(self, book_data, clock, backend):
+        """Create a Player on backend, with book_data loaded."""
+        player_ = player.Player(backend=backend)
+        player_.activate()
+        player_.load_playlist(book_data[0])
+        run(clock)
+        return player_
+
+    def test_track_change_keeps_pipeline(self, clock, backend, player_):
+        """Assert that changing tracks doesn't release the pipeline."""
+        player_.set_track_relative(1)
+        run(clock)
+        assert backend.stream_data is not None
+        assert not backend.pipeline_released
+
+    def test_unload_playlist_releases_pipeline(self, clock, backend, player_):
+        """Assert that unloading the playlist unloads the stream and releases the pipeline."""
+        player_.play()
+        run(clock, until=clock.now() + StreamTime(1, 's'))
+        player_.unload_playlist()
+        run(clock)
+        assert backend.stream_data is None
+        assert backend.pipeline_released
+
+    def test_shutdown_releases_pipeline(self, clock, backend, player_):
+        """Assert that shutdown() releases the pipeline at once, without waiting on queued commands."""
+        player_.play()
+        player_.set_track_relative(1)
+        player_.shutdown()
+        assert backend.pipeline_released
+        assert player_.player_adapter.get_command_stats().depth == 0
+        run(clock)
+        assert backend.stream_data is None
+
+
+class TestPlayerStress:
+    """Drive player.Player on a SimulatedPlayer with seeded random commands, checking it stays consistent."""
+
+    TRACKS = N_TRACKS
+    OPERATIONS = 500
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_random_commands(self, seed, book_data, clock, caplog):
+        """
+        Assert that after every burst of random commands has settled, the command queue is empty,
+        the backend is playing the Player's current track, and the saved position is on that track.
+        """
+        playlist_data, paths = book_data
+        rng = random.Random(seed)
+        backend = SimulatedPlayer(clock, durations={str(path): StreamTime(rng.randint(5, 120), 's') for path in paths})
+        player_ = player.Player(gapless=bool(seed % 2), backend=backend)
+        player_.activate()
+        player_.load_playlist(playlist_data)
+        run(clock)
+
+        operations = (
+            player_.play,
+            player_.pause,
+            lambda: player_.set_track_relative(rng.choice((-1, 1))),
+            lambda: player_.set_track(rng.randrange(self.TRACKS)),
+            lambda: player_.seek(rng.choice(list(player.SeekTime))),
+            lambda: player_.go_to_position(StreamTime(rng.randint(0, 60), 's')),
+            lambda: player_.set_volume(rng.random()),
+        )
+        with caplog.at_level(logging.ERROR):
+            for _ in range(self.OPERATIONS // 5):
+                for _ in range(rng.randint(1, 5)):
+                    rng.choice(operations)()
+                run(clock, until=clock.now() + StreamTime(rng.randint(1, 90), 's'))
+
+                assert player_.player_adapter.get_command_stats().depth == 0
+                if backend.stream_data is not None:
+                    assert backend.stream_data.path == player_.stream_data.path
+                    saved = player_.player_dbi.get_position(playlist_data.get_id())
+                    assert saved.pl_track_id == player_.stream_data.position_data.pl_track_id
+        assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
@@ -51,72 +51,14 @@
 Unit test for class player.StreamTime
 """
 
-from unittest import mock
+import copy
+import pickle
 import pytest
 
 import player
 from player import StreamTime
 
 
-class TestSetTime:
-    """Unit test for method set_time()"""
-
-    def test_requirements_exist(self):
-        """
-        Assert that all methods, classes, attributes,
-        or any other resource needed by this method exist.
-        """
-        assert player.StreamTime
-        assert player.StreamTime._time_conversions
-        assert player.StreamTime.set_time
-
-        st = StreamTime()
-        assert st._time is None or st._time == 0
-
-    def test_stores_time_in_ns_when_unit_not_given(self):
-        """
-        Assert that set_time() does not convert units when units not given
-        """
-        stream_time = StreamTime()
-        stream_time.set_time(125)
-        assert stream_time._time == 125
-
-    def test_truncates_time_to_whole_number_when_unit_not_given(self):
-        """
-        Assert that set_time() strips any decimals from time_ when the units don't need to be converted.
-        """
-        stream_time = StreamTime()
-        stream_time.set_time(125.69)
-        assert stream_time._time == 125
-
-    def test_stores_time_in_ns_when_unit_is_ms(self):
-        """
-        Assert that set_time() converts time_ from the passed in unit to nanoseconds correctly.
-        """
-        stream_time = StreamTime()
-        stream_time.set_time(125, 'ms')
-        assert stream_time._time == 125 * pow(10, 6)
-
-    def test_stores_time_in_ns_when_unit_is_second(self):
-        """
-        Assert that set_time() converts time_ from the passed in unit to nanoseconds correctly.
-        """
-        stream_time = StreamTime()
-        stream_time.set_time(125, 's')
-        assert stream_time._time == 125 * pow(10, 9)
-
-    def test_truncates_time_to_whole_number_ns_when_unit_given(self):
-        """
-        Assert that set_time() strips any decimals from time_ when the units are converted.
-        """
-        crazy_number_in_ms = 125.69696969696969
-        truncated_crazy_number_in_ns = int(crazy_number_in_ms * pow(10, 6))
-
-        stream_time = StreamTime()
-        stream_time.set_time(crazy_number_in_ms, 'ms')
-        assert stream_time._time == truncated_crazy_number_in_ns
-
-
 class TestGetTime:
     """Unit test for method get_time()"""
 
@@ -169,6 +111,14 @@ class TestGetTime:
         test_time_ms = stream_time.get_time('s')
         assert test_time_ms == time_s
 
+    def test_truncates_negative_times_toward_zero(self):
+        """
+        Assert that get_time() truncates negative times toward zero, like int() does.
+        """
+        stream_time = StreamTime(time_=-123456789)
+        assert stream_time.get_time('ms') == -123
+        assert stream_time.get_time('s') == 0
+
 
 class TestInit:
     """Unit test for method __init__()"""
@@ -180,46 +130,140 @@ class TestInit:
         """
         assert player.StreamTime
         assert player.StreamTime._time_conversions
-        assert player.StreamTime.set_time
 
-        st = StreamTime()
-        assert st._time is None or st._time == 0
-
-    @mock.patch('player.StreamTime.set_time')
-    def test_sets_time_to_none_when_no_args_given(self, m_set_time):
+    def test_sets_time_to_none_when_no_args_given(self):
         """
         Assert that __init__() sets self._time to None when no args are given.
-        It should not call self.set_time().
         """
         test_time = StreamTime()
-        m_set_time.assert_not_called()
         assert test_time._time is None
 
-    @mock.patch('player.StreamTime.set_time')
-    def test_calls_set_time_with_time_and_ns_when_only_time_given(self, m_set_time):
+    def test_stores_time_in_ns_when_unit_not_given(self):
         """
-        Assert that __init__() calls self.set_time() with the following parameters,
-        when __init__() is called with only the time given as arg:
-        time_=time, unit='ns'
+        Assert that __init__() does not convert units when units not given
         """
-        StreamTime(time_=123)
-        m_set_time.assert_called_with(time_=123, unit='ns')
+        stream_time = StreamTime(125)
+        assert stream_time._time == 125
+        assert isinstance(stream_time._time, int)
 
-    @mock.patch('player.StreamTime.set_time')
-    def test_calls_set_time_with_time_and_unit_when_time_and_unit_given(self, m_set_time):
+    def test_truncates_time_to_whole_number_when_unit_not_given(self):
         """
-        Assert that __init__() calls self.set_time() with the following parameters,
-        when __init__() is called with only time and units given as arg:
-        time_=time, unit=unit
+        Assert that __init__() strips any decimals from time_ when the units don't need to be converted.
         """
-        StreamTime(time_=123, unit='s')
-        m_set_time.assert_called_with(time_=123, unit='s')
+        stream_time = StreamTime(125.69)
+        assert stream_time._time == 125
 
-        StreamTime(time_=123, unit='ms')
-        m_set_time.assert_called_with(time_=123, unit='ms')
+    def test_stores_time_in_ns_when_unit_is_ms(self):
+        """
+        Assert that __init__() converts time_ from the passed in unit to nanoseconds correctly.
+        """
+        stream_time = StreamTime(125, 'ms')
+        assert stream_time._time == 125 * pow(10, 6)
 
-        StreamTime(time_=123, unit='ns')
-        m_set_time.assert_called_with(time_=123, unit='ns')
+    def test_stores_time_in_ns_when_unit_is_second(self):
+        """
+        Assert that __init__() converts time_ from the passed in unit to nanoseconds correctly.
+        """
+        stream_time = StreamTime(125, 's')
+        assert stream_time._time == 125 * pow(10, 9)
+
+    def test_truncates_time_to_whole_number_ns_when_unit_given(self):
+        """
+        Assert that __init__() strips any decimals from time_ when the units are converted.
+        """
+        crazy_number_in_ms = 125.69696969696969
+        truncated_crazy_number_in_ns = int(crazy_number_in_ms * pow(10, 6))
+
+        stream_time = StreamTime(crazy_number_in_ms, 'ms')
+        assert stream_time._time == truncated_crazy_number_in_ns
+
+
+class TestImmutable:
+    """Unit test showing that StreamTime can not be modified after it is created"""
+
+    def test_raises_attribute_error_when_setting_attributes(self):
+        """
+        Assert that setting or deleting an attribute of a StreamTime raises AttributeError.
+        """
+        stream_time = StreamTime(30)
+        with pytest.raises(AttributeError):
+            stream_time._time = 20
+        with pytest.raises(AttributeError):
+            stream_time.other = 20
+        with pytest.raises(AttributeError):
+            del stream_time._time
+        assert stream_time._time == 30
+
+    def test_arithmetic_does_not_modify_operands(self):
+        """
+        Assert that the arithmetic operators return new StreamTime objects.
+        """
+        st1 = StreamTime(30)
+        st2 = StreamTime(20)
+        results = (st1 + st2, st1 - st2, -st1)
+        assert st1._time == 30
+        assert st2._time == 20
+        assert [result._time for result in results] == [50, 10, -30]
+
+    def test_copies_are_equal(self):
+        """
+        Assert that an immutable StreamTime can be copied, deep copied and pickled.
+        """
+        stream_time = StreamTime(5, 's')
+        assert copy.copy(stream_time) is stream_time
+        assert copy.deepcopy({'time': stream_time})['time'] is stream_time
+        assert pickle.loads(pickle.dumps(stream_time)) == stream_time
+        assert pickle.loads(pickle.dumps(StreamTime())).get_time() is None
+
+    def test_equal_times_hash_equally(self):
+        """
+        Assert that StreamTime objects with the same time can be used interchangeably as dict keys.
+        """
+        assert hash(StreamTime(5, 's')) == hash(StreamTime(5000, 'ms'))
+        assert {StreamTime(5, 's'): 1}[StreamTime(5000, 'ms')] == 1
+
+
+class TestGetClockValue:
+    """Unit test for method get_clock_value()"""
+
+    def test_returns_remainder_after_larger_units(self):
+        """
+        Assert that get_clock_value() strips the values of all larger units from the time.
+        """
+        stream_time = StreamTime(200, 's')
+        assert stream_time.get_clock_value('ms') == 0
+        assert stream_time.get_clock_value('s') == 20
+        assert stream_time.get_clock_value('m') == 3
+        assert stream_time.get_clock_value('h') == 0
+
+    def test_returns_negative_values_for_negative_time(self):
+        """
+        Assert that get_clock_value() truncates negative times toward zero.
+        """
+        stream_time = StreamTime(-200, 's')
+        assert stream_time.get_clock_value('s') == -20
+        assert stream_time.get_clock_value('m') == -3
+
+
+class TestGetClockValues:
+    """Unit test for method get_clock_values()"""
+
+    def test_returns_hours_minutes_seconds_milliseconds(self):
+        """
+        Assert that get_clock_values() returns the clock values of h, m, s and ms.
+        """
+        assert StreamTime(3723004, 'ms').get_clock_values() == (1, 2, 3, 4)
+        assert StreamTime(0).get_clock_values() == (0, 0, 0, 0)
+
+    def test_matches_get_clock_value(self):
+        """
+        Assert that get_clock_values() agrees with get_clock_value() for every unit,
+        including negative times.
+        """
+        for time_ns in (0, 999999, 59999999999, 3600000000000, 123456789012345, -123456789012345):
+            stream_time = StreamTime(time_ns)
+            expected = tuple(stream_time.get_clock_value(unit) for unit in ('h', 'm', 's', 'ms'))
+            assert stream_time.get_clock_values() == expected
 
 
 class TestEQ:
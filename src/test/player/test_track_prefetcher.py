@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+#  test_track_prefetcher.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+# pylint: disable=protected-access
+# disabled because this module is testing protected methods.
+#
+
+"""
+Unit test for class player.TrackPrefetcher and function player.prefetch_file()
+"""
+
+import threading
+from pathlib import Path
+from unittest import mock
+import pytest
+import book
+import playlist
+from player import PositionData, StreamData, StreamTime, TrackPrefetcher, prefetch_file
+
+
+@pytest.fixture()
+def book_data():
+    """Create a BookData of five tracks."""
+    book_data_ = book.BookData(book.PlaylistData())
+    book_data_.track_list = [playlist.Track(file_path=Path(f'/book/{number}.ogg'), number=number)
+                             for number in range(5)]
+    return book_data_
+
+
+@pytest.fixture()
+def pool():
+    """Patch the default worker pool, returning the mock pool."""
+    with mock.patch('player.glib_utils.default_worker_pool') as default_worker_pool:
+        yield default_worker_pool.return_value
+
+
+def new_stream_data(track_number: int, position: StreamTime, duration: StreamTime = StreamTime(100, 's')):
+    """Create the StreamData of track_number, played up to position."""
+    stream_data = StreamData(path=Path(f'/book/{track_number}.ogg'), track_number=track_number, duration=duration)
+    stream_data.position_data = PositionData()
+    stream_data.position_data.time = position
+    return stream_data
+
+
+def submitted_paths(pool) -> list[list[Path]]:
+    """Get the paths of each prefetch submitted to pool."""
+    return [call.args[1][0] for call in pool.submit.call_args_list]
+
+
+class TestPrefetchFile:
+    """Unit test for function prefetch_file()"""
+
+    def test_reads_at_most_max_bytes(self, tmp_path):
+        """Assert that only the beginning of a large file is read."""
+        path = tmp_path / 'track.ogg'
+        path.write_bytes(bytes(1024 * 1024))
+        assert prefetch_file(path, 1000, 1024 * 1024 * 1024) == 1000
+
+    def test_waits_to_stay_under_rate(self, tmp_path):
+        """Assert that reading pauses on the cancel_event to keep to bytes_per_second."""
+        path = tmp_path / 'track.ogg'
+        path.write_bytes(bytes(1000))
+        cancel_event = mock.Mock(spec=threading.Event)
+        cancel_event.is_set.return_value = False
+        assert prefetch_file(path, 1000, 100, cancel_event) == 1000
+        assert cancel_event.wait.call_args.args[0] > 9
+
+    def test_stops_when_cancelled(self, tmp_path):
+        """Assert that nothing is read once the cancel_event is set."""
+        path = tmp_path / 'track.ogg'
+        path.write_bytes(bytes(1000))
+        cancel_event = threading.Event()
+        cancel_event.set()
+        assert prefetch_file(path, 1000, 100, cancel_event) == 0
+
+
+class TestUpdate:
+    """Unit test for method update()"""
+
+    def test_waits_for_trigger_percent(self, book_data, pool):
+        """Assert that nothing is prefetched until the stream has played trigger_percent of its duration."""
+        prefetcher = TrackPrefetcher(trigger_percent=50)
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(49, 's')))
+        pool.submit.assert_not_called()
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(50, 's')))
+        assert submitted_paths(pool) == [[Path('/book/1.ogg'), Path('/book/2.ogg')]]
+
+    def test_prefetches_once_per_stream(self, book_data, pool):
+        """Assert that further position updates of the same stream don't prefetch again."""
+        prefetcher = TrackPrefetcher()
+        stream_data = new_stream_data(0, StreamTime(60, 's'))
+        prefetcher.update(book_data, stream_data)
+        stream_data.position_data.time = StreamTime(70, 's')
+        prefetcher.update(book_data, stream_data)
+        assert pool.submit.call_count == 1
+
+    def test_skips_prefetched_tracks(self, book_data, pool):
+        """Assert that the next stream only prefetches the track that wasn't prefetched already."""
+        prefetcher = TrackPrefetcher(n_tracks=2)
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(60, 's')))
+        prefetcher.update(book_data, new_stream_data(1, StreamTime(60, 's')))
+        assert submitted_paths(pool)[-1] == [Path('/book/3.ogg')]
+
+    def test_cancelled_prefetch_forgets_unfinished_tracks(self, book_data, pool):
+        """
+        Assert that skipping ahead cancels the running prefetch, and the track it hadn't finished
+        is prefetched again when it comes up.
+        """
+        prefetcher = TrackPrefetcher(n_tracks=2)
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(60, 's')))
+        # The worker has read track 1, but not track 2.
+        finished_paths = pool.submit.call_args.args[1][1]
+        finished_paths.append(Path('/book/1.ogg'))
+
+        prefetcher.update(book_data, new_stream_data(2, StreamTime(60, 's')))
+        pool.submit.return_value.cancel.assert_called_once()
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(60, 's')))
+        assert submitted_paths(pool)[-1] == [Path('/book/2.ogg')]
+
+    def test_stops_at_end_of_book(self, book_data, pool):
+        """Assert that the last track prefetches nothing."""
+        TrackPrefetcher().update(book_data, new_stream_data(4, StreamTime(60, 's')))
+        pool.submit.assert_not_called()
+
+    def test_unknown_duration_prefetches_nothing(self, book_data, pool):
+        """Assert that a stream without a duration can't trigger the prefetch."""
+        TrackPrefetcher().update(book_data, new_stream_data(0, StreamTime(60, 's'), duration=None))
+        pool.submit.assert_not_called()
+
+
+class TestCancel:
+    """Unit test for method cancel()"""
+
+    def test_cancels_and_forgets_prefetched_tracks(self, book_data, pool):
+        """Assert that the running prefetch is cancelled, and the tracks are prefetched again after a new book."""
+        prefetcher = TrackPrefetcher()
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(60, 's')))
+        prefetcher.cancel()
+        pool.submit.return_value.cancel.assert_called_once()
+
+        prefetcher.update(book_data, new_stream_data(0, StreamTime(60, 's')))
+        assert submitted_paths(pool)[-1] == [Path('/book/1.ogg'), Path('/book/2.ogg')]
+
+
+class TestPrefetch:
+    """Unit test for method _prefetch()"""
+
+    def test_only_finished_paths_are_recorded(self, tmp_path):
+        """Assert that a path whose read was cut short by a cancel is not recorded as finished."""
+        paths = [tmp_path / 'one.ogg', tmp_path / 'two.ogg']
+        for path in paths:
+            path.write_bytes(bytes(100))
+        cancel_event = threading.Event()
+        finished_paths = []
+
+        def read_and_cancel(*_):
+            cancel_event.set()
+            return 100
+
+        with mock.patch('player.prefetch_file', side_effect=read_and_cancel):
+            TrackPrefetcher()._prefetch(paths, finished_paths, cancel_event)
+        assert not finished_paths
+
+        cancel_event.clear()
+        TrackPrefetcher()._prefetch(paths, finished_paths, cancel_event)
+        assert finished_paths == paths
@@ -39,11 +39,34 @@
 Unit test for class signal_.Signal
 """
 
+import gc
+import threading
+import time
+import weakref
 from unittest import mock
 import pytest
-import weakref
-import gc
+import gi  # pylint: disable=unused-import; It's clearly used on the next line.
+from gi.repository import GLib
+import glib_utils
 from signal_ import Signal
+from signal_ import Coalesce
+import signal_trace
+
+
+def run_pending_idle_callbacks():
+    """Iterate the default main context until there is nothing left for it to do."""
+    context = GLib.MainContext.default()
+    while context.pending():
+        context.iteration(False)
+
+
+def run_main_context_for(seconds: float):
+    """Iterate the default main context for the given number of seconds, so that timeouts get a chance to fire."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        context.iteration(False)
+        time.sleep(0.001)
 
 
 class TestSignal:
@@ -182,6 +205,48 @@ class TestSignal:
         tx.send('handle')
         assert len(self.sig_data_passed_to_cb_list) == 0
 
+    def test_disconnect_by_signal_data_accepts_multi_character_handle(self):
+        """
+        Show that disconnect_by_signal_data() finds the signal when it is given the handle.
+        There previously was a bug where the handle string was split into its characters.
+        """
+        tx = Signal()
+        self.sig_data_passed_to_cb_list = []
+
+        tx.add_signal('handle')
+        sig_data = tx.connect('handle', self.callback, pass_sig_data_to_cb=True)
+        tx.disconnect_by_signal_data(sig_data, 'handle')
+
+        assert not tx._sig_handlers['handle']
+        with pytest.raises(ValueError):
+            tx.disconnect_by_signal_data(tx.connect('handle', self.callback), 'other_handle')
+
+    def test_deleted_subscribers_are_removed_from_the_registry(self):
+        """
+        Show that when a subscriber is garbage collected, its connections are removed,
+        including the entries used by disconnect_by_call_back().
+        """
+        class internal_class:
+            """class only used by this function"""
+            def cb(self) -> None:
+                """Sample callback"""
+
+        ics = [internal_class() for _ in range(3)]
+        tx = Signal()
+        tx.add_signal('handle')
+        for ic in ics:
+            tx.connect('handle', ic.cb)
+            tx.connect_once('handle', ic.cb)
+
+        # The loop variable still refers to the last subscriber.
+        ic = None
+        ics.clear()
+        gc.collect()
+
+        assert not tx._sig_handlers['handle']
+        assert not tx._sig_handlers_once['handle']
+        assert not tx._conn_ids_by_callback
+
     def test_passes_sig_data_as_kwargs_when_pass_sig_data_to_cb_is_true(self):
         """
         Show that send passes SignalData object to the callback as cb_kwarg[sig_data] after
@@ -259,3 +324,336 @@ class TestSignal:
         gc.collect()
         tx.send('handle')
         assert internal_class.cb_called_n_times == 0
+
+
+class TestSignalBatched:
+    """
+    Unit test for signal_.Signal in batched mode
+    """
+
+    def test_batched_send_preserves_dispatch_order(self):
+        """
+        Assert that batched mode calls the callbacks in the same order as the unbatched mode:
+        for each send, the connected callbacks in reverse order of connection, then the connect_once callbacks.
+        """
+        calls = []
+
+        class Subscriber:
+            """class only used by this function"""
+            def __init__(self, name):
+                self.name = name
+
+            def cb(self, *args):
+                """Sample callback"""
+                calls.append((self.name, *args))
+
+        subs = [Subscriber(name) for name in ('a', 'b', 'once')]
+        tx = Signal(batched=True)
+        tx.add_signal('handle')
+        tx.connect('handle', subs[0].cb)
+        tx.connect('handle', subs[1].cb)
+        tx.connect_once('handle', subs[2].cb)
+        tx.send('handle', 1)
+        tx.send('handle', 2)
+        run_pending_idle_callbacks()
+
+        assert calls == [('b', 1), ('a', 1), ('once', 1), ('b', 2), ('a', 2)]
+
+    def test_batched_sends_share_a_single_idle_source(self):
+        """
+        Assert that every send made before the dispatch queue is drained uses the same idle source.
+        """
+        calls = []
+
+        class Subscriber:
+            """class only used by this function"""
+            def cb(self, *args):
+                """Sample callback"""
+                calls.append(args)
+
+        subs = [Subscriber() for _ in range(5)]
+        tx = Signal(batched=True)
+        tx.add_signal('handle')
+        for sub in subs:
+            tx.connect('handle', sub.cb)
+
+        with mock.patch.object(glib_utils.GLib, 'idle_add', wraps=GLib.idle_add) as idle_add:
+            for i in range(10):
+                tx.send('handle', i)
+            run_pending_idle_callbacks()
+
+        assert idle_add.call_count == 1
+        assert len(calls) == 50
+
+    def test_batched_send_skips_subscribers_deleted_before_dispatch(self):
+        """
+        Show that a subscriber that is deleted after a signal is sent, but before it is dispatched,
+        is not notified.
+        """
+        class internal_class:
+            """class only used by this function"""
+            cb_called_n_times = 0
+
+            def cb(self, *_args, **_kwargs) -> None:
+                """Sample callback"""
+                internal_class.cb_called_n_times += 1
+
+        ic = internal_class()
+        tx = Signal(batched=True)
+        tx.add_signal('handle')
+        tx.connect('handle', ic.cb)
+        tx.send('handle')
+
+        del ic
+        gc.collect()
+        run_pending_idle_callbacks()
+        assert internal_class.cb_called_n_times == 0
+
+
+class TestSignalThreads:
+    """
+    Unit test for signal_.Signal sent from worker threads
+    """
+
+    @pytest.mark.parametrize('batched', [False, True])
+    def test_send_from_worker_threads_calls_back_in_main_thread(self, batched):
+        """
+        Show that sends from several worker threads, racing with connect() and disconnect in the main thread,
+        are all delivered, and that every callback is called in the main thread.
+        """
+        callback_threads = []
+
+        class Subscriber:
+            """class only used by this function"""
+            def cb(self, *_args):
+                """Sample callback"""
+                callback_threads.append(threading.current_thread())
+
+        sub = Subscriber()
+        tx = Signal(batched=batched)
+        tx.add_signal('handle')
+        tx.connect('handle', sub.cb)
+
+        n_threads, n_sends = 4, 200
+        workers = [threading.Thread(target=lambda: [tx.send('handle') for _ in range(n_sends)])
+                   for _ in range(n_threads)]
+        for worker in workers:
+            worker.start()
+        class Churner:
+            """class only used by this function"""
+            def cb(self, *args):
+                """Sample callback"""
+
+        # Churn the handlers while the workers are sending.
+        churn = [Churner() for _ in range(50)]
+        for churner in churn:
+            sig_data = tx.connect('handle', churner.cb)
+            tx.disconnect_by_signal_data(sig_data)
+        for worker in workers:
+            worker.join()
+        run_pending_idle_callbacks()
+
+        assert len(callback_threads) == n_threads * n_sends
+        assert set(callback_threads) == {threading.main_thread()}
+
+
+class TestSignalCoalesce:
+    """
+    Unit test for signal_.Signal with coalesced signals
+    """
+
+    class Subscriber:
+        """Records the args of every call to cb"""
+        def __init__(self):
+            self.calls = []
+
+        def cb(self, *args):
+            """Sample callback"""
+            self.calls.append(args)
+
+    def test_coalesced_sends_deliver_only_the_latest_values(self):
+        """
+        Show that several sends of a coalesced signal made before the main loop runs
+        are delivered once, with the values of the last send.
+        """
+        sub = self.Subscriber()
+        tx = Signal()
+        tx.add_signal('handle', coalesce=Coalesce())
+        tx.connect('handle', sub.cb)
+        for i in range(10):
+            tx.send('handle', i)
+        run_main_context_for(0.05)
+
+        assert sub.calls == [(9,)]
+
+    def test_coalesce_key_keeps_sends_with_different_keys_separate(self):
+        """
+        Show that sends with different keys are each delivered,
+        while repeated sends with the same key are collapsed.
+        """
+        sub = self.Subscriber()
+        tx = Signal()
+        tx.add_signal('handle', coalesce=Coalesce(key=lambda path: path))
+        tx.connect('handle', sub.cb)
+        for path in ('a', 'b', 'a', 'b', 'a'):
+            tx.send('handle', path)
+        run_main_context_for(0.05)
+
+        assert sorted(sub.calls) == [('a',), ('b',)]
+
+    def test_debounce_waits_for_sends_to_stop(self):
+        """
+        Show that a debounced signal isn't delivered while it is still being sent,
+        and is delivered once after the sends stop.
+        """
+        sub = self.Subscriber()
+        tx = Signal()
+        tx.add_signal('handle', coalesce=Coalesce(debounce_ms=50))
+        tx.connect('handle', sub.cb)
+        for i in range(5):
+            tx.send('handle', i)
+            run_main_context_for(0.01)
+        assert not sub.calls
+
+        run_main_context_for(0.1)
+        assert sub.calls == [(4,)]
+
+    def test_max_rate_limits_the_number_of_deliveries(self):
+        """
+        Show that a rate limited signal is delivered right away after a quiet period,
+        and that the sends made within the next period are collapsed into one delivery.
+        """
+        sub = self.Subscriber()
+        tx = Signal()
+        tx.add_signal('handle', coalesce=Coalesce(max_rate_hz=10))
+        tx.connect('handle', sub.cb)
+        tx.send('handle', 0)
+        run_main_context_for(0.02)
+        assert sub.calls == [(0,)]
+
+        for i in range(1, 5):
+            tx.send('handle', i)
+        run_main_context_for(0.02)
+        assert sub.calls == [(0,)]
+
+        run_main_context_for(0.15)
+        assert sub.calls == [(0,), (4,)]
+
+    def test_rate_limited_state_is_forgotten(self):
+        """
+        Show that the held back sends of a rate limited signal are forgotten once a period passes without sends,
+        after the trailing delivery, so that a key for every directory ever visited isn't kept alive.
+        """
+        sub = self.Subscriber()
+        tx = Signal()
+        tx.add_signal('handle', coalesce=Coalesce(max_rate_hz=20, key=lambda path, n: path))
+        tx.connect('handle', sub.cb)
+        tx.send('handle', 'a', 0)
+        tx.send('handle', 'b', 0)
+        run_main_context_for(0.02)
+        tx.send('handle', 'a', 1)
+        tx.send('handle', 'a', 2)
+        run_main_context_for(0.2)
+
+        assert sorted(sub.calls) == [('a', 0), ('a', 2), ('b', 0)]
+        assert not tx._coalesce_state
+
+    @pytest.mark.parametrize('batched', [False, True])
+    def test_coalesced_signal_does_not_overtake_earlier_sends(self, batched):
+        """
+        Show that a coalesced signal is delivered after the signals that were sent before it,
+        and that its latest values are delivered in the place of its latest send.
+        """
+        calls = []
+
+        class Subscriber:
+            """class only used by this function"""
+            def cb(self, *args):
+                """Sample callback"""
+                calls.append(args)
+
+        sub = Subscriber()
+        tx = Signal(batched=batched)
+        tx.add_signal('stream_ready', 'eos')
+        tx.add_signal('time_updated', coalesce=Coalesce())
+        for handle in ('stream_ready', 'eos', 'time_updated'):
+            tx.connect(handle, sub.cb, handle)
+
+        tx.send('stream_ready')
+        tx.send('time_updated', 1)
+        run_main_context_for(0.05)
+        assert calls == [('stream_ready',), ('time_updated', 1)]
+
+        calls.clear()
+        tx.send('time_updated', 2)
+        tx.send('stream_ready')
+        tx.send('time_updated', 3)
+        tx.send('eos')
+        run_main_context_for(0.05)
+        if batched:
+            assert calls == [('stream_ready',), ('time_updated', 3), ('eos',)]
+        else:
+            assert calls[0] == ('stream_ready',)
+            assert ('time_updated', 3) in calls
+            assert ('time_updated', 2) not in calls
+
+
+class TestSignalTracing:
+    """
+    Unit test for the tracing of signal_.Signal dispatch by signal_trace.TRACER
+    """
+
+    @pytest.fixture
+    def tracer(self):
+        """Enable the global tracer for the duration of a test."""
+        signal_trace.TRACER.reset()
+        signal_trace.TRACER.enable()
+        yield signal_trace.TRACER
+        signal_trace.TRACER.disable()
+        signal_trace.TRACER.reset()
+
+    @pytest.mark.parametrize('batched', [False, True])
+    def test_tracer_records_sends_and_callbacks(self, tracer, batched):
+        """
+        Show that an enabled tracer counts the sends of a signal,
+        and records every call to each of its callbacks under the transmitter's name.
+        """
+        class Subscriber:
+            """class only used by this function"""
+            def cb(self, *args):
+                """Sample callback"""
+
+        subs = [Subscriber(), Subscriber()]
+        tx = Signal(batched=batched, name='Transmitter')
+        tx.add_signal('handle')
+        for sub in subs:
+            tx.connect('handle', sub.cb)
+        for i in range(3):
+            tx.send('handle', i)
+        run_pending_idle_callbacks()
+
+        assert tracer.send_counts() == {('Transmitter', 'handle'): 3}
+        [stats] = tracer.stats()
+        assert stats.callback.endswith('Subscriber.cb')
+        assert stats.calls == 6
+        assert stats.latency_max >= stats.latency_mean >= 0
+        events = tracer.chrome_trace()['traceEvents']
+        assert sum(event['ph'] == 'X' for event in events) == 6
+
+    def test_disabled_tracer_records_nothing(self, tracer):
+        """Show that nothing is recorded while the tracer is disabled."""
+        class Subscriber:
+            """class only used by this function"""
+            def cb(self, *args):
+                """Sample callback"""
+
+        tracer.disable()
+        sub = Subscriber()
+        tx = Signal(name='Transmitter')
+        tx.add_signal('handle')
+        tx.connect('handle', sub.cb)
+        tx.send('handle')
+        run_pending_idle_callbacks()
+
+        assert not tracer.send_counts()
+        assert not tracer.stats()
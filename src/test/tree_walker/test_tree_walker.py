@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+#
+#  test_tree_walker.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+# pylint: disable=invalid-name
+# disabled because in the IDE project structure sidebar, I want the test classes sorted in the same order
+# as the methods they are testing.
+#
+# pylint: disable=too-few-public-methods
+# disabled because some of the tested methods only require one test.
+#
+# pylint: disable=redefined-outer-name
+# disabled because pytest fixtures are passed in by name.
+#
+# pylint: disable=protected-access
+# disabled because this module is testing protected methods.
+#
+
+"""
+Unit test for class tree_walker.TreeWalker
+"""
+
+import os
+from pathlib import Path
+from unittest import mock
+import pytest
+from tree_walker import EntryKind, TreeWalker
+
+
+def walk(root: Path, **kwargs) -> list[tuple[Path, EntryKind, int, bool]]:
+    """Walk root, returning (path relative to root, kind, depth, post_order) of each entry."""
+    return [(entry.path.relative_to(root), entry.kind, entry.depth, entry.post_order)
+            for entry in TreeWalker(root, **kwargs)]
+
+
+def make_deep_tree(root: Path, depth: int) -> Path:
+    """Create depth nested directories below root, each holding a file. Returns the deepest directory."""
+    path = root
+    for level in range(depth):
+        path = path / f'd{level}'
+        path.mkdir()
+        (path / 'file').write_bytes(b'x')
+    return path
+
+
+def open_fds() -> int:
+    """Count the descriptors this process has open."""
+    return len(os.listdir('/proc/self/fd'))
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    """
+    Create a tree:
+        root/a
+        root/sub/b
+        root/sub/inner/
+        root/link -> sub
+    """
+    root = tmp_path / 'root'
+    (root / 'sub' / 'inner').mkdir(parents=True)
+    (root / 'a').write_bytes(b'a')
+    (root / 'sub' / 'b').write_bytes(b'b')
+    (root / 'link').symlink_to(root / 'sub')
+    return root
+
+
+class TestIter:
+    """Unit test for method __iter__()"""
+
+    def test_parents_before_contents(self, tree):
+        """Assert that every file is yielded once, after its parent, with its depth and kind."""
+        entries = sorted(walk(tree), key=lambda entry: str(entry[0]))
+        assert entries == [
+            (Path('.'), EntryKind.DIR, 0, False),
+            (Path('a'), EntryKind.FILE, 1, False),
+            (Path('link'), EntryKind.SYMLINK, 1, False),
+            (Path('sub'), EntryKind.DIR, 1, False),
+            (Path('sub/b'), EntryKind.FILE, 2, False),
+            (Path('sub/inner'), EntryKind.DIR, 2, False),
+        ]
+
+    def test_post_order(self, tree):
+        """Assert that each directory is yielded a second time, after all of its contents."""
+        entries = walk(tree, post_order=True)
+        for path in (Path('.'), Path('sub'), Path('sub/inner')):
+            post_order = entries.index((path, EntryKind.DIR, len(path.parts), True))
+            assert all(index <= post_order for index, entry in enumerate(entries)
+                       if path == Path('.') or entry[0].is_relative_to(path))
+        assert entries[-1] == (Path('.'), EntryKind.DIR, 0, True)
+
+    def test_symlinks_are_not_followed(self, tree):
+        """Assert that nothing is yielded below a symlink to a directory."""
+        assert not [entry for entry in walk(tree) if entry[0].is_relative_to('link') and entry[0] != Path('link')]
+
+    def test_symlink_root(self, tree):
+        """Assert that a root that is a symlink is the only entry."""
+        assert walk(tree / 'link') == [(Path('.'), EntryKind.SYMLINK, 0, False)]
+
+    def test_prune(self, tree):
+        """Assert that a pruned directory is not entered, and not yielded a second time."""
+        walker = TreeWalker(tree, post_order=True)
+        paths = []
+        for entry in walker:
+            paths.append(entry.path)
+            if entry.path.name == 'sub':
+                walker.prune()
+        assert tree / 'sub' / 'b' not in paths
+        assert paths.count(tree / 'sub') == 1
+
+    def test_lstat(self, tree):
+        """Assert that WalkEntry.lstat() describes the entry itself, without following symlinks."""
+        stats = {entry.path: entry.lstat() for entry in TreeWalker(tree)}
+        assert stats[tree / 'link'].st_ino == os.lstat(tree / 'link').st_ino
+        assert stats[tree / 'sub' / 'b'].st_size == 1
+
+    def test_deeper_than_open_descriptor_limit(self, tmp_path):
+        """
+        Assert that a tree deeper than _max_open_dirs is walked completely, in both orders,
+        and that no descriptors are left open.
+        """
+        depth = TreeWalker._max_open_dirs + 8
+        make_deep_tree(tmp_path, depth)
+        fds = open_fds()
+        entries = walk(tmp_path, post_order=True)
+        assert open_fds() == fds
+        assert len([entry for entry in entries if entry[1] is EntryKind.FILE]) == depth
+        post_order = [entry for entry in entries if entry[3]]
+        assert [entry[2] for entry in post_order] == list(range(depth, -1, -1))
+
+    def test_stopping_early_closes_descriptors(self, tmp_path):
+        """Assert that abandoning a walk part way closes the descriptors it had open."""
+        make_deep_tree(tmp_path, 5)
+        fds = open_fds()
+        walker = iter(TreeWalker(tmp_path))
+        for _ in range(6):
+            next(walker)
+        walker.close()
+        assert open_fds() == fds
+
+    def test_unreadable_directory_is_reported(self, tree):
+        """Assert that a directory that can't be opened is reported to on_error and the walk goes on."""
+        errors = []
+        real_open = os.open
+
+        def open_(path, *args, **kwargs):
+            if path == 'sub':
+                raise PermissionError(13, 'Permission denied')
+            return real_open(path, *args, **kwargs)
+
+        with mock.patch('tree_walker.os.open', open_):
+            entries = walk(tree, post_order=True, on_error=lambda path, e: errors.append((path, e)))
+        assert [(path, type(e)) for path, e in errors] == [(tree / 'sub', PermissionError)]
+        assert (Path('a'), EntryKind.FILE, 1, False) in entries
+        assert (Path('sub'), EntryKind.DIR, 1, False) in entries
+        assert (Path('sub'), EntryKind.DIR, 1, True) not in entries
+        assert entries[-1] == (Path('.'), EntryKind.DIR, 0, True)
+
+    def test_failed_reopen_is_reported(self, tmp_path):
+        """
+        Assert that an ancestor that can't be reopened by path, after its descriptor was closed,
+        is reported to on_error without ending the walk.
+        """
+        deepest = make_deep_tree(tmp_path, 4)
+        errors = []
+        walker = TreeWalker(tmp_path, post_order=True, on_error=lambda path, e: errors.append(path))
+        walker._max_open_dirs = 1
+        real_open = TreeWalker._open
+
+        def open_(self, frame):
+            # The root's parent is opened by path at the start, the walked directories only when reopened.
+            if frame.depth >= 0:
+                raise OSError(2, 'No such file or directory')
+            real_open(self, frame)
+
+        with mock.patch.object(TreeWalker, '_open', open_):
+            entries = list(walker)
+        assert deepest.parent in errors
+        assert tmp_path in errors
+        assert deepest in [entry.path for entry in entries]
+        assert deepest not in [entry.path for entry in entries if entry.post_order]
+
+    def test_missing_root_is_reported(self, tmp_path):
+        """Assert that a root that doesn't exist is reported to on_error and nothing is yielded."""
+        errors = []
+        assert not walk(tmp_path / 'missing', on_error=lambda path, e: errors.append(path))
+        assert errors == [tmp_path / 'missing']
+
+    def test_root_without_a_name(self):
+        """Assert that a root like '/', whose name is empty, is walked."""
+        walker = TreeWalker(Path('/'))
+        for entry in walker:
+            assert (entry.path, entry.kind, entry.depth) == (Path('/'), EntryKind.DIR, 0)
+            assert entry.lstat().st_ino == os.lstat('/').st_ino
+            walker.prune()
+
+    def test_relative_root(self, tree, monkeypatch):
+        """Assert that '.' is walked like any other root."""
+        monkeypatch.chdir(tree / 'sub')
+        assert sorted(walk(Path('.'))) == sorted([
+            (Path('.'), EntryKind.DIR, 0, False),
+            (Path('b'), EntryKind.FILE, 1, False),
+            (Path('inner'), EntryKind.DIR, 1, False),
+        ])
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#
+#  tree_walker.py
+#
+#  This file is part of book_ease.
+#
+#  Copyright 2026 mark cole <mark@capstonedistribution.com>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+
+"""
+This module provides an iterative directory tree walker for the file_mgr backend.
+
+The walk is done with os.scandir() on directory file descriptors, and each
+directory is opened relative to its parent's descriptor. There is no recursion,
+so there is no limit on the depth of the tree, and the file type reported by
+scandir is reused rather than stat'ing every path a second time.
+"""
+
+from __future__ import annotations
+import os
+import stat
+from enum import Enum
+from pathlib import Path
+from typing import Callable
+from typing import Generator
+
+
+class EntryKind(Enum):
+    """The type of file a WalkEntry refers to. Symlinks are never followed."""
+    DIR = 'dir'
+    FILE = 'file'
+    SYMLINK = 'symlink'
+    FIFO = 'fifo'
+    OTHER = 'other'
+
+
+class WalkEntry:  # pylint: disable=too-few-public-methods
+    """
+    A file found by TreeWalker.
+
+    dir_fd is a descriptor for the directory containing the file.
+    It is only valid until the walker is advanced, so it must not be stored.
+    """
+    __slots__ = ['path', 'name', 'kind', 'depth', 'post_order', 'dir_fd']
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # Disabled because an entry is just the fields that the walker fills in.
+    def __init__(self,
+                 path: Path,
+                 name: str,
+                 kind: EntryKind,
+                 depth: int,
+                 dir_fd: int,
+                 post_order: bool = False) -> None:
+        self.path = path
+        self.name = name
+        self.kind = kind
+        self.depth = depth
+        self.dir_fd = dir_fd
+        self.post_order = post_order
+        """True when a directory is visited for the second time, after all of its contents."""
+
+    def lstat(self) -> os.stat_result:
+        """stat the file without following symlinks."""
+        return os.stat(self.name, dir_fd=self.dir_fd, follow_symlinks=False)
+
+
+class TreeWalker:
+    """
+    Iterate over root and everything below it, parents before their contents.
+
+    * root is yielded first at depth 0. If root is not a directory, it is the only entry.
+
+    * Directories are entered when they are yielded, unless prune() is called first.
+
+    * With post_order=True, every directory that was entered is yielded a second time with
+      WalkEntry.post_order set, after all of its contents. This is the order needed to rmdir.
+
+    * Directories that can't be read, or a root that doesn't exist, are reported to
+      on_error(path, error) and skipped.
+
+    * Only the descriptors of the innermost _max_open_dirs directories are kept open.
+      Ancestors beyond that are closed and reopened by path when the walk returns to them,
+      so that very deep trees don't exhaust the process's file descriptors.
+    """
+    _max_open_dirs = 32
+    _dir_flags = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+    def __init__(self,
+                 root: Path,
+                 post_order: bool = False,
+                 on_error: Callable[[Path, OSError], None] | None = None) -> None:
+        self.root = Path(root)
+        self._post_order = post_order
+        self._on_error = on_error
+        self._prune = False
+
+    def prune(self) -> None:
+        """Don't descend into the directory that was just yielded."""
+        self._prune = True
+
+    def __iter__(self) -> Generator[WalkEntry, None, None]:
+        # The stack holds a _Frame for each directory between root and the current position.
+        stack: list[_Frame] = []
+        if self.root.name:
+            root_parent = _Frame(self.root.parent, depth=-1)
+            root_name = self.root.name
+        else:
+            # A root without a name, like '/' or '.', is found in itself.
+            root_parent = _Frame(self.root, depth=-1)
+            root_name = os.curdir
+        try:
+            try:
+                self._open(root_parent)
+                kind = _kind_of_path(root_name, root_parent.fd)
+            except OSError as e:
+                self._report(self.root, e)
+                return
+            self._prune = False
+            yield WalkEntry(self.root, root_name, kind, 0, root_parent.fd)
+            if kind is EntryKind.DIR and not self._prune:
+                self._enter(stack, root_parent, root_name, self.root, 0)
+
+            while stack:
+                frame = stack[-1]
+                if not self._reopen(frame):
+                    stack.pop()
+                    continue
+                if frame.index < len(frame.entries):
+                    name, kind = frame.entries[frame.index]
+                    frame.index += 1
+                    path = Path(frame.path, name)
+                    self._prune = False
+                    yield WalkEntry(path, name, kind, frame.depth + 1, frame.fd)
+                    if kind is EntryKind.DIR and not self._prune:
+                        self._enter(stack, frame, name, path, frame.depth + 1)
+                    continue
+
+                # Finished with this directory.
+                stack.pop()
+                _close(frame)
+                parent = stack[-1] if stack else root_parent
+                # A parent that can't be reopened is reported, and the directory isn't yielded again.
+                if self._post_order and self._reopen(parent):
+                    yield WalkEntry(frame.path, frame.name, EntryKind.DIR, frame.depth, parent.fd, True)
+        finally:
+            for frame in stack:
+                _close(frame)
+            _close(root_parent)
+
+    def _report(self, path: Path, error: OSError) -> None:
+        """Pass an error to on_error, if there is one."""
+        if self._on_error is not None:
+            self._on_error(path, error)
+
+    def _open(self, frame: _Frame) -> None:
+        """(Re)open a frame's directory by path."""
+        frame.fd = os.open(frame.path, self._dir_flags)
+
+    def _reopen(self, frame: _Frame) -> bool:
+        """
+        Reopen a frame's directory if its descriptor was closed.
+        Returns False if it couldn't be opened, after reporting the error.
+        """
+        if frame.fd is not None:
+            return True
+        try:
+            self._open(frame)
+        except OSError as e:
+            self._report(frame.path, e)
+            return False
+        return True
+
+    def _enter(self, stack: list[_Frame], parent: _Frame, name: str, path: Path, depth: int) -> None:
+        """Open the directory, name, relative to parent and read its entries onto the stack."""
+        frame = _Frame(path, depth, name)
+        try:
+            frame.fd = os.open(name, self._dir_flags, dir_fd=parent.fd)
+            with os.scandir(frame.fd) as entries:
+                frame.entries = [(entry.name, _kind_of_entry(entry)) for entry in entries]
+        except OSError as e:
+            _close(frame)
+            self._report(path, e)
+            return
+        stack.append(frame)
+        # Limit the number of open descriptors by closing the outermost ones.
+        if len(stack) > self._max_open_dirs:
+            _close(stack[-self._max_open_dirs - 1])
+
+
+class _Frame:  # pylint: disable=too-few-public-methods
+    """A directory that is being walked, and the name it was opened by."""
+    __slots__ = ['path', 'depth', 'name', 'fd', 'entries', 'index']
+
+    def __init__(self, path: Path, depth: int, name: str = '') -> None:
+        self.path = path
+        self.depth = depth
+        self.name = name
+        self.fd: int | None = None
+        self.entries: list[tuple[str, EntryKind]] = []
+        self.index = 0
+
+
+def _close(frame: _Frame) -> None:
+    """Close a frame's directory descriptor if it is open."""
+    if frame.fd is not None:
+        os.close(frame.fd)
+        frame.fd = None
+
+
+def _kind_of_entry(entry: os.DirEntry) -> EntryKind:
+    """Get the EntryKind of a scandir entry, using the type information that scandir already has."""
+    try:
+        if entry.is_symlink():
+            return EntryKind.SYMLINK
+        if entry.is_dir(follow_symlinks=False):
+            return EntryKind.DIR
+        if entry.is_file(follow_symlinks=False):
+            return EntryKind.FILE
+        if stat.S_ISFIFO(entry.stat(follow_symlinks=False).st_mode):
+            return EntryKind.FIFO
+    except OSError:
+        pass
+    return EntryKind.OTHER
+
+
+def _kind_of_path(name: str, dir_fd: int) -> EntryKind:
+    """Get the EntryKind of the file, name, in the directory dir_fd."""
+    mode = os.stat(name, dir_fd=dir_fd, follow_symlinks=False).st_mode
+    if stat.S_ISLNK(mode):
+        return EntryKind.SYMLINK
+    if stat.S_ISDIR(mode):
+        return EntryKind.DIR
+    if stat.S_ISREG(mode):
+        return EntryKind.FILE
+    if stat.S_ISFIFO(mode):
+        return EntryKind.FIFO
+    return EntryKind.OTHER